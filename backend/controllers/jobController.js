@@ -1,5 +1,20 @@
 const mongoose = require("mongoose");
 const Job = require("../models/Job");
+const { scrapedLocationFilter, nearFilter } = require("../utils/jobLocation");
+
+// Scraped jobs the scrapers marked as expired (not seen for several runs) are hidden
+// until MongoDB's TTL index removes them (see backend/scripts/freshness.py)
+const LIVE_SCRAPED_JOBS = { expiredAt: { $exists: false } };
+
+// Location filters of the scraped collections: indexed city/remote matches and an
+// optional "near=lat,lng&radiusKm=" geo filter (see utils/jobLocation.js)
+const applyScrapedLocation = (query, { location, near, radiusKm }) => {
+    // Under $and, so the filter's $or does not replace a search $or already on the query
+    if (location) query.$and = [...(query.$and || []), scrapedLocationFilter(location)];
+    const geo = near ? nearFilter(near, radiusKm) : null;
+    if (geo) Object.assign(query, geo);
+    return query;
+};
 
 // Helper function to build search query
 const buildSearchQuery = (search, location, experience, jobType, workMode) => {
@@ -34,11 +49,11 @@ const buildSearchQuery = (search, location, experience, jobType, workMode) => {
 
 const getTelegramJobs = async (req, res) => {
     try {
-        const { page = 1, limit = 10, search, location, experience } = req.query;
+        const { page = 1, limit = 10, search, experience } = req.query;
         const skip = (parseInt(page) - 1) * parseInt(limit);
 
         // Build query
-        const query = {};
+        const query = { ...LIVE_SCRAPED_JOBS };
         if (search) {
             query.$or = [
                 { title: { $regex: search, $options: 'i' } },
@@ -47,9 +62,7 @@ const getTelegramJobs = async (req, res) => {
             ];
         }
 
-        if (location) {
-            query.location = { $regex: location, $options: 'i' };
-        }
+        applyScrapedLocation(query, req.query);
 
         if (experience) {
             query.experience = { $regex: experience, $options: 'i' };
@@ -84,11 +97,11 @@ const getTelegramJobs = async (req, res) => {
 
 const getTimesJobs = async (req, res) => {
     try {
-        const { page = 1, limit = 10, search, location, experience, jobType } = req.query;
+        const { page = 1, limit = 10, search, experience, jobType } = req.query;
         const skip = (parseInt(page) - 1) * parseInt(limit);
 
         // Build query
-        const query = {};
+        const query = { ...LIVE_SCRAPED_JOBS };
         if (search) {
             query.$or = [
                 { title: { $regex: search, $options: 'i' } },
@@ -97,9 +110,7 @@ const getTimesJobs = async (req, res) => {
             ];
         }
 
-        if (location) {
-            query.location = { $regex: location, $options: 'i' };
-        }
+        applyScrapedLocation(query, req.query);
 
         if (experience) {
             query.experience = { $regex: experience, $options: 'i' };
@@ -217,7 +228,7 @@ const getAllJobs = async (req, res) => {
         const PER_SOURCE_LIMIT = 500; // prevent loading entire collection into memory
 
         if (sources.includes('telegram')) {
-            const telegramQuery = {};
+            const telegramQuery = { ...LIVE_SCRAPED_JOBS };
             if (search) {
                 telegramQuery.$or = [
                     { title: { $regex: search, $options: 'i' } },
@@ -225,7 +236,7 @@ const getAllJobs = async (req, res) => {
                     { text: { $regex: search, $options: 'i' } }
                 ];
             }
-            if (location) telegramQuery.location = { $regex: location, $options: 'i' };
+            applyScrapedLocation(telegramQuery, req.query);
             if (experience) telegramQuery.experience = { $regex: experience, $options: 'i' };
 
             const telegramJobs = await mongoose.connection.db.collection("telegram")
@@ -237,7 +248,7 @@ const getAllJobs = async (req, res) => {
         }
 
         if (sources.includes('timesjob')) {
-            const timesQuery = {};
+            const timesQuery = { ...LIVE_SCRAPED_JOBS };
             if (search) {
                 timesQuery.$or = [
                     { title: { $regex: search, $options: 'i' } },
@@ -245,7 +256,7 @@ const getAllJobs = async (req, res) => {
                     { description: { $regex: search, $options: 'i' } }
                 ];
             }
-            if (location) timesQuery.location = { $regex: location, $options: 'i' };
+            applyScrapedLocation(timesQuery, req.query);
             if (experience) timesQuery.experience = { $regex: experience, $options: 'i' };
             if (jobType && jobType !== 'all') timesQuery.jobType = { $regex: jobType, $options: 'i' };
 
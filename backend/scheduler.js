@@ -13,6 +13,8 @@
 
 const cron      = require("node-cron");
 const { exec }  = require("child_process");
+const fs        = require("fs");
+const os        = require("os");
 const path      = require("path");
 const mongoose  = require("mongoose");
 
@@ -26,6 +28,20 @@ const CRON_EXPR   = "30 20 * * 0";
 const MAX_RETRIES = 2;         // attempts = 1 + MAX_RETRIES = 3 total
 const RETRY_DELAY = 60_000;   // 1 min between retries
 
+// Scrapers get SCRAPER_TIME_BUDGET_SEC = timeout minus this margin, so they stop
+// starting new roles and save what they collected before exec kills them.
+const BUDGET_MARGIN_MS = 90_000;
+
+// Scrapers print a line per card; exec kills a child whose output outgrows maxBuffer
+// (1 MB by default), losing the SCRAPER_METRICS / SCRAPER_RESULTS line at the end.
+const MAX_OUTPUT_BYTES = 64 * 1024 * 1024;
+
+// SCRAPER_ORCHESTRATOR=1 runs every scraper inside one Python process
+// (scripts/run_scrapers.py) instead of one process per scraper; failed scrapers
+// are retried together in a fresh orchestrator run.
+const USE_ORCHESTRATOR = process.env.SCRAPER_ORCHESTRATOR === "1";
+const ORCHESTRATOR_CMD = `python3 "${path.join(SCRIPTS_DIR, "run_scrapers.py")}"`;
+
 // Catch-up window: if last run was more than 8 days ago, run immediately on startup
 const CATCHUP_THRESHOLD_MS = 8 * 24 * 60 * 60 * 1000;
 
@@ -65,6 +81,7 @@ const RunSchema = new mongoose.Schema({
     attempts:   Number,
     durationSec:Number,
     error:      String,
+    metrics:    mongoose.Schema.Types.Mixed,   // SCRAPER_METRICS summary of the last attempt
   }],
   passed:  Number,
   failed:  Number,
@@ -79,14 +96,45 @@ function getRunModel() {
   return RunModel;
 }
 
+// ── Metrics summary emitted by scraper_utils.metrics ──────────────────────────
+const METRICS_PREFIX = "SCRAPER_METRICS ";
+
+function parseMetrics(stdout) {
+  const line = (stdout || "").split("\n").reverse().find((l) => l.startsWith(METRICS_PREFIX));
+  if (!line) return undefined;
+  try {
+    return JSON.parse(line.slice(METRICS_PREFIX.length));
+  } catch {
+    return undefined;
+  }
+}
+
+// ── Per-scraper results emitted by run_scrapers.py ────────────────────────────
+const RESULTS_PREFIX = "SCRAPER_RESULTS ";
+
+function parseResults(stdout) {
+  const line = (stdout || "").split("\n").reverse().find((l) => l.startsWith(RESULTS_PREFIX));
+  if (!line) return undefined;
+  try {
+    return JSON.parse(line.slice(RESULTS_PREFIX.length));
+  } catch {
+    return undefined;
+  }
+}
+
 // ── Run a single scraper with retries ─────────────────────────────────────────
 function execScraper(scraper) {
   return new Promise((resolve) => {
-    const child = exec(scraper.cmd, { timeout: scraper.timeoutMs }, (error, stdout, stderr) => {
+    const budgetSec = Math.max(60, Math.floor((scraper.timeoutMs - BUDGET_MARGIN_MS) / 1000));
+    const env = { ...process.env, SCRAPER_TIME_BUDGET_SEC: String(budgetSec) };
+    const options = { timeout: scraper.timeoutMs, env, maxBuffer: MAX_OUTPUT_BYTES };
+    const child = exec(scraper.cmd, options, (error, stdout, stderr) => {
       if (error) {
-        const msg = error.killed
-          ? `timed out after ${scraper.timeoutMs / 1000}s`
-          : error.message;
+        const msg = error.code === "ERR_CHILD_PROCESS_STDIO_MAXBUFFER"
+          ? `output exceeded ${MAX_OUTPUT_BYTES / (1024 * 1024)} MB`
+          : error.killed
+            ? `timed out after ${scraper.timeoutMs / 1000}s`
+            : error.message;
         resolve({ success: false, error: msg, stdout, stderr });
       } else {
         resolve({ success: true, stdout, stderr });
@@ -100,6 +148,7 @@ async function runScraperWithRetries(scraper) {
   const start = Date.now();
   let attempt = 0;
   let lastError = "";
+  let metrics;
 
   while (attempt <= MAX_RETRIES) {
     attempt++;
@@ -107,14 +156,15 @@ async function runScraperWithRetries(scraper) {
     console.log(`${prefix} ${scraper.name} (attempt ${attempt}/${MAX_RETRIES + 1})`);
 
     const result = await execScraper(scraper);
+    metrics = parseMetrics(result.stdout) || metrics;
 
     if (result.success) {
       // Print last 3 lines of output as summary
-      const lines = (result.stdout || "").trim().split("\n");
+      const lines = (result.stdout || "").trim().split("\n").filter((l) => !l.startsWith(METRICS_PREFIX));
       lines.slice(-4).forEach((l) => l.trim() && console.log(`      ${l.trim()}`));
       const secs = ((Date.now() - start) / 1000).toFixed(1);
       console.log(`  ✅ ${scraper.name} — done in ${secs}s`);
-      return { id: scraper.id, name: scraper.name, success: true, attempts: attempt, durationSec: Number(secs) };
+      return { id: scraper.id, name: scraper.name, success: true, attempts: attempt, durationSec: Number(secs), metrics };
     }
 
     lastError = result.error || "Unknown error";
@@ -128,7 +178,76 @@ async function runScraperWithRetries(scraper) {
 
   const secs = ((Date.now() - start) / 1000).toFixed(1);
   console.error(`  ❌ ${scraper.name} — gave up after ${attempt} attempts (${secs}s): ${lastError}`);
-  return { id: scraper.id, name: scraper.name, success: false, attempts: attempt, durationSec: Number(secs), error: lastError };
+  return { id: scraper.id, name: scraper.name, success: false, attempts: attempt, durationSec: Number(secs), error: lastError, metrics };
+}
+
+// ── Run scrapers through the in-process orchestrator ──────────────────────────
+// The results are read from the --json file run_scrapers.py writes, so they survive
+// any output truncation; the SCRAPER_RESULTS stdout line is the fallback.
+function readResultsFile(file) {
+  try {
+    return JSON.parse(fs.readFileSync(file, "utf8"));
+  } catch {
+    return undefined;
+  } finally {
+    fs.rm(file, { force: true }, () => {});
+  }
+}
+
+async function execOrchestrator(scrapers) {
+  // The scrapers run concurrently, so the slowest one bounds the whole run
+  const timeoutMs = Math.max(...scrapers.map((s) => s.timeoutMs));
+  const ids = scrapers.map((s) => s.id).join(",");
+  const resultsFile = path.join(os.tmpdir(), `scraper-results-${process.pid}-${Date.now()}.json`);
+  const result = await execScraper({ cmd: `${ORCHESTRATOR_CMD} --only ${ids} --json "${resultsFile}"`, timeoutMs });
+  return { ...result, report: readResultsFile(resultsFile) || parseResults(result.stdout) };
+}
+
+async function runOrchestratedWithRetries(scrapers) {
+  const start = Date.now();
+  const final = new Map();
+  let pending = scrapers;
+  let attempt = 0;
+
+  while (pending.length && attempt <= MAX_RETRIES) {
+    attempt++;
+    const prefix = attempt === 1 ? "  ▶" : `  ↩ retry ${attempt - 1}`;
+    console.log(`${prefix} ${pending.map((s) => s.name).join(", ")} in one process (attempt ${attempt}/${MAX_RETRIES + 1})`);
+
+    const { report, ...result } = await execOrchestrator(pending);
+    const byId = new Map(((report && report.results) || []).map((r) => [r.id, r]));
+    const secs = Number(((Date.now() - start) / 1000).toFixed(1));
+
+    for (const scraper of pending) {
+      const r = byId.get(scraper.id);
+      const error = r ? r.error : (result.error || "no result reported by run_scrapers.py");
+      const success = !!(r && r.success);
+      const previous = final.get(scraper.id);
+      final.set(scraper.id, {
+        id: scraper.id, name: scraper.name, success, attempts: attempt,
+        durationSec: r ? r.durationSec : secs,
+        error: success ? undefined : error,
+        metrics: (r && r.metrics) || (previous && previous.metrics),
+      });
+      if (success) {
+        console.log(`  ✅ ${scraper.name} — done in ${r.durationSec}s`);
+      } else {
+        console.error(`  ✗ ${scraper.name} attempt ${attempt} failed: ${error}`);
+      }
+    }
+
+    pending = pending.filter((s) => !final.get(s.id).success);
+    if (pending.length && attempt <= MAX_RETRIES) {
+      console.log(`     Waiting ${RETRY_DELAY / 1000}s before retry…`);
+      await new Promise((r) => setTimeout(r, RETRY_DELAY));
+    }
+  }
+
+  for (const scraper of pending) {
+    const r = final.get(scraper.id);
+    console.error(`  ❌ ${scraper.name} — gave up after ${r.attempts} attempts: ${r.error}`);
+  }
+  return scrapers.map((s) => final.get(s.id));
 }
 
 // ── Run ALL scrapers ──────────────────────────────────────────────────────────
@@ -144,20 +263,32 @@ async function runAllScrapers(triggeredBy = "cron") {
   console.log(`   Triggered by : ${triggeredBy}`);
   console.log(`   Environment  : ${IS_RENDER ? "Render" : "Local"}`);
   console.log(`   Scrapers     : ${SCRAPERS.length} active  |  Max retries : ${MAX_RETRIES}`);
+  if (USE_ORCHESTRATOR) {
+    console.log(`   Mode         : in-process orchestrator (run_scrapers.py)`);
+  }
   if (skippedBrowserScrapers.length) {
     console.log(`   Skipped      : ${skippedBrowserScrapers.join(", ")} (no Chrome on Render)`);
   }
   console.log(`${"─".repeat(65)}`);
 
-  const results = [];
-  for (const scraper of SCRAPERS) {
+  let results = [];
+  if (USE_ORCHESTRATOR) {
     try {
-      const r = await runScraperWithRetries(scraper);
-      results.push(r);
+      results = await runOrchestratedWithRetries(SCRAPERS);
     } catch (err) {
-      // Isolate — one scraper crashing never stops the loop
-      console.error(`  💥 Unexpected error in ${scraper.name}: ${err.message}`);
-      results.push({ id: scraper.id, name: scraper.name, success: false, attempts: 1, durationSec: 0, error: err.message });
+      console.error(`  💥 Unexpected error in the scraper orchestrator: ${err.message}`);
+      results = SCRAPERS.map((s) => ({ id: s.id, name: s.name, success: false, attempts: 1, durationSec: 0, error: err.message }));
+    }
+  } else {
+    for (const scraper of SCRAPERS) {
+      try {
+        const r = await runScraperWithRetries(scraper);
+        results.push(r);
+      } catch (err) {
+        // Isolate — one scraper crashing never stops the loop
+        console.error(`  💥 Unexpected error in ${scraper.name}: ${err.message}`);
+        results.push({ id: scraper.id, name: scraper.name, success: false, attempts: 1, durationSec: 0, error: err.message });
+      }
     }
   }
 
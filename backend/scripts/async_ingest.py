@@ -0,0 +1,269 @@
+"""
+Asyncio counterparts of the scraper_utils ingest helpers.
+- async_upload_image: ImageKit upload on a worker thread over the pooled HTTP session,
+  with at most SCRAPER_UPLOAD_CONCURRENCY uploads in flight
+- async_download_photo: Telegram photo download into memory, with at most
+  SCRAPER_DOWNLOAD_CONCURRENCY downloads in flight
+- AsyncMongoSink: batches documents and writes each batch with bulk_upsert_jobs on a
+  worker thread, so the event loop keeps fetching while MongoDB writes
+- IngestPipeline: per-document quality filter + in-run dedup feeding the sink; its
+  scrape_chat() reads the recent messages of one Telegram chat into it
+- run_telegram: the whole run of a Telegram scraper; each telegram/*.py script only
+  supplies its chats, session and parse_message / build_job_post
+
+pymongo and requests stay the only dependencies: blocking calls are offloaded with
+asyncio.to_thread instead of pulling in motor/aiohttp.
+
+Typical use (see telegram/*.py):
+    async def run(collection=None) -> IngestPipeline:
+        return await run_telegram("TechUprise", CHATS, SESSION_PATH, parse_message,
+                                  build_job_post, collection=collection)
+"""
+
+import os
+import sys
+import asyncio
+import configparser
+from datetime import datetime
+
+from scraper_utils import get_collection, upload_image_to_imagekit, is_valid_job, report_validation, bulk_upsert_jobs, metrics
+from freshness import FreshnessTracker
+from image_ocr import ImageOcr
+
+UPLOAD_CONCURRENCY = int(os.getenv("SCRAPER_UPLOAD_CONCURRENCY", "8"))
+DOWNLOAD_CONCURRENCY = int(os.getenv("SCRAPER_DOWNLOAD_CONCURRENCY", "4"))
+MONGO_BATCH_SIZE = int(os.getenv("SCRAPER_MONGO_BATCH_SIZE", "100"))
+MESSAGE_LIMIT = 200  # recent messages fetched per chat
+
+TELETHON_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telegram", "telethon.config")
+
+_upload_slots: asyncio.Semaphore | None = None
+_download_slots: asyncio.Semaphore | None = None
+
+
+async def async_upload_image(file_bytes: bytes, filename: str, folder: str = None) -> str | None:
+    """Async upload_image_to_imagekit(); returns the CDN URL or None."""
+    global _upload_slots
+    if _upload_slots is None:
+        _upload_slots = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    async with _upload_slots:
+        return await asyncio.to_thread(upload_image_to_imagekit, file_bytes, filename, folder)
+
+
+async def async_download_photo(client, message) -> bytes | None:
+    """Download the photo of a Telegram message into memory."""
+    global _download_slots
+    if _download_slots is None:
+        _download_slots = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    async with _download_slots:
+        with metrics.timer("telegram_download"):
+            return await client.download_media(message, file=bytes)
+
+
+def load_telethon_credentials(config_path: str = TELETHON_CONFIG_PATH) -> tuple[str, str]:
+    """Read (api_id, api_hash) from telethon.config; exits if the file is missing."""
+    if not os.path.exists(config_path):
+        print(f"❌ Config file not found: {config_path}")
+        sys.exit(1)
+
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    return config["telethon_credentials"]["api_id"], config["telethon_credentials"]["api_hash"]
+
+
+class AsyncMongoSink:
+    """Buffers job documents and bulk-upserts full batches in the background."""
+
+    def __init__(self, collection, batch_size: int = MONGO_BATCH_SIZE, yield_tracker=None):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.yield_tracker = yield_tracker
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.failed = 0
+        self._buffer: list[dict] = []
+        self._writes: set[asyncio.Task] = set()
+
+    async def _write(self, batch: list[dict]) -> None:
+        try:
+            inserted, updated, unchanged = await asyncio.to_thread(
+                bulk_upsert_jobs, self.collection, batch, self.yield_tracker
+            )
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"  ⚠ MongoDB batch write failed ({len(batch)} jobs): {e}")
+            return
+        self.inserted += inserted
+        self.updated += updated
+        self.unchanged += unchanged
+
+    def flush(self) -> None:
+        """Start writing whatever is buffered without waiting for it."""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        task = asyncio.create_task(self._write(batch))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def write(self, job: dict) -> None:
+        self._buffer.append(job)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+        await asyncio.sleep(0)
+
+    async def close(self) -> None:
+        """Flush the buffer and wait for every in-flight batch."""
+        self.flush()
+        if self._writes:
+            await asyncio.gather(*list(self._writes))
+
+
+class IngestPipeline:
+    """Quality-filters job documents as they arrive and streams the valid ones into MongoDB."""
+
+    def __init__(self, collection, source: str = "web", batch_size: int = MONGO_BATCH_SIZE,
+                 yield_tracker=None):
+        self.source = source
+        self.sink = AsyncMongoSink(collection, batch_size, yield_tracker)
+        self.collected = 0
+        self.valid = 0
+        self.rejected = 0
+        self.duplicates = 0  # same jobHash seen twice in this run
+        self._hashes: set[str] = set()
+
+    async def put(self, job: dict) -> bool:
+        """Filter one document and queue it for writing; True if it was accepted."""
+        self.collected += 1
+        ok, reason = is_valid_job(job, source=self.source)
+        if not ok:
+            self.rejected += 1
+            metrics.incr("jobs_rejected")
+            print(f"  ✗ Rejected [{reason}]: {job.get('title', '?')[:40]}")
+            return False
+
+        self.valid += 1
+        metrics.incr("jobs_valid")
+        # Two upserts of the same jobHash in concurrent batches would race on the unique key
+        if job["jobHash"] in self._hashes:
+            self.duplicates += 1
+            metrics.incr("jobs_duplicate")
+            return True
+        self._hashes.add(job["jobHash"])
+        await self.sink.write(job)
+        return True
+
+    async def process_message(self, client, message, chat: str, parse_message, build_job_post,
+                              ocr: ImageOcr | None = None) -> bool:
+        """
+        Parse one Telegram message, upload its photo and queue the post; False if not a job.
+        The photo is downloaded at most once: for OCR when it is a poster (see
+        ImageOcr.wanted), then reused for the ImageKit upload.
+        """
+        img_bytes, ocr_text = None, ""
+        if ocr is not None and ocr.wanted(message):
+            img_bytes = await async_download_photo(client, message)
+            ocr_text = await ocr.text(img_bytes)
+        details = parse_message(message, ocr_text)
+        if details is None:
+            return False
+        image_url = None
+        if message.photo:
+            if img_bytes is None:
+                img_bytes = await async_download_photo(client, message)
+            image_url = await async_upload_image(img_bytes, f"telegram_{message.id}.jpg", folder="telegram-jobs")
+        await self.put(build_job_post(message, chat, details, image_url, ocr_text))
+        return True
+
+    async def scrape_chat(self, client, chat: str, parse_message, build_job_post,
+                          limit: int = MESSAGE_LIMIT, ocr: ImageOcr | None = None) -> datetime | None:
+        """
+        Fetch the recent messages of one chat; photo downloads, uploads and MongoDB writes
+        overlap the fetch. Returns the date of the oldest message read — the window
+        FreshnessTracker may count misses in — or None if nothing was read or a message failed.
+        """
+        print(f"🔍 Scraping: {chat} (limit={limit})")
+        entity = await client.get_entity(chat)
+        print(f"   Found: {getattr(entity, 'title', chat)}")
+
+        tasks = []
+        oldest = None
+        async for message in client.iter_messages(chat, limit=limit):
+            oldest = message.date if oldest is None else min(oldest, message.date)
+            tasks.append(asyncio.create_task(
+                self.process_message(client, message, chat, parse_message, build_job_post, ocr)
+            ))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        processed = sum(1 for r in results if r is True)
+        skipped = sum(1 for r in results if r is False)
+        for error in (r for r in results if isinstance(r, Exception)):
+            print(f"   ⚠ Message failed: {error}")
+        print(f"   Processed: {processed}  |  Skipped (non-job): {skipped}")
+        metrics.incr("messages_processed", processed)
+        metrics.incr("messages_skipped", skipped)
+        return oldest if processed + skipped == len(results) else None
+
+    async def close(self) -> None:
+        await self.sink.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def report(self) -> None:
+        """Print the same summary lines as the blocking filter + upsert path."""
+        print(f"\nTotal collected: {self.collected}")
+        if not self.collected:
+            print("⚠ No job posts found.")
+            return
+        print(f"   ✓ Passed: {self.valid}  |  ✗ Rejected: {self.rejected}")
+        if self.rejected:
+            report_validation(self.source)
+        print(f"   ✓ Inserted: {self.sink.inserted} new  |  Updated: {self.sink.updated}  |  "
+              f"Unchanged: {self.sink.unchanged}  |  Repeated in this run: {self.duplicates}")
+        if self.sink.failed:
+            print(f"   ⚠ Not written (MongoDB errors): {self.sink.failed}")
+
+
+async def run_telegram(name: str, chats: list[str], session_path: str, parse_message, build_job_post,
+                       collection=None, message_limit: int = MESSAGE_LIMIT) -> IngestPipeline:
+    """
+    Scrape the recent messages of every chat into MongoDB; returns the finished pipeline
+    (for its counts). `parse_message(message, ocr_text)` returns the job details or None;
+    `build_job_post(message, chat, details, image_url, ocr_text)` the document to store.
+    """
+    from telethon import TelegramClient
+
+    api_id, api_hash = load_telethon_credentials()
+    collection = collection if collection is not None else get_collection("telegram")
+
+    print(f"🔄 Connecting to Telegram ({name})...")
+
+    freshness = FreshnessTracker(collection, scope_field="group")
+    ocr = ImageOcr()
+    async with IngestPipeline(collection, source="telegram") as pipeline:
+        try:
+            async with TelegramClient(session_path, api_id, api_hash) as client:
+                print("✅ Connected to Telegram")
+
+                for chat in chats:
+                    try:
+                        since = await pipeline.scrape_chat(client, chat, parse_message, build_job_post,
+                                                           message_limit, ocr)
+                        if since is not None:
+                            # Older posts of the group were not fetched: they count no miss
+                            freshness.searched(chat, since=since)
+                    except Exception as e:
+                        print(f"❌ Error scraping {chat}: {e}")
+
+        except Exception as e:
+            print(f"❌ Telegram connection error: {e}")
+
+    ocr.close()
+    pipeline.report()
+    await asyncio.to_thread(freshness.save)
+    return pipeline
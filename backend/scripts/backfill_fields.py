@@ -0,0 +1,66 @@
+"""
+Backfill the structured job fields on documents stored before they were computed at ingest.
+- salaryMin/salaryMax/salaryCurrency, experienceMin/experienceMax, postedAt and the
+  location fields (cities, remote, hybrid, geo) are derived with
+  scraper_utils.structured_fields (relative dates count from createdAt)
+- Creates the job indexes (ensure_job_indexes) so range, city and geo queries are indexed
+- Safe to re-run: only documents without `cities` (set on every normalised job) are read
+
+Usage (from backend/scripts):
+    python3 backfill_fields.py
+    python3 backfill_fields.py --collections telegram --batch-size 1000
+"""
+
+import sys
+import argparse
+
+from scraper_utils import JOB_COLLECTIONS, get_collection, structured_fields, ensure_job_indexes
+from freshness import EXPIRED_RETENTION_DAYS
+
+sys.stdout.reconfigure(encoding="utf-8")
+
+# structured_fields() always sets cities, so its absence marks a job never normalised
+NORMALIZED_MARKER = "cities"
+
+
+def backfill(name: str, batch_size: int = 500) -> tuple[int, int]:
+    """Backfill one collection; returns (documents read, documents updated)."""
+    from pymongo import UpdateOne
+
+    collection = get_collection(name)
+    ensure_job_indexes(collection, JOB_COLLECTIONS[name], EXPIRED_RETENTION_DAYS)
+    missing = {NORMALIZED_MARKER: {"$exists": False}}
+    projection = {"salary": 1, "experience": 1, "postedDate": 1, "postingTime": 1,
+                  "location": 1, "workMode": 1, "text": 1, "ocrText": 1, "date": 1, "createdAt": 1}
+
+    read = updated = 0
+    operations = []
+    for doc in collection.find(missing, projection):
+        read += 1
+        fields = structured_fields(doc)
+        if fields:
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    return read, updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill structured job fields")
+    parser.add_argument("--collections", default=",".join(JOB_COLLECTIONS),
+                        help="comma-separated subset of " + ",".join(JOB_COLLECTIONS))
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    for name in (c.strip() for c in args.collections.split(",") if c.strip()):
+        if name not in JOB_COLLECTIONS:
+            parser.error(f"unknown collection: {name}")
+        read, updated = backfill(name, args.batch_size)
+        print(f"  ✓ {name}: {updated} of {read} documents given structured fields")
+
+
+if __name__ == "__main__":
+    main()
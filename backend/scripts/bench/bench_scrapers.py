@@ -0,0 +1,519 @@
+"""
+Offline scraper benchmark.
+- Serves recorded TimesJobs / HireJobs / Instahyre pages from bench/fixtures through a
+  local HTTP server and runs each scraper's scrape_role() against it in headless Chrome
+- Replays recorded Telegram messages through every channel parser and the quality filter
+- Reports jobs/sec, per-stage latency (from scraper_utils.metrics), the cost and
+  rejections of each validation rule, and peak RSS
+- Times the ingest normalisation (salary/experience/posted-date parsing, location
+  resolution) on a large synthetic sample built from the fixture values (--sites normalize)
+- Compares the memory of the in-run job buffer as dicts and as JobRecords over a
+  synthetic sample of HireJobs-shaped jobs (--sites memory)
+- --startup measures the import time of every entry point with python -X importtime
+
+Nothing leaves the machine: MongoDB is never written and ImageKit uploads are disabled.
+
+Usage (from backend/scripts):
+    python3 bench/bench_scrapers.py                        # all sites, 5 roles each
+    python3 bench/bench_scrapers.py --sites telegram --repeat 500
+    python3 bench/bench_scrapers.py --json bench_output.json
+    python3 bench/bench_scrapers.py --extraction-modes js,webdriver   # compare card extraction
+    python3 bench/bench_scrapers.py --browser-profiles lean,full      # compare Chrome profiles
+    python3 bench/bench_scrapers.py --startup              # entry-point import times
+    python3 bench/bench_scrapers.py --sites normalize --normalize-jobs 200000
+    python3 bench/bench_scrapers.py --sites memory --memory-jobs 50000
+    python3 bench/bench_scrapers.py --record hirejobs      # refresh fixtures from the live site
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import contextlib
+import resource
+import tracemalloc
+import subprocess
+import threading
+import importlib
+import urllib.parse
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+WEB_SITES = {
+    # site: (module, base-url env var)
+    "timesjobs": ("timesOfJob_scraper", "TIMESJOBS_BASE_URL"),
+    "hirejobs": ("hirejobs_scraper", "HIREJOBS_BASE_URL"),
+    "instahyre": ("instahyre_scraper", "INSTAHYRE_BASE_URL"),
+}
+TELEGRAM_MODULES = ["techuprise", "krishan_kumar", "kushal_vijay"]
+# Entry points timed by --startup: (script directory relative to SCRIPTS_DIR, module)
+ENTRY_POINTS = [("websites", module) for module, _ in WEB_SITES.values()] + \
+               [("telegram", module) for module in TELEGRAM_MODULES] + [(".", "run_scrapers")]
+
+# 1x1 transparent PNG served as every company logo
+_LOGO_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+# ── Fixture server ────────────────────────────────────────────────────────────
+def _route(path: str) -> tuple[str, str] | None:
+    """Map a request path to (fixture file, content type)."""
+    if path.startswith("/job-search"):
+        return "timesjobs/search.html", "text/html"
+    if path.startswith("/jobs"):
+        return "hirejobs/search.html", "text/html"
+    if path.startswith("/job/"):
+        return "hirejobs/detail.html", "text/html"
+    if path.startswith("/search-jobs"):
+        return "instahyre/search.html", "text/html"
+    return None
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = urllib.parse.urlparse(self.path).path
+        if path == "/static/logo.png":
+            return self._send(200, "image/png", _LOGO_PNG)
+        if path.startswith("/static/"):
+            return self._send(200, "text/css", b"")
+        route = _route(path)
+        if route is None:
+            return self._send(404, "text/plain", b"not found")
+        with open(os.path.join(FIXTURES_DIR, route[0]), "rb") as f:
+            self._send(200, route[1] + "; charset=utf-8", f.read())
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server() -> tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ── Environment ───────────────────────────────────────────────────────────────
+def prepare_environment(base_url: str | None) -> None:
+    """Point scrapers at the fixture server and turn off everything that needs the network."""
+    if base_url:
+        for _, env_var in WEB_SITES.values():
+            os.environ[env_var] = base_url
+    os.environ["SCRAPER_SLEEP_SCALE"] = "0"      # fixed sleeps only wait for live sites
+    os.environ["SCRAPER_ADAPTIVE_ROLES"] = "0"
+    os.environ.setdefault("SCRAPER_MAX_PAGES", "1")  # fixtures hold a single result page
+    # Checked on first use by scraper_utils; the benchmark never connects to either service
+    os.environ.setdefault("MONGO_URI", "mongodb://127.0.0.1:1/bench")
+    os.environ.setdefault("IMAGEKIT_PRIVATE_KEY", "bench")
+    sys.path.insert(0, SCRIPTS_DIR)
+    sys.path.insert(0, os.path.join(SCRIPTS_DIR, "websites"))
+    sys.path.insert(0, os.path.join(SCRIPTS_DIR, "telegram"))
+
+
+def _offline_upload(*args, **kwargs):
+    return None
+
+
+def _quiet(verbose: bool):
+    """Silence the scrapers' per-job progress lines unless --verbose is given."""
+    if verbose:
+        return contextlib.nullcontext()
+    return contextlib.redirect_stdout(open(os.devnull, "w"))
+
+
+# ── Memory ────────────────────────────────────────────────────────────────────
+def _peak_rss_mb_self() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# ── Benchmarks ────────────────────────────────────────────────────────────────
+def bench_web_site(site: str, roles: list[str], verbose: bool = False,
+                   extraction_mode: str | None = None, browser_profile: str | None = None) -> dict:
+    from scraper_utils import metrics, filter_jobs
+    from browser_pool import process_tree_rss_mb
+
+    module = importlib.import_module(WEB_SITES[site][0])
+    if hasattr(module, "upload_image_from_url"):
+        module.upload_image_from_url = _offline_upload
+
+    if browser_profile:
+        os.environ["SCRAPER_BROWSER_PROFILE"] = browser_profile
+
+    metrics.reset()
+    driver = module.create_driver()
+    browser_peak_mb = 0.0
+    try:
+        jobs = []
+        started = time.perf_counter()
+        with _quiet(verbose):
+            for role in roles:
+                if extraction_mode:
+                    jobs.extend(module.scrape_role(driver, role, extraction_mode=extraction_mode))
+                else:
+                    jobs.extend(module.scrape_role(driver, role))
+                browser_peak_mb = max(browser_peak_mb, process_tree_rss_mb(driver.service.process.pid, "VmHWM"))
+            valid, rejected = filter_jobs(jobs, source="web")
+        elapsed = time.perf_counter() - started
+    finally:
+        driver.quit()
+
+    summary = metrics.summary()
+    return {
+        "case": site + "".join(f"[{tag}]" for tag in (extraction_mode, browser_profile) if tag),
+        "roles": len(roles),
+        "jobs": len(jobs),
+        "valid": len(valid),
+        "rejected": rejected,
+        "seconds": round(elapsed, 3),
+        "jobsPerSec": round(len(jobs) / elapsed, 2) if elapsed else None,
+        "peakRssMb": round(_peak_rss_mb_self(), 1),
+        "browserPeakRssMb": round(browser_peak_mb, 1),
+        "stages": summary["stages"],
+        "validation": summary["validation"],
+    }
+
+
+def load_telegram_messages() -> list[SimpleNamespace]:
+    with open(os.path.join(FIXTURES_DIR, "telegram", "messages.json"), encoding="utf-8") as f:
+        raw = json.load(f)
+    return [
+        SimpleNamespace(
+            id=m["id"], text=m["text"], sender_id=m.get("sender_id"),
+            date=datetime.fromisoformat(m["date"]), photo=None,
+        )
+        for m in raw
+    ]
+
+
+def bench_telegram(messages: list[SimpleNamespace], repeat: int, verbose: bool = False) -> list[dict]:
+    from scraper_utils import metrics, filter_jobs
+
+    results = []
+    for name in TELEGRAM_MODULES:
+        module = importlib.import_module(name)
+        metrics.reset()
+        posts = []
+        started = time.perf_counter()
+        with _quiet(verbose):
+            for _ in range(repeat):
+                for message in messages:
+                    with metrics.timer("parse_message"):
+                        details = module.parse_message(message)
+                    if details is not None:
+                        posts.append(module.build_job_post(message, module.CHATS[0], details))
+            valid, rejected = filter_jobs(posts, source="telegram")
+        elapsed = time.perf_counter() - started
+        results.append({
+            "case": f"telegram:{name}",
+            "messages": len(messages) * repeat,
+            "jobs": len(posts),
+            "valid": len(valid),
+            "rejected": rejected,
+            "seconds": round(elapsed, 3),
+            "jobsPerSec": round(len(posts) / elapsed, 2) if elapsed else None,
+            "peakRssMb": round(_peak_rss_mb_self(), 1),
+            "stages": metrics.summary()["stages"],
+            "validation": metrics.validation_summary(),
+        })
+    return results
+
+
+# ── Recording ─────────────────────────────────────────────────────────────────
+def record_fixtures(site: str, role: str) -> None:
+    """Save the live search page (and, for HireJobs, the first detail page) as fixtures."""
+    module = importlib.import_module(WEB_SITES[site][0])
+    driver = module.create_driver()
+    try:
+        driver.get(module.search_url(role))
+        time.sleep(8)
+        pages = {"search.html": driver.page_source}
+        if site == "hirejobs":
+            link = driver.execute_script(
+                "const a = document.querySelector('div.bg-card a'); return a ? a.href : null;"
+            )
+            if link:
+                driver.get(link)
+                time.sleep(5)
+                pages["detail.html"] = driver.page_source
+    finally:
+        driver.quit()
+
+    for filename, source in pages.items():
+        path = os.path.join(FIXTURES_DIR, site, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+        print(f"  ✓ Recorded {path} ({len(source) // 1024} KB)")
+
+
+def bench_startup(repeat: int = 5) -> list[dict]:
+    """Import every entry point in a fresh interpreter; best of `repeat` -X importtime runs."""
+    results = []
+    for directory, module in ENTRY_POINTS:
+        cwd = os.path.normpath(os.path.join(SCRIPTS_DIR, directory))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [cwd, os.getenv("PYTHONPATH")])))
+        best = None
+        for _ in range(repeat):
+            proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                  cwd=cwd, env=env, capture_output=True, text=True)
+            # Last line: "import time: self | cumulative | module" for the entry point itself
+            lines = [l for l in proc.stderr.splitlines() if l.rstrip().endswith(f"| {module}")]
+            if proc.returncode or not lines:
+                print(f"  ⚠ {module} failed to import: {proc.stderr.strip().splitlines()[-1:]}")
+                break
+            micros = int(lines[-1].split("|")[1])
+            best = micros if best is None else min(best, micros)
+        results.append({"case": os.path.normpath(os.path.join(directory, module)),
+                        "importMs": round(best / 1000, 1) if best else None})
+    return results
+
+
+# Raw values as they appear on the fixture pages and in Telegram posts
+NORMALIZE_SALARIES = ["3-6 Lacs p.a.", "10.00 - 20.00 LPA", "Not disclosed", "₹ 3,00,000 - 6,00,000",
+                      "15k-20k per month", "12 LPA", "N/A", "5L - 8L", "$120k - $150k", "As per industry"]
+NORMALIZE_EXPERIENCE = ["0 - 3 Yrs", "2+ years", "Fresher", "5 yrs", "1 - 4 Yrs", "N/A", "3 to 5 years"]
+NORMALIZE_POSTED = ["Posted on: 5 days ago", "2 days ago", "Today", "2d ago", "3 weeks ago",
+                    "12 Oct, 2026", "Yesterday", "N/A", "30+ days ago"]
+NORMALIZE_LOCATIONS = ["Bengaluru / Bangalore, Hyderabad, Remote", "Gurgaon (Hybrid)", "Pune",
+                       "Chennai, Tamil Nadu, India", "Work From Home", "N/A", "Delhi NCR & Noida",
+                       "Multiple Locations"]
+
+
+def bench_normalize(count: int) -> list[dict]:
+    from scraper_utils import metrics, normalize_job
+
+    telegram_texts = [m.text for m in load_telegram_messages()]
+    jobs = []
+    for i in range(count):
+        if i % 4 == 3:
+            jobs.append({"text": telegram_texts[i % len(telegram_texts)], "date": datetime.now()})
+        else:
+            jobs.append({
+                "salary": NORMALIZE_SALARIES[i % len(NORMALIZE_SALARIES)],
+                "experience": NORMALIZE_EXPERIENCE[i % len(NORMALIZE_EXPERIENCE)],
+                "postingTime": NORMALIZE_POSTED[i % len(NORMALIZE_POSTED)],
+                "location": NORMALIZE_LOCATIONS[i % len(NORMALIZE_LOCATIONS)],
+            })
+
+    metrics.reset()
+    started = time.perf_counter()
+    with metrics.timer("normalize"):
+        for job in jobs:
+            normalize_job(job)
+    elapsed = time.perf_counter() - started
+    parsed = sum(1 for job in jobs if "salaryMin" in job or "experienceMin" in job or "postedAt" in job)
+    return [{
+        "case": "normalize",
+        "jobs": count,
+        "valid": parsed,
+        "seconds": round(elapsed, 3),
+        "jobsPerSec": round(count / elapsed, 2) if elapsed else None,
+        "peakRssMb": round(_peak_rss_mb_self(), 1),
+        "fieldsParsed": {
+            field: sum(1 for job in jobs if field in job)
+            for field in ("salaryMin", "experienceMin", "postedAt", "geo")
+        },
+        "stages": metrics.summary()["stages"],
+    }]
+
+
+MEMORY_COMPANIES = ["Infosys", "TCS", "Razorpay", "Swiggy", "Zoho", "Freshworks", "Acme Labs"]
+MEMORY_JOB_TYPES = ["Full Time", "Internship", "Contract"]
+MEMORY_WORK_MODES = ["On-site", "Remote", "Hybrid"]
+
+
+def _fresh(text: str) -> str:
+    # A new string object, as every value read from the page is
+    return text.encode("utf-8").decode("utf-8")
+
+
+def _synthetic_card(i: int) -> dict:
+    return {
+        "title": _fresh(f"Senior React Developer {i}"),
+        "company": _fresh(MEMORY_COMPANIES[i % len(MEMORY_COMPANIES)]),
+        "companyLogo": _fresh(f"https://ik.imagekit.io/scraped/logo_{i % 500}.png"),
+        "location": _fresh(NORMALIZE_LOCATIONS[i % len(NORMALIZE_LOCATIONS)]),
+        "experience": _fresh(NORMALIZE_EXPERIENCE[i % len(NORMALIZE_EXPERIENCE)]),
+        "salary": _fresh(NORMALIZE_SALARIES[i % len(NORMALIZE_SALARIES)]),
+        "jobType": _fresh(MEMORY_JOB_TYPES[i % len(MEMORY_JOB_TYPES)]),
+        "workMode": _fresh(MEMORY_WORK_MODES[i % len(MEMORY_WORK_MODES)]),
+        "postedDate": _fresh(NORMALIZE_POSTED[i % len(NORMALIZE_POSTED)]),
+        "description": _fresh(f"Build and maintain React front-ends for job {i}. " * 8),
+        "keySkills": _fresh("React, TypeScript, Redux, REST, Git"),
+        "domain": _fresh("Software"),
+        "apply_link": _fresh(f"https://hirejobs.in/jobs/{i}"),
+        "actualApplyLink": _fresh(f"https://careers.example.com/apply/{i}"),
+    }
+
+
+def _traced_mb(build) -> tuple[object, float, float]:
+    """(result, MB still allocated by build(), seconds)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size / 1024 / 1024, elapsed
+
+
+def bench_job_records(count: int) -> list[dict]:
+    from job_record import JobRecord
+    from scraper_utils import generate_job_hash
+
+    role = "React Developer"
+    dicts, dict_mb, dict_sec = _traced_mb(lambda: [
+        {**card, "source": "HireJobs", "searchedRole": _fresh(role),
+         "jobHash": generate_job_hash(card["title"], card["company"]), "createdAt": datetime.now(timezone.utc)}
+        for card in map(_synthetic_card, range(count))
+    ])
+    del dicts
+    records, record_mb, record_sec = _traced_mb(lambda: [
+        JobRecord(**card, source="HireJobs", searchedRole=_fresh(role),
+                  jobHash=generate_job_hash(card["title"], card["company"]))
+        for card in map(_synthetic_card, range(count))
+    ])
+    started = time.perf_counter()
+    documents = [record.to_document() for record in records]
+    convert_sec = time.perf_counter() - started
+
+    return [{
+        "case": "memory",
+        "jobs": count,
+        "valid": len(documents),
+        "seconds": round(record_sec, 3),
+        "jobsPerSec": round(count / record_sec, 2) if record_sec else None,
+        "peakRssMb": round(_peak_rss_mb_self(), 1),
+        "memory": {
+            "dictMb": round(dict_mb, 1),
+            "recordMb": round(record_mb, 1),
+            "dictBytesPerJob": round(dict_mb * 1024 * 1024 / count),
+            "recordBytesPerJob": round(record_mb * 1024 * 1024 / count),
+            "dictBuildSec": round(dict_sec, 3),
+            "toDocumentSec": round(convert_sec, 3),
+        },
+        "stages": {},
+    }]
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+def print_report(results: list[dict]) -> None:
+    print("\n" + "=" * 80)
+    print(f"{'case':<26}{'jobs':>7}{'valid':>7}{'sec':>9}{'jobs/s':>10}{'rss MB':>9}{'chrome MB':>11}")
+    print("-" * 80)
+    for r in results:
+        print(f"{r['case']:<26}{r['jobs']:>7}{r['valid']:>7}{r['seconds']:>9.2f}"
+              f"{(r['jobsPerSec'] or 0):>10.1f}{r['peakRssMb']:>9.1f}{r.get('browserPeakRssMb', 0):>11.1f}")
+    print("-" * 80)
+    for r in results:
+        stages = ", ".join(
+            f"{name} p50={s['p50Sec'] * 1000:.1f}ms p95={s['p95Sec'] * 1000:.1f}ms"
+            for name, s in r["stages"].items() if name != "sleep"
+        )
+        print(f"  {r['case']}: {stages}")
+        for source, rules in r.get("validation", {}).items():
+            costs = ", ".join(f"{name} {rule['usPerCheck']:.1f}µs rej={rule['rejected']}"
+                              for name, rule in rules.items())
+            print(f"    rules ({source}): {costs}")
+        if "memory" in r:
+            m = r["memory"]
+            print(f"    job buffer: dicts {m['dictMb']:.1f} MB ({m['dictBytesPerJob']} B/job), "
+                  f"JobRecords {m['recordMb']:.1f} MB ({m['recordBytesPerJob']} B/job), "
+                  f"to_document {m['toDocumentSec']:.2f}s")
+    print("=" * 80 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark")
+    parser.add_argument("--sites", default="timesjobs,hirejobs,instahyre,telegram",
+                        help="comma-separated subset of timesjobs,hirejobs,instahyre,telegram,normalize,memory")
+    parser.add_argument("--roles", type=int, default=5, help="roles to replay per website")
+    parser.add_argument("--repeat", type=int, default=200, help="times to replay the Telegram messages")
+    parser.add_argument("--normalize-jobs", type=int, default=100_000,
+                        help="sample size of the normalisation benchmark")
+    parser.add_argument("--memory-jobs", type=int, default=50_000,
+                        help="sample size of the job-buffer memory benchmark")
+    parser.add_argument("--extraction-modes", default="",
+                        help="comma-separated card extraction modes to compare (js,webdriver); "
+                             "default: SCRAPER_EXTRACTION_MODE")
+    parser.add_argument("--browser-profiles", default="",
+                        help="comma-separated Chrome profiles to compare (lean,full); "
+                             "default: SCRAPER_BROWSER_PROFILE")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="show the scrapers' own progress output")
+    parser.add_argument("--startup", action="store_true",
+                        help="only measure entry-point import time (python -X importtime)")
+    parser.add_argument("--record", choices=sorted(WEB_SITES), help="refresh fixtures for a site from the live page")
+    parser.add_argument("--record-role", default="React Developer")
+    args = parser.parse_args()
+
+    if args.record:
+        prepare_environment(None)
+        record_fixtures(args.record, args.record_role)
+        return
+
+    if args.startup:
+        prepare_environment(None)
+        results = bench_startup()
+        print(f"\n{'entry point':<36}{'import ms':>10}")
+        for r in results:
+            print(f"{r['case']:<36}{r['importMs'] if r['importMs'] is not None else 'failed':>10}")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+        return
+
+    sites = [s.strip() for s in args.sites.split(",") if s.strip()]
+    web_sites = [s for s in sites if s in WEB_SITES]
+    server, base_url = start_fixture_server() if web_sites else (None, None)
+    prepare_environment(base_url)
+
+    from job_roles import JOB_ROLES
+
+    extraction_modes = [m.strip() for m in args.extraction_modes.split(",") if m.strip()] or [None]
+    browser_profiles = [p.strip() for p in args.browser_profiles.split(",") if p.strip()] or [None]
+
+    results = []
+    try:
+        for site in web_sites:
+            for mode in extraction_modes:
+                for profile in browser_profiles:
+                    label = "".join(f" [{tag}]" for tag in (mode, profile) if tag)
+                    print(f"▶ {site}: replaying {args.roles} roles from {base_url}{label}")
+                    results.append(bench_web_site(site, JOB_ROLES[:args.roles], args.verbose, mode, profile))
+        if "telegram" in sites:
+            print(f"▶ telegram: replaying recorded messages x{args.repeat}")
+            results.extend(bench_telegram(load_telegram_messages(), args.repeat, args.verbose))
+        if "normalize" in sites:
+            print(f"▶ normalize: parsing structured fields of {args.normalize_jobs} jobs")
+            results.extend(bench_normalize(args.normalize_jobs))
+        if "memory" in sites:
+            print(f"▶ memory: buffering {args.memory_jobs} jobs as dicts and as JobRecords")
+            results.extend(bench_job_records(args.memory_jobs))
+    finally:
+        if server:
+            server.shutdown()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
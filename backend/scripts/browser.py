@@ -0,0 +1,175 @@
+"""
+Shared headless Chrome factory for the website scrapers.
+- One place for the Chrome flags the scrapers used to copy between each other
+- "lean" profile (default): blocks images, media, fonts and third-party trackers through
+  CDP Network.setBlockedURLs, turns off background features Chrome does not need for
+  scraping, uses a smaller window and the eager page-load strategy
+- "full" profile: the previous setup (everything loaded, 1920x1080, normal page load)
+
+The chromedriver binary is resolved once and cached on disk (CHROMEDRIVER_PATH skips the
+lookup entirely), so repeated launches do not hit webdriver_manager's version check.
+selenium's Chrome classes and webdriver_manager are imported on the first launch, which
+BrowserPool.warm() runs on its launch thread while the scraper plans its roles.
+
+Set SCRAPER_BROWSER_PROFILE=full to go back to the old behaviour, and
+SCRAPER_PAGE_LOAD_STRATEGY=normal|eager|none to override the load strategy.
+`python3 bench/bench_scrapers.py --browser-profiles lean,full` compares page-load time
+and Chrome memory of both profiles on the recorded fixtures.
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Network.setBlockedURLs patterns ("*" is the only wildcard)
+BLOCKED_IMAGES = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"]
+BLOCKED_MEDIA = ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*", "*.wav*"]
+BLOCKED_FONTS = ["*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+BLOCKED_TRACKERS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*adservice.google.*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*mixpanel.com*",
+    "*segment.io*",
+    "*cdn.segment.com*",
+    "*amplitude.com*",
+    "*newrelic.com*",
+    "*nr-data.net*",
+]
+
+# Chrome features that only cost CPU/memory in a scraping session
+LEAN_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--mute-audio",
+    "--no-first-run",
+    "--metrics-recording-only",
+]
+
+
+# Resolved chromedriver path, shared by every launch in this process and cached on disk
+DRIVER_PATH_CACHE = os.path.join(tempfile.gettempdir(), "scraper-chromedriver-path.json")
+DRIVER_PATH_MAX_AGE_SEC = 24 * 3600
+
+_driver_path: str | None = None
+_driver_path_lock = threading.Lock()
+
+
+def _read_cached_driver_path() -> str | None:
+    try:
+        with open(DRIVER_PATH_CACHE) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    path = cached.get("path")
+    fresh = time.time() - cached.get("resolvedAt", 0) < DRIVER_PATH_MAX_AGE_SEC
+    return path if fresh and path and os.access(path, os.X_OK) else None
+
+
+def chromedriver_path() -> str:
+    """Path of the chromedriver binary; resolved with webdriver_manager at most once a day."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path:
+            return _driver_path
+        path = os.getenv("CHROMEDRIVER_PATH") or _read_cached_driver_path()
+        if not path:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            try:
+                with open(DRIVER_PATH_CACHE, "w") as f:
+                    json.dump({"path": path, "resolvedAt": time.time()}, f)
+            except OSError:
+                pass
+        _driver_path = path
+        return path
+
+
+def browser_profile() -> str:
+    return os.getenv("SCRAPER_BROWSER_PROFILE", "lean")
+
+
+def blocked_url_patterns(block_images: bool = True) -> list[str]:
+    patterns = BLOCKED_MEDIA + BLOCKED_FONTS + BLOCKED_TRACKERS
+    if block_images:
+        patterns = BLOCKED_IMAGES + patterns
+    return patterns
+
+
+def build_options(headless: bool = True, stealth: bool = False, block_images: bool = True,
+                  extra_args: list[str] | None = None, profile: str | None = None):
+    """Chrome options for the given profile ("lean" or "full")."""
+    from selenium.webdriver.chrome.options import Options
+
+    profile = profile or browser_profile()
+    lean = profile == "lean"
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1366,768" if lean else "--window-size=1920,1080")
+    options.add_argument(f"--user-agent={USER_AGENT}")
+    for arg in extra_args or []:
+        options.add_argument(arg)
+
+    if stealth:
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+
+    if lean:
+        for arg in LEAN_ARGS:
+            options.add_argument(arg)
+        # Content-setting fallback in case the CDP block list cannot be installed
+        if block_images:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        options.page_load_strategy = os.getenv("SCRAPER_PAGE_LOAD_STRATEGY", "eager")
+    else:
+        options.page_load_strategy = os.getenv("SCRAPER_PAGE_LOAD_STRATEGY", "normal")
+    return options
+
+
+def new_driver(headless: bool = True, stealth: bool = False, block_images: bool = True,
+               extra_args: list[str] | None = None, profile: str | None = None):
+    """
+    Launch Chrome with the shared setup.
+    block_images=False keeps images loading (HireJobs reads rendered logo sizes);
+    stealth=True hides the usual automation markers (Instahyre).
+    """
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.webdriver import WebDriver as Chrome
+
+    profile = profile or browser_profile()
+    options = build_options(headless, stealth, block_images, extra_args, profile)
+    driver = Chrome(service=Service(chromedriver_path()), options=options)
+
+    if profile == "lean":
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns(block_images)})
+        except Exception as e:
+            print(f"  ⚠ Could not install the request block list: {e}")
+    if stealth:
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
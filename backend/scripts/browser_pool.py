@@ -0,0 +1,266 @@
+"""
+Warm Chrome pool and driver lifecycle for the website scrapers.
+- Launches drivers in the background so Chrome starts while the run is being planned
+- Health-checks a driver before handing it out and replaces dead ones
+- Recycles a driver after SCRAPER_BROWSER_MAX_PAGES page loads, when its process tree
+  grows past SCRAPER_BROWSER_MAX_RSS_MB, or after a WebDriver error (crash)
+- Spaces page loads per host through the shared rate limiter, and backs off (then
+  retries) when a site answers with a block / "too many requests" page
+
+Typical use inside a scraper:
+    pool = BrowserPool(create_driver)
+    pool.warm()
+    for job_role in planned_roles:
+        with pool.lease() as driver:
+            scrape_role(driver, job_role)
+    pool.close()
+"""
+
+import os
+import time
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from scraper_utils import metrics, rate_limiter
+from page_cache import load_cached
+
+DEFAULT_MAX_PAGES = int(os.getenv("SCRAPER_BROWSER_MAX_PAGES", "50"))
+# 0 disables the memory check
+DEFAULT_MAX_RSS_MB = float(os.getenv("SCRAPER_BROWSER_MAX_RSS_MB", "1500"))
+# Reloads of a page that came back as a block page (each after the host's backoff pause)
+BLOCK_RETRIES = int(os.getenv("SCRAPER_BLOCK_RETRIES", "1"))
+
+# Title and start of the body text, read in one round-trip to spot block pages
+_BLOCK_PROBE_JS = "return [document.title || '', ((document.body && document.body.innerText) || '').slice(0, 400)];"
+# Phrases of rate-limit, WAF and captcha interstitials; matched against the probe only,
+# so a job description further down the page cannot trip them
+_BLOCK_MARKERS = ("too many requests", "access denied", "request blocked", "are you a robot",
+                  "verify you are human", "unusual traffic", "attention required", "rate limit exceeded",
+                  "error 429", "429 too many")
+
+
+def process_tree_rss_mb(root_pid: int, field: str = "VmRSS") -> float:
+    """Sum of a /proc status field (VmRSS, VmHWM, …) over a process and its descendants — Linux only."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total_kb, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith(field + ":"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def pages_loaded(driver) -> int:
+    return getattr(driver, "pages_loaded", 0)
+
+
+def page_blocked(driver) -> bool:
+    """Whether the loaded page is a rate-limit / bot-check interstitial rather than content."""
+    try:
+        title, text = driver.execute_script(_BLOCK_PROBE_JS)
+    except WebDriverException:
+        return False
+    probe = f"{title} {text}".lower()
+    return any(marker in probe for marker in _BLOCK_MARKERS)
+
+
+def load_page(driver, url: str) -> bool:
+    """
+    driver.get() timed as the "page_load" stage and counted towards recycling.
+    Waits for the host's rate limit first; a block page penalizes the host and is
+    reloaded after the backoff, up to BLOCK_RETRIES times.
+    Returns True if the page was served from the on-disk page cache instead.
+    """
+    if load_cached(driver, url):
+        return True
+    for attempt in range(BLOCK_RETRIES + 1):
+        rate_limiter.acquire(url)
+        with metrics.timer("page_load"):
+            driver.get(url)
+        driver.pages_loaded = pages_loaded(driver) + 1
+        if not page_blocked(driver):
+            rate_limiter.succeeded(url)
+            return False
+        metrics.incr("pages_blocked")
+        pause = rate_limiter.penalize(url)
+        retrying = f"retrying in {pause:.0f}s" if attempt < BLOCK_RETRIES else "giving up on this page"
+        print(f"  🚫 Block page from {url[:80]} — {retrying}")
+    return False
+
+
+def wait_for_css(driver, selector: str, timeout: float, poll: float = 0.25) -> None:
+    """
+    Wait until an element matches the CSS selector, raising TimeoutException otherwise.
+    Same behaviour as WebDriverWait + presence_of_element_located, without importing
+    selenium.webdriver.support (which pulls in the whole remote WebDriver at startup).
+    """
+    deadline = time.monotonic() + timeout
+    while not driver.find_elements("css selector", selector):
+        if time.monotonic() >= deadline:
+            raise TimeoutException(f"No element matched {selector!r} within {timeout}s")
+        time.sleep(poll)
+
+
+def _driver_rss_mb(driver) -> float:
+    try:
+        return process_tree_rss_mb(driver.service.process.pid)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+def _quit(driver) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class BrowserPool:
+    """
+    Keeps `size` Chrome drivers warm and hands them out one lease at a time.
+    `factory` is the scraper's own create_driver, so every site keeps its Chrome options.
+    """
+
+    def __init__(self, factory, size: int = 1, max_pages: int | None = None,
+                 max_rss_mb: float | None = None):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages if max_pages is not None else DEFAULT_MAX_PAGES
+        self.max_rss_mb = max_rss_mb if max_rss_mb is not None else DEFAULT_MAX_RSS_MB
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="browser-launch")
+        self._idle: deque[Future] = deque()
+        self._lock = threading.Lock()
+        self._leased = 0
+        self._closed = False
+
+    # ── Launching ─────────────────────────────────────────────────────────
+    def _launch(self):
+        with metrics.timer("browser_launch"):
+            driver = self.factory()
+        metrics.incr("browsers_launched")
+        return driver
+
+    def _spawn(self) -> None:
+        # Launch in the caller's context so the launch is timed in the right scraper's metrics
+        self._idle.append(self._executor.submit(contextvars.copy_context().run, self._launch))
+
+    def warm(self) -> None:
+        """Start launching drivers in the background until `size` are warm or leased."""
+        with self._lock:
+            while len(self._idle) + self._leased < self.size:
+                self._spawn()
+
+    # ── Health ────────────────────────────────────────────────────────────
+    @staticmethod
+    def healthy(driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _worn_out(self, driver) -> str | None:
+        if self.max_pages and pages_loaded(driver) >= self.max_pages:
+            return f"{pages_loaded(driver)} pages loaded"
+        if self.max_rss_mb:
+            rss = _driver_rss_mb(driver)
+            if rss > self.max_rss_mb:
+                return f"{rss:.0f} MB RSS"
+        return None
+
+    # ── Leasing ───────────────────────────────────────────────────────────
+    def acquire(self):
+        """Return a healthy driver, waiting for a warm one or launching a fresh one."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool is closed")
+            if not self._idle:
+                self._spawn()
+            future = self._idle.popleft()
+            self._leased += 1
+
+        try:
+            return self._checked(future)
+        except Exception:
+            with self._lock:
+                self._leased -= 1
+            raise
+
+    def _checked(self, future: Future):
+        try:
+            driver = future.result()
+        except Exception as e:
+            print(f"  ⚠ Browser failed to start ({e}); retrying once")
+            return self._launch()
+
+        if not self.healthy(driver):
+            print("  ♻ Browser is unresponsive — replacing it")
+            metrics.incr("browsers_recycled")
+            _quit(driver)
+            driver = self._launch()
+        return driver
+
+    def release(self, driver, broken: bool = False) -> None:
+        """Return a driver; broken or worn-out drivers are replaced in the background."""
+        reason = "WebDriver error" if broken else self._worn_out(driver)
+        with self._lock:
+            self._leased -= 1
+            if self._closed:
+                _quit(driver)
+                return
+            if reason:
+                print(f"  ♻ Recycling browser ({reason})")
+                metrics.incr("browsers_recycled")
+                _quit(driver)
+                self._spawn()
+            else:
+                done = Future()
+                done.set_result(driver)
+                self._idle.append(done)
+
+    @contextmanager
+    def lease(self):
+        """Borrow a driver for a block; a WebDriverException marks it as crashed."""
+        driver = self.acquire()
+        try:
+            yield driver
+        except WebDriverException:
+            self.release(driver, broken=True)
+            raise
+        except BaseException:
+            self.release(driver)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for future in idle:
+            try:
+                _quit(future.result())
+            except Exception:
+                pass
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,235 @@
+"""
+Columnar snapshots of the scraped job collections, for analytics away from MongoDB.
+- Streams each collection through a cursor in batches of --batch-size documents, so
+  memory stays flat however large the collection is
+- Maps the four per-site schemas onto one table (SCHEMA): same column names and types
+  for every source, structured fields included (jobs stored before normalisation are
+  normalised on the way out)
+- Writes one file per source and run, partitioned hive-style:
+      <out>/source=<collection>/date=<YYYY-MM-DD>/jobs-<HHMMSS>.<parquet|arrow>
+
+Formats:
+    parquet (default)  zstd-compressed, smallest on disk; read with pyarrow/pandas/duckdb
+    arrow              Arrow IPC files; uncompressed by default so read_snapshot() can
+                       memory-map them without copying (--compression zstd trades that
+                       for size)
+The whole export directory reads back as one dataset, e.g.
+    pyarrow.dataset.dataset("exports", format="parquet", partitioning="hive")
+
+pyarrow is only needed here (pip install pyarrow); the scrapers never import it.
+
+Usage (from backend/scripts):
+    python3 export_jobs.py
+    python3 export_jobs.py --collections hirejobs,instahyre --format arrow --out /data/jobs
+    python3 export_jobs.py --include-expired
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import datetime, timezone
+
+from scraper_utils import JOB_COLLECTIONS, get_collection, structured_fields
+
+sys.stdout.reconfigure(encoding="utf-8")
+
+DEFAULT_EXPORT_DIR = os.getenv(
+    "SCRAPER_EXPORT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports")
+)
+FORMATS = ("parquet", "arrow")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise SystemExit("❌ pyarrow is not installed (pip install pyarrow)") from None
+    return pyarrow
+
+
+def job_schema():
+    """The unified column layout of every snapshot."""
+    pa = _require_pyarrow()
+    timestamp = pa.timestamp("ms", tz="UTC")
+    return pa.schema([
+        ("jobHash", pa.string()),
+        ("source", pa.string()),
+        ("scope", pa.string()),
+        ("title", pa.string()),
+        ("company", pa.string()),
+        ("location", pa.string()),
+        ("cities", pa.list_(pa.string())),
+        ("remote", pa.bool_()),
+        ("hybrid", pa.bool_()),
+        ("salaryMin", pa.float64()),
+        ("salaryMax", pa.float64()),
+        ("salaryCurrency", pa.string()),
+        ("experienceMin", pa.float64()),
+        ("experienceMax", pa.float64()),
+        ("skills", pa.list_(pa.string())),
+        ("jobType", pa.string()),
+        ("workMode", pa.string()),
+        ("applyLink", pa.string()),
+        ("postedAt", timestamp),
+        ("createdAt", timestamp),
+        ("firstSeenAt", timestamp),
+        ("lastSeenAt", timestamp),
+        ("updatedAt", timestamp),
+        ("expiredAt", timestamp),
+        ("missedRuns", pa.int32()),
+    ])
+
+
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return None if value.lower() in ("", "n/a", "na", "none", "null") else value
+
+
+def _utc(value) -> datetime | None:
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def to_row(doc: dict, collection: str) -> dict:
+    """One stored job document as a SCHEMA row."""
+    if "cities" not in doc:
+        doc = {**doc, **structured_fields(doc)}
+    skills = _text(doc.get("keySkills"))
+    return {
+        "jobHash": doc.get("jobHash"),
+        "source": collection,
+        "scope": _text(doc.get(JOB_COLLECTIONS[collection])),
+        "title": _text(doc.get("title")),
+        "company": _text(doc.get("company")),
+        "location": _text(doc.get("location")),
+        "cities": doc.get("cities") or [],
+        "remote": doc.get("remote"),
+        "hybrid": doc.get("hybrid"),
+        "salaryMin": doc.get("salaryMin"),
+        "salaryMax": doc.get("salaryMax"),
+        "salaryCurrency": doc.get("salaryCurrency"),
+        "experienceMin": doc.get("experienceMin"),
+        "experienceMax": doc.get("experienceMax"),
+        "skills": [s.strip() for s in skills.split(",") if s.strip()] if skills else [],
+        "jobType": _text(doc.get("jobType")),
+        "workMode": _text(doc.get("workMode")),
+        "applyLink": _text(doc.get("actualApplyLink")) or _text(doc.get("apply_link")),
+        "postedAt": _utc(doc.get("postedAt")),
+        "createdAt": _utc(doc.get("createdAt")),
+        "firstSeenAt": _utc(doc.get("firstSeenAt")),
+        "lastSeenAt": _utc(doc.get("lastSeenAt")),
+        "updatedAt": _utc(doc.get("updatedAt")),
+        "expiredAt": _utc(doc.get("expiredAt")),
+        "missedRuns": doc.get("missedRuns"),
+    }
+
+
+class _SnapshotWriter:
+    """Appends record batches to one Parquet or Arrow IPC file, created on the first write."""
+
+    def __init__(self, path: str, schema, fmt: str, compression: str | None):
+        self.path, self.schema, self.fmt, self.compression = path, schema, fmt, compression
+        self.rows = 0
+        self._writer = self._sink = None
+
+    def _open(self):
+        pa = _require_pyarrow()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(self.path, self.schema, compression=self.compression or "none")
+        self._sink = pa.OSFile(self.path, "wb")
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        return pa.ipc.new_file(self._sink, self.schema, options=options)
+
+    def write(self, rows: list[dict]) -> None:
+        pa = _require_pyarrow()
+        if self._writer is None:
+            self._writer = self._open()
+        self._writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+
+def export_collection(name: str, out_dir: str, fmt: str = "parquet", compression: str | None = "zstd",
+                      batch_size: int = 5000, include_expired: bool = False,
+                      run_at: datetime | None = None) -> tuple[str | None, int]:
+    """Stream one collection into a snapshot file; returns (path, rows) — no file if empty."""
+    run_at = run_at or datetime.now(timezone.utc)
+    query = {} if include_expired else {"expiredAt": {"$exists": False}}
+    path = os.path.join(out_dir, f"source={name}", f"date={run_at:%Y-%m-%d}", f"jobs-{run_at:%H%M%S}.{fmt}")
+
+    writer = _SnapshotWriter(path, job_schema(), fmt, compression)
+    cursor = get_collection(name).find(query, batch_size=batch_size)
+    rows = []
+    try:
+        for doc in cursor:
+            rows.append(to_row(doc, name))
+            if len(rows) >= batch_size:
+                writer.write(rows)
+                rows = []
+        if rows:
+            writer.write(rows)
+    finally:
+        cursor.close()
+        writer.close()
+    return (path if writer.rows else None), writer.rows
+
+
+def read_snapshot(path: str):
+    """
+    Load one snapshot as a pyarrow Table. Arrow IPC files are memory-mapped, so an
+    uncompressed snapshot is read without copying its column buffers.
+    """
+    pa = _require_pyarrow()
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.read_table(path, memory_map=True)
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the scraped jobs as columnar snapshots")
+    parser.add_argument("--collections", default=",".join(JOB_COLLECTIONS),
+                        help="comma-separated subset of " + ",".join(JOB_COLLECTIONS))
+    parser.add_argument("--out", default=DEFAULT_EXPORT_DIR, help=f"export directory (default: {DEFAULT_EXPORT_DIR})")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--compression", default=None,
+                        help="zstd, lz4 or none (default: zstd for parquet, none for arrow)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--include-expired", action="store_true",
+                        help="also export jobs marked expired (see freshness.py)")
+    args = parser.parse_args()
+
+    names = [c.strip() for c in args.collections.split(",") if c.strip()]
+    for name in names:
+        if name not in JOB_COLLECTIONS:
+            parser.error(f"unknown collection: {name}")
+    compression = args.compression or ("zstd" if args.format == "parquet" else "none")
+    compression = None if compression == "none" else compression
+    _require_pyarrow()
+
+    run_at = datetime.now(timezone.utc)
+    for name in names:
+        started = time.monotonic()
+        path, rows = export_collection(name, args.out, args.format, compression, args.batch_size,
+                                       args.include_expired, run_at)
+        if path is None:
+            print(f"  – {name}: no jobs to export")
+            continue
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"  ✓ {name}: {rows} jobs → {path} ({size_mb:.1f} MB, {time.monotonic() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Job freshness: when each stored job was last seen, and expiry of jobs that are gone.
+- bulk_upsert_jobs stamps lastSeenAt (and resets missedRuns) on every sighting, as part
+  of the writes it already makes (insert, content update, or the unchanged-jobs touch)
+- Every card on a result page a website scraper read is reported with page_read(), so
+  jobs sighted without being written (cards already stored, pages PageFingerprints
+  skipped as unchanged, cards past the per-page collection cap) are touched with a
+  single update_many at save()
+- After a run, jobs of the scopes searched this run (website roles, Telegram groups)
+  that were not seen get missedRuns += 1; after SCRAPER_EXPIRE_AFTER_RUNS misses
+  (default 3) they are marked with expiredAt
+- A TTL index on expiredAt deletes expired jobs SCRAPER_EXPIRED_RETENTION_DAYS later
+  (default 7), so the job collections stay proportional to live openings
+
+Only scopes read to their end count misses. A website role is read to its end when
+the last result page walked was empty, or shorter than a full page of the site (the
+size of pages that were followed by another page this run): a role whose walk stopped
+on a full page — known jobs, the time budget, SCRAPER_MAX_PAGES — may have more listings
+on pages never read. Scopes not searched this run (roles RoleScheduler skipped) and
+scopes only partly read (timeouts, unreadable cards — see partial()) are left untouched
+too. A job seen again is revived (expiredAt is removed). Where a run only reads recent
+listings (the last Telegram messages of a group), searched(scope, since=…) limits misses
+to jobs dated inside that window.
+SCRAPER_EXPIRE_AFTER_RUNS=0 only records sightings and never expires anything.
+"""
+
+import os
+from datetime import datetime, timezone
+
+from scraper_utils import ensure_job_indexes, metrics
+
+EXPIRE_AFTER_RUNS = int(os.getenv("SCRAPER_EXPIRE_AFTER_RUNS", "3"))
+EXPIRED_RETENTION_DAYS = float(os.getenv("SCRAPER_EXPIRED_RETENTION_DAYS", "7"))
+
+
+class FreshnessTracker:
+    """
+    Records which scopes a run searched and expires the jobs it did not see there.
+
+    Typical use inside a scraper:
+        freshness = FreshnessTracker(collection)
+        for job_role in planned_roles:
+            ...                                    # per result page read:
+            freshness.page_read(job_role, raw_cards, total, build_card, card_hash)
+            ...
+            freshness.searched(job_role)
+        bulk_upsert_jobs(collection, valid_jobs)
+        freshness.save()
+    """
+
+    def __init__(self, collection, scope_field: str = "searchedRole", expire_after_runs: int | None = None,
+                 window_field: str = "date"):
+        self.collection = collection
+        self.scope_field = scope_field
+        self.window_field = window_field
+        self.expire_after_runs = EXPIRE_AFTER_RUNS if expire_after_runs is None else expire_after_runs
+        # Anything written by bulk_upsert_jobs during this run has lastSeenAt >= started
+        self.started = datetime.now(timezone.utc)
+        self._scopes: set[str] = set()
+        self._partial: set[str] = set()
+        # Cards listed on each result page read, per website role, in page order
+        self._pages: dict[str, list[int]] = {}
+        # Scopes read only back to a date: older jobs there were never looked at
+        self._since: dict[str, datetime] = {}
+        self._seen: set[str] = set()
+
+    def searched(self, scope: str, since: datetime | None = None) -> None:
+        """
+        Mark a role/group as searched this run; if it was read to its end, its unseen jobs
+        count a missed run. With `since`, only its jobs whose window_field is at or after
+        that date do.
+        """
+        self._scopes.add(scope)
+        if since is not None:
+            self._since[scope] = since
+
+    def partial(self, scope: str) -> None:
+        """Mark a role/group as only partly read this run: none of its jobs count a miss."""
+        self._partial.add(scope)
+
+    def page_read(self, scope: str, raw_cards: list[dict | None], total: int, build_card, card_hash) -> None:
+        """
+        Record one result page of a role: every card read from it is still listed, however
+        many of them are collected. `build_card` / `card_hash` are the scraper's own (raw
+        fields -> listing or None, listing -> jobHash); a None entry in raw_cards (a card
+        that could not be read) leaves the role partial.
+        """
+        cards = [build_card(fields) for fields in raw_cards if fields is not None]
+        self.seen(card_hash(card) for card in cards if card is not None)
+        self._pages.setdefault(scope, []).append(total)
+        if len(cards) < total:
+            self.partial(scope)
+
+    def full_page_size(self) -> int | None:
+        """Cards on a full result page: the most any page followed by another page listed."""
+        sizes = [listed[i] for listed in self._pages.values() for i in range(len(listed) - 1) if listed[i + 1]]
+        return max(sizes) if sizes else None
+
+    def read_to_end(self, scope: str) -> bool:
+        """True if the last result page read for the role was its last one (see the module docstring)."""
+        if scope not in self._pages:
+            return True  # not paged (Telegram groups): searched() is the whole story
+        last, full = self._pages[scope][-1], self.full_page_size()
+        return last == 0 or (full is not None and last < full)
+
+    @property
+    def complete_scopes(self) -> list[str]:
+        return sorted(scope for scope in self._scopes - self._partial if self.read_to_end(scope))
+
+    def _scope_filter(self, scopes: list[str]) -> dict:
+        """Filter of the jobs in `scopes` that this run looked for."""
+        whole = [scope for scope in scopes if scope not in self._since]
+        clauses = [{self.scope_field: {"$in": whole}}] if whole else []
+        clauses += [{self.scope_field: scope, self.window_field: {"$gte": self._since[scope]}}
+                    for scope in scopes if scope in self._since]
+        return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+    def seen(self, job_hashes) -> None:
+        """Record jobs that are still listed but were not rewritten this run."""
+        self._seen.update(job_hashes)
+
+    def save(self) -> None:
+        """Touch the recorded sightings, then count misses and expire jobs (after the upserts)."""
+        ensure_job_indexes(self.collection, self.scope_field, EXPIRED_RETENTION_DAYS)
+        now = datetime.now(timezone.utc)
+        try:
+            if self._seen:
+                self.collection.update_many(
+                    {"jobHash": {"$in": list(self._seen)}},
+                    {"$set": {"lastSeenAt": now, "missedRuns": 0}, "$unset": {"expiredAt": ""}},
+                )
+            scopes = self.complete_scopes
+            if not self.expire_after_runs or not scopes:
+                return
+
+            live_in_scope = {**self._scope_filter(scopes), "expiredAt": {"$exists": False}}
+            with metrics.timer("mongo_expire"):
+                # $not also matches jobs stored before lastSeenAt existed
+                missed = self.collection.update_many(
+                    {**live_in_scope, "lastSeenAt": {"$not": {"$gte": self.started}}},
+                    {"$inc": {"missedRuns": 1}},
+                )
+                expired = self.collection.update_many(
+                    {**live_in_scope, "missedRuns": {"$gte": self.expire_after_runs}},
+                    {"$set": {"expiredAt": now}},
+                )
+        except Exception as e:
+            print(f"  ⚠ Could not update job freshness: {e}")
+            return
+
+        metrics.incr("jobs_missed", missed.modified_count)
+        metrics.incr("jobs_expired", expired.modified_count)
+        print(f"   ⌛ Not seen this run: {missed.modified_count}  |  Expired: {expired.modified_count} "
+              f"(after {self.expire_after_runs} missed runs)")
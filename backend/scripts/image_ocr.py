@@ -0,0 +1,176 @@
+"""
+Optional OCR of Telegram job posters (posts that are an image with little or no text).
+- Recognises text locally with Tesseract (pytesseract + Pillow); nothing leaves the machine
+- Runs in a process pool, so the CPU-bound recognition never blocks the message loop
+  (or the GIL shared with the upload and MongoDB threads)
+- Caches the text per image content hash, in memory and on disk (.ocr_cache/), so an
+  image re-posted or seen again next run is never recognised twice; identical images
+  arriving together share one recognition
+
+Off unless SCRAPER_OCR=1. Needs `pip install pytesseract pillow` and the tesseract
+binary (apt install tesseract-ocr); when either is missing OCR turns itself off for
+the run with a warning and posts are parsed from their text alone.
+
+Typical use (IngestPipeline.process_message in async_ingest.py):
+    ocr = ImageOcr()
+    if ocr.wanted(message):
+        img_bytes = await async_download_photo(client, message)   # reused for the upload
+        ocr_text = await ocr.text(img_bytes)
+    details = parse_message(message, ocr_text)
+    ...
+    ocr.close()
+"""
+
+import os
+import asyncio
+import hashlib
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from scraper_utils import metrics
+
+OCR_ENABLED = os.getenv("SCRAPER_OCR", "0") == "1"
+OCR_WORKERS = int(os.getenv("SCRAPER_OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Posts with at least this many characters of text are parsed as they are
+OCR_MAX_TEXT = int(os.getenv("SCRAPER_OCR_MAX_TEXT", "120"))
+OCR_LANG = os.getenv("SCRAPER_OCR_LANG", "eng")
+OCR_TIMEOUT_SEC = 60
+# Tesseract reads small poster text far better once the image is upscaled
+_MIN_OCR_WIDTH = 1200
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ocr_cache")
+
+
+def _recognise(image_bytes: bytes, lang: str) -> str:
+    """Text of an image (runs in a pool worker)."""
+    import io
+    import pytesseract
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        image = ImageOps.grayscale(image)
+        if image.width < _MIN_OCR_WIDTH:
+            scale = _MIN_OCR_WIDTH / image.width
+            image = image.resize((_MIN_OCR_WIDTH, round(image.height * scale)), Image.LANCZOS)
+        text = pytesseract.image_to_string(image, lang=lang)
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def _engine_missing() -> str | None:
+    """Why the OCR engine cannot run here, or None if it can."""
+    # Pillow is only imported by the pool workers: check that it is there without loading it
+    missing = [name for name in ("pytesseract", "PIL") if importlib.util.find_spec(name) is None]
+    if missing:
+        return f"{missing[0]} is not installed (pip install pytesseract pillow)"
+    import pytesseract
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception:
+        return "the tesseract binary was not found (apt install tesseract-ocr)"
+    return None
+
+
+class ImageOcr:
+    """Recognises the text of message photos in a process pool, cached by image hash."""
+
+    def __init__(self, enabled: bool | None = None, workers: int | None = None,
+                 cache_dir: str | None = None):
+        self.enabled = OCR_ENABLED if enabled is None else enabled
+        self.workers = max(1, workers or OCR_WORKERS)
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self._pool: ProcessPoolExecutor | None = None
+        self._texts: dict[str, str] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+        if self.enabled:
+            reason = _engine_missing()
+            if reason:
+                print(f"  ⚠ OCR disabled: {reason}")
+                self.enabled = False
+
+    def wanted(self, message) -> bool:
+        """Whether a message is a poster worth reading: a photo with little text."""
+        return self.enabled and bool(message.photo) and len((message.text or "").strip()) < OCR_MAX_TEXT
+
+    def _cache_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest[:2], digest + ".txt")
+
+    def _cached(self, digest: str) -> str | None:
+        if digest in self._texts:
+            return self._texts[digest]
+        try:
+            with open(self._cache_path(digest), encoding="utf-8") as f:
+                text = self._texts[digest] = f.read()
+            return text
+        except OSError:
+            return None
+
+    def _store(self, digest: str, text: str) -> None:
+        self._texts[digest] = text
+        path = self._cache_path(digest)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        except OSError as e:
+            print(f"  ⚠ Could not cache OCR text: {e}")
+
+    async def text(self, img_bytes: bytes | None) -> str:
+        """Recognised text of an image ("" when disabled, empty or unreadable)."""
+        if not self.enabled or not img_bytes:
+            return ""
+        digest = hashlib.sha256(img_bytes).hexdigest()
+        cached = self._cached(digest)
+        if cached is not None:
+            metrics.incr("ocr_cache_hits")
+            return cached
+        if digest in self._pending:
+            metrics.incr("ocr_cache_hits")
+            return await asyncio.shield(self._pending[digest])
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[digest] = future
+        text = ""
+        try:
+            text = await self._recognise(img_bytes)
+            if text is not None:
+                self._store(digest, text)
+        finally:
+            future.set_result(text or "")
+            del self._pending[digest]
+        return text or ""
+
+    async def _recognise(self, img_bytes: bytes) -> str | None:
+        # None when recognition failed: not cached, so the next run tries again
+        if not self.enabled:
+            return None
+        if self._pool is None:
+            # spawn, not fork: the parent already runs upload and MongoDB threads
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        loop = asyncio.get_running_loop()
+        try:
+            with metrics.timer("ocr"):
+                text = await asyncio.wait_for(
+                    loop.run_in_executor(self._pool, _recognise, img_bytes, OCR_LANG), OCR_TIMEOUT_SEC
+                )
+            metrics.incr("ocr_images")
+            return text
+        except BrokenProcessPool as e:
+            # A worker died (out of memory, killed…): stop OCR for the run rather than fail every image
+            metrics.incr("ocr_failed")
+            print(f"  ⚠ OCR worker pool broke, OCR disabled for this run: {e}")
+            self.enabled = False
+            self.close()
+            return None
+        except Exception as e:
+            metrics.incr("ocr_failed")
+            print(f"  ⚠ OCR failed: {type(e).__name__}: {e}")
+            return None
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,78 @@
+"""
+Compact in-run representation of the jobs a website scraper collects.
+- JobRecord keeps a job's fields in __slots__, so the per-job dict (and its hash table)
+  is only built when the job is written
+- Values many jobs share (source, searched role, company, location, salary and
+  experience bands…) are interned: each distinct string is kept once per run instead
+  of once per card it was read from
+- The collection time is a float timestamp; the createdAt datetime is made in
+  to_document()
+
+Records read like the dicts they replace (record["title"], record.get("keySkills"),
+"description" in record), so the quality filter runs on them unchanged, and
+bulk_upsert_jobs turns them into MongoDB documents.
+
+Typical use inside a scraper:
+    role_jobs.append(JobRecord(**card, source="TimesJobs", searchedRole=job_role,
+                               jobHash=card_hash(card)))
+    ...
+    bulk_upsert_jobs(collection, valid_jobs)    # record.to_document() per job
+"""
+
+import sys
+import time
+from datetime import datetime, timezone
+
+# Every field a website scraper collects, in document order
+FIELDS = (
+    "title", "company", "companyLogo", "location", "experience", "salary", "jobType",
+    "workMode", "postedDate", "postingTime", "description", "keySkills", "domain",
+    "apply_link", "actualApplyLink", "source", "searchedRole", "jobHash",
+)
+_FIELD_SET = frozenset(FIELDS)
+# Fields whose values repeat across jobs; titles, links and descriptions rarely do
+_INTERNED = frozenset({"company", "location", "experience", "salary", "jobType", "workMode",
+                       "postedDate", "postingTime", "domain", "source", "searchedRole"})
+_MISSING = object()
+
+
+class JobRecord:
+    """One collected job: the FIELDS that were given, plus when it was collected."""
+
+    __slots__ = FIELDS + ("created",)
+
+    def __init__(self, created: float | None = None, **fields):
+        self.created = time.time() if created is None else created
+        for key, value in fields.items():
+            if key not in _FIELD_SET:
+                raise TypeError(f"JobRecord has no field {key!r}")
+            if key in _INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+
+    def get(self, key: str, default=None):
+        if key == "createdAt":
+            return datetime.fromtimestamp(self.created, timezone.utc)
+        return getattr(self, key, default) if key in _FIELD_SET else default
+
+    def __getitem__(self, key: str):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __repr__(self) -> str:
+        return f"JobRecord({self.get('title')!r} @ {self.get('company')!r})"
+
+    def to_document(self) -> dict:
+        """The job as the dict stored in MongoDB (fields that were set, then createdAt)."""
+        document = {}
+        for key in FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                document[key] = value
+        document["createdAt"] = datetime.fromtimestamp(self.created, timezone.utc)
+        return document
@@ -0,0 +1,90 @@
+"""
+Location resolution for scraped jobs, backed by an offline gazetteer (locations.json).
+- Splits multi-city strings ("Bengaluru / Bangalore, Hyderabad, Remote") into parts
+- Maps every part (or the longest known alias inside it) to a canonical city name
+- Attaches coordinates as a GeoJSON MultiPoint, for a 2dsphere index
+- Flags remote and hybrid listings (from the text or the site's work-mode field)
+
+locations.json is shared with the API (backend/utils/jobLocation.js), which resolves
+the portal's location filter with the same aliases. Add a city there, not here.
+"""
+
+import os
+import re
+import json
+from functools import lru_cache
+
+_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locations.json")
+# Longest alias in words; longer windows are never looked up
+_MAX_ALIAS_WORDS = 3
+
+# Separators between cities: "A / B", "A, B", "A | B", "A & B", "A or B", "A (B)"
+_SPLIT = re.compile(r"\s*(?:[,/|;&()\[\]+]|\band\b|\bor\b|\s-\s)\s*", re.I)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def _key(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _load_gazetteer() -> tuple[dict[str, dict], list[str], list[str]]:
+    with open(_GAZETTEER_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    aliases = {}
+    for city in data["cities"]:
+        for alias in [city["name"], *city.get("aliases", [])]:
+            aliases[_key(alias)] = city
+    return aliases, [_key(p) for p in data["remote"]], [_key(p) for p in data["hybrid"]]
+
+
+CITY_ALIASES, _REMOTE_PHRASES, _HYBRID_PHRASES = _load_gazetteer()
+
+
+def _has_phrase(key: str, phrases: list[str]) -> bool:
+    padded = f" {key} "
+    return any(f" {phrase} " in padded for phrase in phrases)
+
+
+def _match_city(part: str) -> dict | None:
+    """The city a location part names: an exact alias, else the longest alias inside it."""
+    key = _key(part)
+    if not key:
+        return None
+    if key in CITY_ALIASES:
+        return CITY_ALIASES[key]
+    words = key.split()
+    for size in range(min(_MAX_ALIAS_WORDS, len(words)), 0, -1):
+        for start in range(len(words) - size + 1):
+            city = CITY_ALIASES.get(" ".join(words[start:start + size]))
+            if city:
+                return city
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _resolve(text: str, work_mode: str) -> tuple[tuple[dict, ...], bool, bool]:
+    cities: list[dict] = []
+    for part in _SPLIT.split(text):
+        city = _match_city(part)
+        if city and city not in cities:
+            cities.append(city)
+    flags = _key(f"{text} {work_mode}")
+    return tuple(cities), _has_phrase(flags, _REMOTE_PHRASES), _has_phrase(flags, _HYBRID_PHRASES)
+
+
+def resolve_location(text, work_mode=None) -> dict:
+    """
+    Resolve a free-text location into indexed fields:
+        cities : canonical city names, in order of appearance (possibly empty)
+        remote : listed as remote / work from home
+        hybrid : listed as hybrid
+        geo    : GeoJSON MultiPoint of the cities' coordinates (only when there are cities)
+    "Bengaluru / Bangalore, Hyderabad, Remote" → cities ["Bengaluru", "Hyderabad"], remote True.
+    `work_mode` is the site's own field where it has one (HireJobs: "Remote", "Hybrid"…).
+    Results are cached: listings repeat the same few location strings.
+    """
+    cities, remote, hybrid = _resolve(str(text or ""), str(work_mode or ""))
+    fields = {"cities": [city["name"] for city in cities], "remote": remote, "hybrid": hybrid}
+    if cities:
+        fields["geo"] = {"type": "MultiPoint", "coordinates": [[city["lng"], city["lat"]] for city in cities]}
+    return fields
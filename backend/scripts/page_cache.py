@@ -0,0 +1,195 @@
+"""
+On-disk cache of rendered search/detail pages, for selector work and re-runs.
+- Pages are stored gzip-compressed and content-addressed (sha256 of the HTML), so the
+  same page seen under several URLs or days is kept once
+- Lookups are keyed by URL + date bucket (one bucket per SCRAPER_PAGE_CACHE_BUCKET_HOURS,
+  default 24; SCRAPER_PAGE_CACHE_BUCKET=2026-10-19 pins a recorded day)
+- Least-recently-used pages are evicted once the cache exceeds SCRAPER_PAGE_CACHE_MAX_MB
+- The snapshot is the rendered DOM with scripts removed and a <base href> added, so it can
+  be written back into Chrome and read by the unchanged extraction code
+
+SCRAPER_PAGE_CACHE selects the mode:
+    off (default)  never touch the cache
+    readwrite      serve hits from disk, fetch misses live and store them
+    offline        serve from disk only; a miss raises PageCacheMiss
+Replaying a recorded run offline re-extracts all roles in seconds:
+    SCRAPER_PAGE_CACHE=offline SCRAPER_PAGE_CACHE_BUCKET=2026-10-19 python3 websites/timesOfJob_scraper.py
+"""
+
+import os
+import gzip
+import hashlib
+from datetime import datetime, timezone
+
+from scraper_utils import metrics
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".page_cache")
+
+# Rendered DOM without scripts (they already ran) and with a <base> so relative links still resolve
+SNAPSHOT_JS = """
+const root = document.documentElement.cloneNode(true);
+root.querySelectorAll("script, noscript").forEach((el) => el.remove());
+let head = root.querySelector("head");
+if (!head) {
+    head = document.createElement("head");
+    root.insertBefore(head, root.firstChild);
+}
+head.querySelectorAll("base").forEach((el) => el.remove());
+const base = document.createElement("base");
+base.setAttribute("href", location.href);
+head.insertBefore(base, head.firstChild);
+return "<!DOCTYPE html>" + root.outerHTML;
+"""
+
+RENDER_JS = "document.open(); document.write(arguments[0]); document.close();"
+
+
+class PageCacheMiss(LookupError):
+    """Raised in offline mode when a page was never recorded."""
+
+
+class PageCache:
+    """Content-addressed page store: keys/<key> holds a digest, objects/<digest>.html.gz the page."""
+
+    def __init__(self, directory: str | None = None, mode: str | None = None,
+                 max_mb: float | None = None, bucket_hours: int | None = None):
+        self.directory = directory or os.getenv("SCRAPER_PAGE_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.mode = (mode or os.getenv("SCRAPER_PAGE_CACHE", "off")).lower()
+        self.max_bytes = int((max_mb if max_mb is not None
+                              else float(os.getenv("SCRAPER_PAGE_CACHE_MAX_MB", "500"))) * 1024 * 1024)
+        self.bucket_hours = bucket_hours or int(os.getenv("SCRAPER_PAGE_CACHE_BUCKET_HOURS", "24"))
+        self.pinned_bucket = os.getenv("SCRAPER_PAGE_CACHE_BUCKET")
+        self._size: int | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ("readwrite", "offline")
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == "offline"
+
+    # ── Keys ──────────────────────────────────────────────────────────────
+    def bucket(self, now: datetime | None = None) -> str:
+        if self.pinned_bucket:
+            return self.pinned_bucket
+        now = now or datetime.now(timezone.utc)
+        if self.bucket_hours >= 24:
+            return now.strftime("%Y-%m-%d")
+        hour = now.hour - now.hour % self.bucket_hours
+        return now.strftime("%Y-%m-%d") + f"T{hour:02d}"
+
+    def key(self, url: str, bucket: str | None = None) -> str:
+        return hashlib.sha256(f"{bucket or self.bucket()}|{url}".encode("utf-8")).hexdigest()
+
+    def _key_path(self, key: str) -> str:
+        return os.path.join(self.directory, "keys", key[:2], key)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest + ".html.gz")
+
+    # ── Read / write ──────────────────────────────────────────────────────
+    def get(self, url: str) -> str | None:
+        try:
+            with open(self._key_path(self.key(url))) as f:
+                digest = f.read().strip()
+            path = self._object_path(digest)
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                html = f.read()
+        except (OSError, EOFError):
+            return None
+        os.utime(path)  # mtime doubles as the LRU clock
+        return html
+
+    def put(self, url: str, html: str) -> str:
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            size_before = self.size_bytes()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with gzip.open(tmp, "wb", compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._size = size_before + os.path.getsize(path)
+        else:
+            os.utime(path)
+
+        key_path = self._key_path(self.key(url))
+        os.makedirs(os.path.dirname(key_path), exist_ok=True)
+        with open(key_path, "w") as f:
+            f.write(digest)
+
+        if self.size_bytes() > self.max_bytes:
+            self.evict()
+        return digest
+
+    # ── Eviction ──────────────────────────────────────────────────────────
+    def _objects(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(os.path.join(self.directory, "objects")):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def size_bytes(self) -> int:
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._objects())
+        return self._size
+
+    def evict(self, target_fraction: float = 0.9) -> int:
+        """Delete least-recently-used pages until the cache is under target_fraction of its cap."""
+        entries = sorted(self._objects())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * target_fraction
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._size = total
+        metrics.incr("page_cache_evicted", removed)
+        # Keys pointing at evicted objects are harmless: get() treats them as misses
+        return removed
+
+
+page_cache = PageCache()
+
+
+def load_cached(driver, url: str) -> bool:
+    """Render a cached copy of url into the driver; True on a hit."""
+    if not page_cache.enabled:
+        return False
+    html = page_cache.get(url)
+    if html is None:
+        metrics.incr("page_cache_misses")
+        if page_cache.offline:
+            raise PageCacheMiss(url)
+        return False
+    with metrics.timer("page_cache_load"):
+        driver.get("about:blank")
+        driver.execute_script(RENDER_JS, html)
+    metrics.incr("page_cache_hits")
+    return True
+
+
+def remember_page(driver, url: str, from_cache: bool = False) -> None:
+    """Store the rendered page under url (readwrite mode, live pages only)."""
+    if page_cache.mode != "readwrite" or from_cache:
+        return
+    try:
+        with metrics.timer("page_cache_store"):
+            page_cache.put(url, driver.execute_script(SNAPSHOT_JS))
+    except Exception as e:
+        print(f"  ⚠ Could not cache {url}: {e}")
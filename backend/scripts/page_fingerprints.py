@@ -0,0 +1,123 @@
+"""
+Page-content fingerprints for the website scrapers.
+- After a search page is read, the extracted card list is hashed and compared with the
+  fingerprint stored for the same URL by the previous run
+- An unchanged page skips everything downstream of extraction (card building, HireJobs
+  detail pages, logo uploads, quality filter, upserts) and ends the role's pagination
+- A changed page's new fingerprint is only kept once all of its cards were collected
+  (commit()); a page left half-done by a detail failure, an unreadable card, the time
+  budget or a browser error is processed again next run
+- pages_fingerprinted / pages_unchanged counters feed the pageSkipRate in the run metrics
+
+The browser cannot send conditional requests, so the fingerprint is taken over the
+extracted card fields rather than ETag/Last-Modified headers.
+Fingerprints live in the `scraper_page_fingerprints` collection, one document per
+(site, url). Set SCRAPER_SKIP_UNCHANGED=0 to always process every page.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+
+from scraper_utils import get_collection, metrics
+
+FINGERPRINT_COLLECTION = "scraper_page_fingerprints"
+
+
+def fingerprint(raw_cards: list[dict | None]) -> str:
+    """Stable hash of a page's extracted cards (order matters: a re-ranked page is a change)."""
+    payload = json.dumps(raw_cards, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class PageFingerprints:
+    """
+    Remembers the card-list fingerprint of every search URL a site visits.
+
+    Typical use inside a scraper:
+        fingerprints = PageFingerprints("timesjobs")
+        ...
+        if fingerprints.unchanged(url, raw_cards):
+            return []
+        ...                                        # fingerprints.forget(url) if a card failed
+        fingerprints.commit(url)
+        ...
+        fingerprints.save()
+    """
+
+    def __init__(self, site: str, enabled: bool | None = None):
+        self.site = site
+        if enabled is None:
+            # Offline page-cache replays exist to re-extract every page
+            enabled = (os.getenv("SCRAPER_SKIP_UNCHANGED", "1") != "0"
+                       and os.getenv("SCRAPER_PAGE_CACHE", "off").lower() != "offline")
+        self.enabled = enabled
+        self._previous: dict[str, str] | None = None
+        self._current: dict[str, str] = {}
+        # Fingerprints of changed pages whose cards are still being collected
+        self._pending: dict[str, str] = {}
+
+    def _load(self) -> dict[str, str]:
+        if self._previous is None:
+            try:
+                docs = get_collection(FINGERPRINT_COLLECTION).find(
+                    {"site": self.site}, {"url": 1, "fingerprint": 1, "_id": 0}
+                )
+                self._previous = {d["url"]: d["fingerprint"] for d in docs}
+            except Exception as e:
+                print(f"  ⚠ Could not load page fingerprints: {e}")
+                self._previous = {}
+        return self._previous
+
+    def unchanged(self, url: str, raw_cards: list[dict | None]) -> bool:
+        """
+        True if the page's fingerprint matches the previous run's. A changed page's
+        fingerprint is held back until commit(url).
+        """
+        if not self.enabled:
+            return False
+        current = fingerprint(raw_cards)
+        metrics.incr("pages_fingerprinted")
+        if self._load().get(url) == current:
+            metrics.incr("pages_unchanged")
+            self._current[url] = current
+            return True
+        self._pending[url] = current
+        return False
+
+    def commit(self, url: str) -> None:
+        """Keep the fingerprint of a page whose cards were all collected (no-op after forget)."""
+        if url in self._pending:
+            self._current[url] = self._pending.pop(url)
+
+    def forget(self, url: str) -> None:
+        """Drop this run's fingerprint for a page that was only partly processed."""
+        self._pending.pop(url, None)
+        self._current.pop(url, None)
+
+    def save(self) -> None:
+        """Persist the fingerprints committed this run."""
+        if not self.enabled or not self._current:
+            return
+        seen = metrics.counters["pages_fingerprinted"]
+        skipped = metrics.counters["pages_unchanged"]
+        if seen:
+            print(f"   ≡ Unchanged pages skipped: {skipped}/{seen} ({skipped / seen:.0%})")
+
+        from pymongo import UpdateOne
+
+        now = datetime.now(timezone.utc)
+        previous = self._load()
+        operations = []
+        for url, value in self._current.items():
+            if previous.get(url) == value:
+                update = {"$set": {"lastSeenAt": now}, "$inc": {"unchangedRuns": 1}}
+            else:
+                update = {"$set": {"fingerprint": value, "lastSeenAt": now, "changedAt": now,
+                                   "unchangedRuns": 0}}
+            operations.append(UpdateOne({"site": self.site, "url": url}, update, upsert=True))
+        try:
+            get_collection(FINGERPRINT_COLLECTION).bulk_write(operations, ordered=False)
+        except Exception as e:
+            print(f"  ⚠ Could not save page fingerprints: {e}")
@@ -0,0 +1,94 @@
+"""
+Paginated search-result crawling with early termination.
+- Walks result pages 1..SCRAPER_MAX_PAGES of one role
+- Stops as soon as a page yields no new jobHashes (all already stored in MongoDB
+  or already collected this run), or only listings posted before the role was last
+  searched, so coverage grows without re-scraping old pages
+- Respects the run's TimeBudget before starting each extra page
+
+Typical use inside a scraper:
+    pagination = Pagination(collection, since=scheduler.last_searched_at(job_role))
+    role_jobs = pagination.walk(lambda page: scrape_page(driver, job_role, page), budget)
+"""
+
+import os
+from datetime import timedelta, timezone
+
+from scraper_utils import known_job_hashes, parse_posted_date, metrics
+
+MAX_PAGES = int(os.getenv("SCRAPER_MAX_PAGES", "3"))
+# Rough cost of one extra search page, used by the time budget
+SEARCH_PAGE_SECONDS = 15.0
+# Posted dates are coarse ("3 days ago"), so only listings clearly older than the last run count as old
+DATE_SLACK = timedelta(days=1)
+
+
+class Pagination:
+    """
+    Decides how many result pages of one role to walk.
+    `collection` (optional) is checked for already-stored jobHashes; `since` is the time the
+    role was last searched; `date_field` names the card field holding the posted date.
+    """
+
+    def __init__(self, collection=None, since=None, date_field: str | None = None,
+                 max_pages: int | None = None, page_seconds: float = SEARCH_PAGE_SECONDS):
+        self.collection = collection
+        # MongoDB hands back naive UTC datetimes
+        self.since = since.replace(tzinfo=timezone.utc) if since and since.tzinfo is None else since
+        self.date_field = date_field
+        self.max_pages = max(1, max_pages if max_pages is not None else MAX_PAGES)
+        self.page_seconds = page_seconds
+        self.seen: set[str] = set()
+        self.stop_reason: str | None = None
+
+    def _all_known(self, page_jobs: list[dict]) -> bool:
+        hashes = {job["jobHash"] for job in page_jobs}
+        unseen = hashes - self.seen
+        self.seen |= hashes
+        if unseen and self.collection is not None:
+            try:
+                unseen -= known_job_hashes(self.collection, list(unseen))
+            except Exception as e:
+                print(f"  ⚠ Could not check known jobs: {e}")
+                return False
+        return not unseen
+
+    def _all_old(self, page_jobs: list[dict]) -> bool:
+        if self.since is None or not self.date_field:
+            return False
+        dates = [parse_posted_date(job.get(self.date_field)) for job in page_jobs]
+        dates = [d for d in dates if d is not None]
+        return bool(dates) and all(d < self.since - DATE_SLACK for d in dates)
+
+    def exhausted(self, page_jobs: list[dict]) -> bool:
+        """True if no further page should be fetched after this one."""
+        if not page_jobs:
+            self.stop_reason = "no new jobs on the page"
+        elif self._all_known(page_jobs):
+            self.stop_reason = "only known jobs"
+            metrics.incr("pagination_stop_known")
+        elif self._all_old(page_jobs):
+            self.stop_reason = "only jobs older than the last run"
+            metrics.incr("pagination_stop_old")
+        return self.stop_reason is not None
+
+    def walk(self, fetch_page, budget=None) -> list[dict]:
+        """Call fetch_page(page) for page = 1, 2, … until exhausted; return all jobs."""
+        jobs = []
+        for page in range(1, self.max_pages + 1):
+            if page > 1 and budget is not None and not budget.can_start(self.page_seconds):
+                print("  ⏱  Time budget nearly spent — no more result pages.")
+                self.stop_reason = "time budget spent"
+                break
+            page_jobs = fetch_page(page)
+            metrics.incr("pages_walked")
+            jobs.extend(page_jobs)
+            if self.exhausted(page_jobs):
+                if self.max_pages > 1:
+                    print(f"  ⏹  Stopped after page {page}: {self.stop_reason}")
+                break
+        else:
+            # Further pages may exist: FreshnessTracker only counts the role read to its
+            # end if this last page was a short one
+            self.stop_reason = "max pages reached"
+        return jobs
@@ -0,0 +1,184 @@
+"""
+Per-host request rate limiting for the scrapers.
+- One token bucket per site, shared by every scraper and thread in the process (page
+  loads and HTTP fetches alike); SCRAPER_RATE_LIMITS holds "domain=rate" pairs in
+  requests per second, and a domain covers its subdomains. Hosts not listed get
+  SCRAPER_RATE_LIMIT_DEFAULT (0: unlimited)
+- Adaptive backoff: after a 429 / 503 / block page a host is paused for
+  BASE * 2^(strikes - 1) seconds (capped at MAX, or its Retry-After) and its rate is
+  halved; each success gives back a tenth of the configured rate
+- Waits are counted (rate_limited_waits, rate_limit_backoffs) and timed under the
+  "rate_limit" stage of the metrics passed in
+
+scraper_utils.rate_limiter is the process-wide instance.
+
+Typical use inside a scraper:
+    rate_limiter.acquire(url)               # before every request; waits for a token
+    response = http_session().get(url)
+    rate_limiter.record_response(url, response)
+"""
+
+import os
+import math
+import time
+import threading
+from urllib.parse import urlparse
+
+_RATE_LIMITS = os.getenv("SCRAPER_RATE_LIMITS", "timesjobs.com=0.5,hirejobs.in=0.5,instahyre.com=0.2")
+_RATE_LIMIT_DEFAULT = float(os.getenv("SCRAPER_RATE_LIMIT_DEFAULT", "0"))
+# Requests a host may take back-to-back after being idle
+_RATE_LIMIT_BURST = float(os.getenv("SCRAPER_RATE_LIMIT_BURST", "2"))
+_BACKOFF_BASE_SEC = float(os.getenv("SCRAPER_BACKOFF_BASE_SEC", "15"))
+_BACKOFF_MAX_SEC = float(os.getenv("SCRAPER_BACKOFF_MAX_SEC", "300"))
+_BACKOFF_MIN_RATE = 1 / 16
+_BACKOFF_RECOVERY = 0.1
+# Responses meaning "too many requests": the host is backed off
+THROTTLED_STATUSES = (429, 503)
+
+
+def parse_rate_limits(spec: str) -> dict[str, float]:
+    """{domain: requests per second} from "domain=rate,domain=rate"."""
+    limits = {}
+    for pair in spec.split(","):
+        domain, _, rate = pair.partition("=")
+        if domain.strip() and rate.strip():
+            limits[domain.strip().lower()] = float(rate)
+    return limits
+
+
+def retry_after(response) -> float | None:
+    """Seconds from a Retry-After header (the delta-seconds form only)."""
+    value = response.headers.get("Retry-After", "")
+    return float(value) if value.strip().isdigit() else None
+
+
+class _HostBucket:
+    """Token bucket of one host; `limit` None means only backoff pauses apply."""
+
+    def __init__(self, limit: float | None, burst: float, now: float):
+        self.limit = limit
+        self.rate = limit
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = now
+        self.paused_until = 0.0
+        self.strikes = 0
+
+    def refill(self, now: float) -> None:
+        # No tokens accrue while paused; negative tokens are reservations still waiting
+        refill_from = max(self.updated, self.paused_until)
+        if now > refill_from:
+            self.tokens = min(self.capacity, self.tokens + (now - refill_from) * self.rate)
+        self.updated = max(now, self.updated)
+
+
+class HostRateLimiter:
+    """
+    Token-bucket rate limiter keyed by host, with adaptive backoff.
+
+        rate_limiter.acquire(url)
+        if blocked:
+            rate_limiter.penalize(url, retry_after)
+        else:
+            rate_limiter.succeeded(url)
+
+    Waiting callers reserve their token under the lock and sleep outside it, so threads
+    hitting the same host are spaced out in arrival order. `clock` and `sleep` default
+    to time.monotonic / time.sleep.
+    """
+
+    def __init__(self, limits: dict[str, float], default_rate: float = 0, burst: float = 2,
+                 metrics=None, clock=time.monotonic, sleep=time.sleep):
+        self.limits = {domain: rate for domain, rate in limits.items() if rate > 0}
+        self.default_rate = default_rate if default_rate > 0 else None
+        self.burst = burst
+        self.metrics = metrics
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets: dict[str, _HostBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, metrics=None, sleep=time.sleep) -> "HostRateLimiter":
+        """The limiter configured by the SCRAPER_RATE_LIMIT* settings."""
+        return cls(parse_rate_limits(_RATE_LIMITS), _RATE_LIMIT_DEFAULT, _RATE_LIMIT_BURST,
+                   metrics=metrics, sleep=sleep)
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    def _key(self, host: str) -> tuple[str, float | None]:
+        for domain, rate in self.limits.items():
+            if host == domain or host.endswith("." + domain):
+                return domain, rate
+        return host, self.default_rate
+
+    def _bucket(self, url: str, create: bool = False) -> _HostBucket | None:
+        # Caller holds the lock. Unlimited hosts get a bucket only once penalized.
+        key, limit = self._key(self._host(url))
+        bucket = self._buckets.get(key)
+        if bucket is None and (limit is not None or create):
+            bucket = self._buckets[key] = _HostBucket(limit, self.burst, self.clock())
+        return bucket
+
+    def acquire(self, url: str) -> float:
+        """Take one request token for the url's host, sleeping until it is available."""
+        with self._lock:
+            bucket = self._bucket(url)
+            if bucket is None:
+                return 0.0
+            now = self.clock()
+            wait = max(0.0, bucket.paused_until - now)
+            if bucket.rate is not None:
+                bucket.refill(now)
+                bucket.tokens -= 1
+                if bucket.tokens < 0:
+                    wait += -bucket.tokens / bucket.rate
+        if wait > 0:
+            if self.metrics is None:
+                self.sleep(wait)
+            else:
+                self.metrics.incr("rate_limited_waits")
+                with self.metrics.timer("rate_limit"):
+                    self.sleep(wait)
+        return wait
+
+    def penalize(self, url: str, retry_after: float | None = None) -> float:
+        """Back off from a host that refused a request; returns the pause in seconds."""
+        with self._lock:
+            bucket = self._bucket(url, create=True)
+            bucket.strikes += 1
+            pause = retry_after if retry_after is not None else \
+                min(_BACKOFF_MAX_SEC, _BACKOFF_BASE_SEC * 2 ** (bucket.strikes - 1))
+            now = self.clock()
+            if bucket.rate is not None:
+                bucket.refill(now)
+            bucket.paused_until = max(bucket.paused_until, now + pause)
+            if bucket.rate is not None:
+                bucket.rate = max(bucket.limit * _BACKOFF_MIN_RATE, bucket.rate / 2)
+                bucket.tokens = min(bucket.tokens, 0.0)
+        if self.metrics is not None:
+            self.metrics.incr("rate_limit_backoffs")
+        return pause
+
+    def succeeded(self, url: str) -> None:
+        """Let a penalized host's rate recover towards its configured limit."""
+        with self._lock:
+            bucket = self._bucket(url)
+            if bucket is None or not bucket.strikes:
+                return
+            if bucket.rate is not None:
+                bucket.rate = min(bucket.limit, bucket.rate + bucket.limit * _BACKOFF_RECOVERY)
+                if math.isclose(bucket.rate, bucket.limit):
+                    bucket.rate = bucket.limit  # recovery steps do not sum exactly in floats
+            if bucket.rate == bucket.limit:
+                bucket.strikes = 0
+
+    def record_response(self, url: str, response) -> float:
+        """Back off after a 429/503 (honouring Retry-After), recover after a 2xx; returns the pause."""
+        if response.status_code in THROTTLED_STATUSES:
+            return self.penalize(url, retry_after(response))
+        if 200 <= response.status_code < 300:
+            self.succeeded(url)
+        return 0.0
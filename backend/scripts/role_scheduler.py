@@ -0,0 +1,181 @@
+"""
+Adaptive role scheduling for the website scrapers.
+- Tracks per-site, per-role yield (new jobs inserted by bulk_upsert_jobs)
+- Orders roles so the ones that actually produce new jobs are searched first
+- Down-samples low-yield roles: they are only revisited every few runs
+- Optionally fits the plan into a time budget using per-role average durations
+
+History lives in the `scraper_role_yield` collection, one document per (site, role).
+Set SCRAPER_ADAPTIVE_ROLES=0 to search every role in job_roles.py order.
+"""
+
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from scraper_utils import get_collection, metrics
+
+YIELD_COLLECTION = "scraper_role_yield"
+
+# Weight of the latest run in the moving averages (0 < alpha <= 1)
+EWMA_ALPHA = 0.3
+# Roles expected to insert fewer new jobs than this per run are "low yield"
+MIN_EXPECTED_YIELD = 0.5
+# A low-yield role is still searched once every N runs so recoveries are noticed
+EXPLORE_EVERY_N_RUNS = 4
+# Assumed duration of a role with no history, used only for budget planning
+DEFAULT_ROLE_SECONDS = 60.0
+
+
+def _ewma(previous: float | None, value: float, alpha: float = EWMA_ALPHA) -> float:
+    """Exponentially weighted moving average; the first sample seeds the average."""
+    if previous is None:
+        return float(value)
+    return alpha * value + (1 - alpha) * previous
+
+
+class RoleScheduler:
+    """
+    Plans which roles a scraper searches this run, and records how they performed.
+
+    Typical use inside a scraper:
+        scheduler = RoleScheduler("hirejobs", JOB_ROLES)
+        for job_role in scheduler.plan():
+            scheduler.start_role(job_role)
+            ...
+        scheduler.finish()
+        bulk_upsert_jobs(collection, valid_jobs, yield_tracker=scheduler)
+        scheduler.save()
+    """
+
+    def __init__(self, site: str, roles: list[str], enabled: bool | None = None):
+        self.site = site
+        self.roles = list(roles)
+        if enabled is None:
+            enabled = os.getenv("SCRAPER_ADAPTIVE_ROLES", "1") != "0"
+        self.enabled = enabled
+        self._stats: dict[str, dict] = {}
+        self._durations: dict[str, float] = {}
+        self._inserted: Counter = Counter()
+        self._current_role: str | None = None
+        self._current_started: float | None = None
+        self.skipped: list[str] = []
+
+    # ── Planning ──────────────────────────────────────────────────────────
+    def _load_stats(self) -> None:
+        try:
+            docs = get_collection(YIELD_COLLECTION).find({"site": self.site})
+            self._stats = {d["role"]: d for d in docs}
+        except Exception as e:
+            print(f"  ⚠ Could not load role yield history: {e}")
+            self._stats = {}
+
+    def expected_yield(self, role: str) -> float:
+        """Expected new inserts for a role; roles with no history are tried first."""
+        stats = self._stats.get(role)
+        if not stats or stats.get("ewmaInserted") is None:
+            return float("inf")
+        return stats["ewmaInserted"]
+
+    def expected_seconds(self, role: str) -> float:
+        stats = self._stats.get(role) or {}
+        return stats.get("ewmaSeconds") or DEFAULT_ROLE_SECONDS
+
+    def last_searched_at(self, role: str):
+        """When the role was last searched (naive UTC from MongoDB), or None."""
+        return (self._stats.get(role) or {}).get("lastSearchedAt")
+
+    def plan(self, time_budget_sec: float | None = None) -> list[str]:
+        """
+        Return the roles to search this run, highest expected yield first.
+        Low-yield roles are skipped unless they are due for an exploration visit;
+        if a time budget is given, roles that would not fit are dropped from the tail.
+        """
+        if not self.enabled:
+            return list(self.roles)
+
+        self._load_stats()
+        candidates = []
+        for index, role in enumerate(self.roles):
+            stats = self._stats.get(role) or {}
+            expected = self.expected_yield(role)
+            due = stats.get("skippedRuns", 0) + 1 >= EXPLORE_EVERY_N_RUNS
+            if expected < MIN_EXPECTED_YIELD and not due:
+                self.skipped.append(role)
+                continue
+            candidates.append((-expected, index, role))
+        candidates.sort()
+
+        planned = []
+        budget_used = 0.0
+        for _, _, role in candidates:
+            cost = self.expected_seconds(role)
+            if time_budget_sec is not None and planned and budget_used + cost > time_budget_sec:
+                self.skipped.append(role)
+                continue
+            budget_used += cost
+            planned.append(role)
+
+        print(f"  📋 Role plan: {len(planned)} of {len(self.roles)} roles "
+              f"(skipped {len(self.skipped)} low-yield/over-budget)")
+        return planned
+
+    # ── Recording ─────────────────────────────────────────────────────────
+    def start_role(self, role: str) -> None:
+        """Mark the start of a role; closes the timer of the previous one."""
+        self.finish()
+        self._current_role = role
+        self._current_started = time.monotonic()
+
+    def finish(self) -> None:
+        """Close the timer of the role currently being searched, if any."""
+        if self._current_role is not None and self._current_started is not None:
+            elapsed = time.monotonic() - self._current_started
+            self._durations[self._current_role] = self._durations.get(self._current_role, 0.0) + elapsed
+            metrics.observe("role", elapsed)
+            metrics.incr("roles_searched")
+        self._current_role = None
+        self._current_started = None
+
+    def record_inserts(self, counts: dict[str, int]) -> None:
+        """Add per-role new-insert counts (called by bulk_upsert_jobs)."""
+        self._inserted.update(counts)
+
+    def save(self) -> None:
+        """
+        Persist this run's yield and durations in one unordered bulk_write; a no-op when
+        scheduling is disabled.
+        """
+        self.finish()
+        if not self.enabled:
+            return
+
+        from pymongo import UpdateOne
+
+        now = datetime.now(timezone.utc)
+        operations = []
+        for role, seconds in self._durations.items():
+            stats = self._stats.get(role) or {}
+            inserted = self._inserted.get(role, 0)
+            operations.append(UpdateOne(
+                {"site": self.site, "role": role},
+                {"$set": {
+                    "ewmaInserted": _ewma(stats.get("ewmaInserted"), inserted),
+                    "ewmaSeconds": _ewma(stats.get("ewmaSeconds"), seconds),
+                    "lastInserted": inserted,
+                    "lastSearchedAt": now,
+                    "skippedRuns": 0,
+                }, "$inc": {"runs": 1}},
+                upsert=True,
+            ))
+        for role in self.roles:
+            if role not in self._durations:
+                operations.append(UpdateOne({"site": self.site, "role": role},
+                                            {"$inc": {"skippedRuns": 1}}, upsert=True))
+        if not operations:
+            return
+        try:
+            get_collection(YIELD_COLLECTION).bulk_write(operations, ordered=False)
+        except Exception as e:
+            print(f"  ⚠ Could not save role yield history: {e}")
@@ -0,0 +1,185 @@
+"""
+Run several scrapers in one Python process.
+- Browser scrapers (TimesJobs, HireJobs, Instahyre) run concurrently on worker threads,
+  each with its own warm BrowserPool
+- Telegram scrapers run as asyncio tasks on the main thread's event loop
+- Everything shares the process: one MongoClient, one pooled HTTP session, the resolved
+  chromedriver path, the page cache and the time budget (SCRAPER_TIME_BUDGET_SEC)
+- Each scraper records into its own RunMetrics (scraper_utils.scoped_metrics), so the
+  per-scraper numbers match what the standalone scripts report
+
+The result is printed as a single line "SCRAPER_RESULTS {json}" that scheduler.js parses
+when SCRAPER_ORCHESTRATOR=1:
+    {"startedAt": ..., "durationSec": ..., "results": [
+        {"id": "hirejobs", "success": true, "durationSec": 812.4, "error": null,
+         "counts": {"collected": ..., "inserted": ...}, "metrics": {SCRAPER_METRICS summary}}, …]}
+
+Usage (from backend/scripts):
+    python3 run_scrapers.py                                  # every scraper
+    python3 run_scrapers.py --only hirejobs,telegram_kushal
+    python3 run_scrapers.py --skip-browser --json results.json
+The exit status is 1 only when every selected scraper failed.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import importlib
+import contextvars
+import traceback
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+sys.stdout.reconfigure(encoding="utf-8")
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+for _subdir in ("websites", "telegram"):
+    sys.path.insert(0, os.path.join(SCRIPTS_DIR, _subdir))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from scraper_utils import TimeBudget, scoped_metrics
+
+RESULTS_PREFIX = "SCRAPER_RESULTS "
+
+# id (as in scheduler.js): (module, kind)
+SCRAPERS = {
+    "timesjobs": ("timesOfJob_scraper", "browser"),
+    "hirejobs": ("hirejobs_scraper", "browser"),
+    "instahyre": ("instahyre_scraper", "browser"),
+    "telegram_techuprise": ("techuprise", "telegram"),
+    "telegram_krishan": ("krishan_kumar", "telegram"),
+    "telegram_kushal": ("kushal_vijay", "telegram"),
+}
+
+
+def _result(scraper_id: str, started: float, run_metrics, counts=None, error: str | None = None) -> dict:
+    return {
+        "id": scraper_id,
+        "success": error is None,
+        "durationSec": round(time.monotonic() - started, 1),
+        "error": error,
+        "counts": counts,
+        "metrics": run_metrics.summary(),
+    }
+
+
+def _describe(exc: BaseException) -> str:
+    if isinstance(exc, SystemExit):
+        return f"exited with status {exc.code}"
+    return f"{type(exc).__name__}: {exc}"
+
+
+def pipeline_counts(pipeline) -> dict:
+    """Telegram IngestPipeline counters in the same shape as the website save_jobs()."""
+    return {
+        "collected": pipeline.collected,
+        "valid": pipeline.valid,
+        "rejected": pipeline.rejected,
+        "inserted": pipeline.sink.inserted,
+        "updated": pipeline.sink.updated,
+        "unchanged": pipeline.sink.unchanged,
+    }
+
+
+# ── Browser scrapers (threads) ────────────────────────────────────────────────
+def run_browser_scraper(scraper_id: str, budget: TimeBudget) -> dict:
+    started = time.monotonic()
+    with scoped_metrics(scraper_id) as run_metrics:
+        try:
+            module = importlib.import_module(SCRAPERS[scraper_id][0])
+            counts = module.run(budget=budget)
+        except (Exception, SystemExit) as e:
+            traceback.print_exc()
+            return _result(scraper_id, started, run_metrics, error=_describe(e))
+        return _result(scraper_id, started, run_metrics, counts)
+
+
+# ── Telegram scrapers (asyncio) ───────────────────────────────────────────────
+async def run_telegram_scraper(scraper_id: str) -> dict:
+    started = time.monotonic()
+    # Each task runs in a copy of the context, so the scope stays with this task only
+    with scoped_metrics(scraper_id) as run_metrics:
+        try:
+            module = importlib.import_module(SCRAPERS[scraper_id][0])
+            pipeline = await module.run()
+        except (Exception, SystemExit) as e:
+            traceback.print_exc()
+            return _result(scraper_id, started, run_metrics, error=_describe(e))
+        return _result(scraper_id, started, run_metrics, pipeline_counts(pipeline))
+
+
+async def run_telegram_scrapers(scraper_ids: list[str]) -> list[dict]:
+    return list(await asyncio.gather(*(run_telegram_scraper(s) for s in scraper_ids)))
+
+
+# ── Orchestration ─────────────────────────────────────────────────────────────
+def run_all(scraper_ids: list[str]) -> dict:
+    """Run the given scrapers concurrently; returns the SCRAPER_RESULTS document."""
+    started_at = datetime.now(timezone.utc)
+    started = time.monotonic()
+    budget = TimeBudget.from_env()  # on the main thread, so SIGTERM stops every scraper
+    browser_ids = [s for s in scraper_ids if SCRAPERS[s][1] == "browser"]
+    telegram_ids = [s for s in scraper_ids if SCRAPERS[s][1] == "telegram"]
+
+    results: dict[str, dict] = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(browser_ids)), thread_name_prefix="scraper") as executor:
+        futures = {
+            s: executor.submit(contextvars.copy_context().run, run_browser_scraper, s, budget)
+            for s in browser_ids
+        }
+        if telegram_ids:
+            for result in asyncio.run(run_telegram_scrapers(telegram_ids)):
+                results[result["id"]] = result
+        for s, future in futures.items():
+            results[s] = future.result()
+
+    return {
+        "startedAt": started_at.isoformat(),
+        "durationSec": round(time.monotonic() - started, 1),
+        "results": [results[s] for s in scraper_ids],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run several scrapers in one process.")
+    parser.add_argument("--only", default=",".join(SCRAPERS),
+                        help="comma-separated scraper ids (default: all)")
+    parser.add_argument("--skip-browser", action="store_true",
+                        help="leave out the Chrome-based website scrapers")
+    parser.add_argument("--json", metavar="FILE", help="also write the results to FILE")
+    args = parser.parse_args(argv)
+
+    args.scrapers = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = [s for s in args.scrapers if s not in SCRAPERS]
+    if unknown:
+        parser.error(f"unknown scraper ids: {', '.join(unknown)} (choose from {', '.join(SCRAPERS)})")
+    if args.skip_browser:
+        args.scrapers = [s for s in args.scrapers if SCRAPERS[s][1] != "browser"]
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not args.scrapers:
+        print("⚠ No scrapers selected.")
+        return 0
+
+    print(f"🕷  Running {len(args.scrapers)} scrapers in one process: {', '.join(args.scrapers)}")
+    report = run_all(args.scrapers)
+
+    for r in report["results"]:
+        status = "✅" if r["success"] else "❌"
+        print(f"  {status} {r['id']:<22} {r['durationSec']:>7.1f}s  {r['error'] or r['counts']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    print(RESULTS_PREFIX + json.dumps(report, default=str), flush=True)
+
+    return 0 if any(r["success"] for r in report["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,41 @@
 """
 Shared utilities for all scrapers.
-- Loads credentials from backend/.env
+- Loads credentials from backend/.env (each is checked when its feature is first used)
 - Provides MongoDB connection helper
-- Provides ImageKit upload helper
-- Provides deduplication helper
-- Provides quality validation (is_valid_job)
+- Provides ImageKit upload helper (over a pooled HTTP session)
+- Provides the process-wide per-host rate limiter (rate_limiter; see rate_limiter.py)
+- Provides deduplication helpers (generate_job_hash, known_job_hashes, content_hash), with a
+  persisted Bloom filter of stored jobHashes per collection (seen_filter) in front of MongoDB
+- Provides posted-date parsing (parse_posted_date), salary/experience parsing into
+  numeric fields and location resolution (structured_fields, normalize_job)
+- Provides quality validation (is_valid_job) and the website scrapers' filter-and-upsert
+  step (save_jobs over bulk_upsert_jobs)
+- Provides a wall-clock run budget (TimeBudget)
+- Provides per-stage timing and counters (metrics), printed as JSON at exit
+
+pymongo and requests are imported on first use, so importing this module stays cheap
+for scripts (and the benchmark) that never reach MongoDB or ImageKit.
 """
 
 import os
+import re
+import json
+import atexit
+import bisect
 import hashlib
-import requests
+import signal
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 from dotenv import load_dotenv
-from pymongo import MongoClient, UpdateOne
+
+from locations import resolve_location
+from seen_filter import BloomFilter, DEFAULT_CAPACITY, DEFAULT_FILTER_DIR
+from job_record import JobRecord
+from rate_limiter import HostRateLimiter
 
 # Resolve backend/.env from any subdirectory depth
 _scripts_dir = os.path.dirname(os.path.abspath(__file__))
@@ -23,17 +47,248 @@ _MONGO_URI = os.getenv("MONGO_URI")
 _IMAGEKIT_PRIVATE_KEY = os.getenv("IMAGEKIT_PRIVATE_KEY")
 _IMAGEKIT_URL_ENDPOINT = os.getenv("IMAGEKIT_URL_ENDPOINT")
 _IMAGEKIT_UPLOAD_FOLDER = os.getenv("IMAGEKIT_UPLOAD_FOLDER", "scraped")
+# Multiplier for metrics.sleep(); the offline benchmark sets it to 0
+_SLEEP_SCALE = float(os.getenv("SCRAPER_SLEEP_SCALE", "1"))
+# Card extraction in the website scrapers: "js" reads every card of a page in one
+# execute_script call, "webdriver" reads each field with its own WebDriver round-trip
+EXTRACTION_MODE = os.getenv("SCRAPER_EXTRACTION_MODE", "js")
+
+
+
+def require_config(name: str, value: str | None) -> str:
+    """Return a required setting, raising EnvironmentError when it is missing."""
+    if not value:
+        raise EnvironmentError(f"{name} is not set in backend/.env")
+    return value
+
+
+# ── Instrumentation ────────────────────────────────────────────────────────
+# Upper bounds (seconds) of the histogram buckets; the last bucket is open-ended
+_HISTOGRAM_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+# Ratios derived from counters in the summary: name -> (numerator, denominator)
+_RATES = {
+    "pageSkipRate": ("pages_unchanged", "pages_fingerprinted"),
+}
+# A validation rule rejecting at least this share of the jobs it checked (after
+# _RULE_ALERT_MIN_CHECKS checks) is reported as a likely selector breakage
+_RULE_ALERT_RATE = float(os.getenv("SCRAPER_RULE_ALERT_RATE", "0.5"))
+_RULE_ALERT_MIN_CHECKS = 20
+
+
+class RunMetrics:
+    """
+    Lightweight per-run instrumentation: stage timers, counters and histograms.
+
+        with metrics.timer("page_load"):
+            driver.get(url)
+        metrics.incr("cards_seen", len(cards))
+
+    is_valid_job() also records, per source and rule, how many jobs each rule checked
+    and rejected and the time it took (the summary's "validation" section).
+    At exit the summary is printed as a single line "SCRAPER_METRICS {json}",
+    which scheduler.js parses and stores with the run in scraper_runs.
+    """
+
+    def __init__(self, scraper: str | None = None):
+        self.scraper = scraper
+        self._emitted = False
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop everything recorded so far (used between benchmark cases)."""
+        self.started = time.monotonic()
+        self.counters: Counter = Counter()
+        self._samples: dict[str, list[float]] = defaultdict(list)
+        # source -> rule -> [checked, rejected, seconds]; plain lists, updated once per rule check
+        self._rules: dict[str, dict[str, list]] = defaultdict(lambda: defaultdict(lambda: [0, 0, 0.0]))
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        self._samples[stage].append(seconds)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def rule_stats(self, source: str) -> dict[str, list]:
+        """The mutable [checked, rejected, seconds] counters of one source's validation rules."""
+        return self._rules[source]
+
+    def validation_summary(self) -> dict:
+        """Per source, every rule in evaluation order with its checks, rejections and cost."""
+        return {
+            source: {
+                rule: {
+                    "checked": checked,
+                    "rejected": rejected,
+                    "rejectRate": round(rejected / checked, 4) if checked else 0,
+                    "totalSec": round(seconds, 4),
+                    "usPerCheck": round(seconds / checked * 1e6, 2) if checked else 0,
+                }
+                for rule, (checked, rejected, seconds) in rules.items()
+            }
+            for source, rules in self._rules.items()
+        }
+
+    def sleep(self, seconds: float) -> None:
+        """time.sleep that is accounted for under the 'sleep' stage."""
+        with self.timer("sleep"):
+            time.sleep(seconds * _SLEEP_SCALE)
+
+    @staticmethod
+    def _stage_summary(samples: list[float]) -> dict:
+        ordered = sorted(samples)
+        n = len(ordered)
+        buckets = [0] * (len(_HISTOGRAM_BUCKETS) + 1)
+        for v in ordered:
+            buckets[bisect.bisect_left(_HISTOGRAM_BUCKETS, v)] += 1
+        return {
+            "count": n,
+            "totalSec": round(sum(ordered), 3),
+            "meanSec": round(sum(ordered) / n, 4),
+            "p50Sec": round(ordered[n // 2], 4),
+            "p95Sec": round(ordered[min(n - 1, int(n * 0.95))], 4),
+            "maxSec": round(ordered[-1], 4),
+            "histogram": dict(zip([f"le_{b}" for b in _HISTOGRAM_BUCKETS] + ["inf"], buckets)),
+        }
+
+    def summary(self) -> dict:
+        return {
+            "scraper": self.scraper,
+            "wallSec": round(time.monotonic() - self.started, 3),
+            "stages": {k: self._stage_summary(v) for k, v in sorted(self._samples.items()) if v},
+            "counters": dict(self.counters),
+            "validation": self.validation_summary(),
+            "rates": {
+                name: round(self.counters[num] / self.counters[den], 4)
+                for name, (num, den) in _RATES.items() if self.counters[den]
+            },
+        }
+
+    def emit(self) -> None:
+        """Print the JSON summary once (safe to call from atexit and explicitly)."""
+        if self._emitted:
+            return
+        self._emitted = True
+        print("SCRAPER_METRICS " + json.dumps(self.summary(), default=str), flush=True)
+
+    def emit_at_exit(self, scraper: str) -> None:
+        """Name this run and make sure its summary is printed however the script ends."""
+        self.scraper = scraper
+        atexit.register(self.emit)
+
+
+_process_metrics = RunMetrics()
+_scoped_metrics: ContextVar[RunMetrics | None] = ContextVar("scraper_metrics", default=None)
+
+
+class _MetricsProxy:
+    """
+    `metrics` forwards to the RunMetrics of the scraper running in the current context.
+    A standalone script has a single process-wide RunMetrics; run_scrapers.py gives each
+    scraper thread/task its own via scoped_metrics(), so their numbers do not mix.
+    """
+
+    def __getattr__(self, name):
+        return getattr(_scoped_metrics.get() or _process_metrics, name)
 
-if not _MONGO_URI:
-    raise EnvironmentError("MONGO_URI is not set in backend/.env")
-if not _IMAGEKIT_PRIVATE_KEY:
-    raise EnvironmentError("IMAGEKIT_PRIVATE_KEY is not set in backend/.env")
+
+metrics = _MetricsProxy()
+
+
+@contextmanager
+def scoped_metrics(scraper: str):
+    """Record every metrics call made in this context (thread/task) into a fresh RunMetrics."""
+    run_metrics = RunMetrics(scraper)
+    token = _scoped_metrics.set(run_metrics)
+    try:
+        yield run_metrics
+    finally:
+        _scoped_metrics.reset(token)
+
+
+_mongo_client = None
+_mongo_lock = threading.Lock()
 
 
 def get_collection(collection_name: str, db_name: str = "test"):
-    """Return a MongoDB collection using credentials from .env."""
-    client = MongoClient(_MONGO_URI)
-    return client[db_name][collection_name]
+    """Return a MongoDB collection using credentials from .env (one shared client per process)."""
+    global _mongo_client
+    with _mongo_lock:
+        if _mongo_client is None:
+            uri = require_config("MONGO_URI", _MONGO_URI)
+            from pymongo import MongoClient
+            _mongo_client = MongoClient(uri)
+    return _mongo_client[db_name][collection_name]
+
+
+# Every job collection, with the field holding the role/group each job was found under
+# (its freshness scope, see freshness.py)
+JOB_COLLECTIONS = {"timesjob": "searchedRole", "hirejobs": "searchedRole",
+                   "instahyre": "searchedRole", "telegram": "group"}
+
+# Indexes for the structured fields (range filters, newest-first sorts, city and geo filters)
+_JOB_FIELD_INDEXES = [
+    [("postedAt", -1)],
+    [("salaryMax", 1)],
+    [("experienceMin", 1), ("experienceMax", 1)],
+    [("cities", 1)],
+    [("geo", "2dsphere")],
+]
+_indexed: set[str] = set()
+
+
+def ensure_job_indexes(collection, scope_field: str = "searchedRole",
+                       expired_retention_days: float = 7) -> None:
+    """
+    Create the indexes of a job collection (once per process): jobHash, the freshness
+    scope + lastSeenAt, the expiredAt TTL (see freshness.py) and the structured fields.
+    """
+    with _mongo_lock:
+        if collection.full_name in _indexed:
+            return
+        _indexed.add(collection.full_name)
+    try:
+        collection.create_index("jobHash")
+        collection.create_index([(scope_field, 1), ("lastSeenAt", 1)])
+        collection.create_index("expiredAt", expireAfterSeconds=int(expired_retention_days * 86400))
+        for keys in _JOB_FIELD_INDEXES:
+            collection.create_index(keys)
+    except Exception as e:
+        # e.g. IndexOptionsConflict after the TTL retention changed: drop the old expiredAt index
+        print(f"  ⚠ Could not create indexes on {collection.name}: {e}")
+
+
+# ── Rate limiting ──────────────────────────────────────────────────────────
+# Shared by every scraper and thread in the process; see rate_limiter.py for the settings
+rate_limiter = HostRateLimiter.from_env(metrics, sleep=lambda seconds: time.sleep(seconds * _SLEEP_SCALE))
+
+
+# ── HTTP ───────────────────────────────────────────────────────────────────
+# One pooled session for ImageKit uploads and image fetches (also shared by the
+# upload threads in async_ingest), so connections are reused across calls
+HTTP_POOL_SIZE = int(os.getenv("SCRAPER_HTTP_POOL_SIZE", "16"))
+_http = None
+
+
+def http_session():
+    """The shared requests.Session."""
+    global _http
+    if _http is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _http = session
+    return _http
 
 
 def upload_image_to_imagekit(file_bytes: bytes, filename: str, folder: str = None) -> str | None:
@@ -44,19 +299,27 @@ def upload_image_to_imagekit(file_bytes: bytes, filename: str, folder: str = Non
     if not file_bytes:
         return None
 
+    private_key = require_config("IMAGEKIT_PRIVATE_KEY", _IMAGEKIT_PRIVATE_KEY)
     upload_folder = folder or _IMAGEKIT_UPLOAD_FOLDER
+    url = "https://upload.imagekit.io/api/v1/files/upload"
     try:
-        response = requests.post(
-            "https://upload.imagekit.io/api/v1/files/upload",
-            auth=(_IMAGEKIT_PRIVATE_KEY, ""),
-            files={"file": (filename, file_bytes, "image/jpeg")},
-            data={"fileName": filename, "folder": f"/{upload_folder}"},
-            timeout=30,
-        )
+        rate_limiter.acquire(url)
+        with metrics.timer("imagekit_upload"):
+            response = http_session().post(
+                url,
+                auth=(private_key, ""),
+                files={"file": (filename, file_bytes, "image/jpeg")},
+                data={"fileName": filename, "folder": f"/{upload_folder}"},
+                timeout=30,
+            )
+        rate_limiter.record_response(url, response)
         if response.status_code == 200:
+            metrics.incr("imagekit_uploaded")
             return response.json().get("url")
+        metrics.incr("imagekit_failed")
         print(f"    ⚠ ImageKit upload failed ({response.status_code}): {response.text[:200]}")
     except Exception as e:
+        metrics.incr("imagekit_failed")
         print(f"    ⚠ ImageKit upload error: {e}")
     return None
 
@@ -69,10 +332,14 @@ def upload_image_from_url(image_url: str, filename: str, folder: str = None) ->
     if not image_url or image_url == "N/A":
         return None
     try:
-        resp = requests.get(image_url, timeout=15, headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        })
-        if resp.status_code == 200:
+        rate_limiter.acquire(image_url)
+        with metrics.timer("image_fetch"):
+            resp = http_session().get(image_url, timeout=15, headers={
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            })
+        if rate_limiter.record_response(image_url, resp):
+            print(f"    ⚠ {resp.status_code} fetching {image_url} — backing off")
+        elif resp.status_code == 200:
             return upload_image_to_imagekit(resp.content, filename, folder)
     except Exception as e:
         print(f"    ⚠ Failed to fetch image from {image_url}: {e}")
@@ -85,19 +352,301 @@ def generate_job_hash(*fields) -> str:
     return hashlib.md5(combined.encode()).hexdigest()
 
 
+# Kept from the first sighting: bookkeeping, and image URLs that change with every re-upload
+# postedAt is most precise when first computed from a relative date ("2 days ago")
+_INSERT_ONLY_FIELDS = {"jobHash", "createdAt", "searchedRole", "companyLogo", "image_url", "postedAt"}
+# Also left out of the content hash: relative posted dates ("3 days ago") drift every run
+_UNHASHED_FIELDS = _INSERT_ONLY_FIELDS | {"contentHash", "postedDate", "postingTime"}
+
+
+def content_hash(job: dict) -> str:
+    """SHA-1 of a job's content fields, used to tell changed listings from unchanged ones."""
+    content = {k: v for k, v in job.items() if k not in _UNHASHED_FIELDS}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# One memory-mapped Bloom filter of stored jobHashes per collection (see seen_filter.py)
+_SEEN_FILTER_ENABLED = os.getenv("SCRAPER_SEEN_FILTER", "1") != "0"
+_seen_filters: dict[str, BloomFilter | None] = {}
+_seen_lock = threading.Lock()
+
+
+def _load_seen_filter(collection) -> BloomFilter | None:
+    path = os.path.join(DEFAULT_FILTER_DIR, f"{collection.full_name}.bloom")
+    capacity = DEFAULT_CAPACITY
+    try:
+        bloom = BloomFilter.open(path)
+        if not bloom.full:
+            return bloom
+        capacity = bloom.count * 2
+        bloom.close()
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"  ⚠ Unreadable seen-filter {path}, rebuilding: {e}")
+
+    try:
+        with metrics.timer("seen_filter_build"):
+            capacity = max(capacity, collection.estimated_document_count() * 2)
+            hashes = (d["jobHash"] for d in collection.find({"jobHash": {"$exists": True}},
+                                                            {"jobHash": 1, "_id": 0}, batch_size=10000))
+            bloom = BloomFilter.build(path, hashes, capacity)
+        print(f"  🧮 Built seen-filter for {collection.name}: {bloom.count} hashes")
+        return bloom
+    except Exception as e:
+        print(f"  ⚠ Could not build seen-filter for {collection.name}: {e}")
+        return None
+
+
+def seen_filter(collection) -> BloomFilter | None:
+    """
+    The collection's Bloom filter of stored jobHashes, opened (or built from MongoDB) on
+    first use. None when SCRAPER_SEEN_FILTER=0 or it could not be built: callers then
+    ask MongoDB about every hash.
+    """
+    if not _SEEN_FILTER_ENABLED:
+        return None
+    with _seen_lock:
+        if collection.full_name not in _seen_filters:
+            _seen_filters[collection.full_name] = _load_seen_filter(collection)
+        return _seen_filters[collection.full_name]
+
+
+def _probably_known(collection, job_hashes) -> list[str]:
+    """The hashes the seen-filter cannot rule out; the rest are certainly not stored."""
+    bloom = seen_filter(collection)
+    if bloom is None:
+        return list(job_hashes)
+    with metrics.timer("seen_filter_check"):
+        maybe = [h for h in job_hashes if h in bloom]
+    metrics.incr("seen_filter_checks", len(job_hashes))
+    metrics.incr("seen_filter_negatives", len(job_hashes) - len(maybe))
+    return maybe
+
+
+def _remember_hashes(collection, job_hashes) -> None:
+    bloom = seen_filter(collection)
+    if bloom is not None and job_hashes:
+        bloom.update(job_hashes)
+        bloom.flush()
+
+
 def upsert_job(collection, job_hash: str, doc: dict) -> bool:
     """
-    Insert the job document if it doesn't exist (keyed by jobHash).
-    Returns True if inserted, False if it was a duplicate.
+    Insert the job document if it doesn't exist (keyed by jobHash); either way it is
+    stamped as seen now. Returns True if inserted, False if it was a duplicate.
     """
+    now = datetime.now(timezone.utc)
     result = collection.update_one(
         {"jobHash": job_hash},
-        {"$setOnInsert": doc},
+        {
+            "$setOnInsert": {**doc, "firstSeenAt": now},
+            "$set": {"lastSeenAt": now, "missedRuns": 0},
+            "$unset": {"expiredAt": ""},
+        },
         upsert=True
     )
+    _remember_hashes(collection, [job_hash])
     return result.upserted_id is not None
 
 
+def known_job_hashes(collection, job_hashes: list[str]) -> set[str]:
+    """
+    Return the subset of job_hashes already stored in the collection.
+    Only the hashes the seen-filter reports as probably stored are looked up in MongoDB.
+    """
+    maybe = _probably_known(collection, job_hashes) if job_hashes else []
+    if not maybe:
+        return set()
+    with metrics.timer("mongo_known_hashes"):
+        docs = collection.find({"jobHash": {"$in": maybe}}, {"jobHash": 1, "_id": 0})
+        known = {d["jobHash"] for d in docs}
+    metrics.incr("seen_filter_false_positives", len(maybe) - len(known))
+    return known
+
+
+# ── Posted dates ───────────────────────────────────────────────────────────
+# Long unit names first so "mo" is not read as "m…" and "hr" not as "h"
+_RELATIVE_DATE = re.compile(
+    r"(\d+)\+?\s*(minute|min|hour|hr|day|week|wk|month|mo|year|yr|m|h|d|w|y)s?\s+ago", re.I
+)
+_RELATIVE_UNITS = {
+    "minute": timedelta(minutes=1), "min": timedelta(minutes=1), "m": timedelta(minutes=1),
+    "hour": timedelta(hours=1), "hr": timedelta(hours=1), "h": timedelta(hours=1),
+    "day": timedelta(days=1), "d": timedelta(days=1),
+    "week": timedelta(weeks=1), "wk": timedelta(weeks=1), "w": timedelta(weeks=1),
+    "month": timedelta(days=30), "mo": timedelta(days=30),
+    "year": timedelta(days=365), "yr": timedelta(days=365), "y": timedelta(days=365),
+}
+# "Posted on: …", "Posted on : …", "Posted …"
+_POSTED_PREFIX = re.compile(r"posted(\s+on)?\s*:?")
+_ABSOLUTE_DATE_FORMATS = ["%d %b %Y", "%d %b, %Y", "%b %d, %Y", "%d %B %Y", "%B %d, %Y",
+                          "%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%d %b"]
+
+
+def parse_posted_date(text, now: datetime | None = None) -> datetime | None:
+    """
+    Best-effort parse of a listing's posted date ("3 days ago", "2d ago", "Today", "12 Oct, 2026"…).
+    Returns an aware UTC datetime, or None if the text is not recognised.
+    """
+    if not text or _is_junk(text):
+        return None
+    now = now or datetime.now(timezone.utc)
+    cleaned = _POSTED_PREFIX.sub("", str(text).strip().lower()).strip()
+
+    if cleaned in ("just now", "today", "few hours ago", "an hour ago"):
+        return now
+    if cleaned == "yesterday":
+        return now - timedelta(days=1)
+    match = _RELATIVE_DATE.search(cleaned)
+    if match:
+        return now - int(match.group(1)) * _RELATIVE_UNITS[match.group(2).lower()]
+
+    for fmt in _ABSOLUTE_DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(cleaned.title(), fmt)
+        except ValueError:
+            continue
+        if fmt == "%d %b":
+            # No year given: assume the most recent such date
+            parsed = parsed.replace(year=now.year)
+            if parsed.replace(tzinfo=timezone.utc) > now:
+                parsed = parsed.replace(year=now.year - 1)
+        return parsed.replace(tzinfo=timezone.utc)
+    return None
+
+
+# ── Structured fields ──────────────────────────────────────────────────────
+# Numbers like "3", "3.5", "6,00,000" or "600,000"
+_NUMBER = re.compile(r"\d+(?:,\d{2,3})*(?:\.\d+)?")
+_SALARY_UNITS = [  # (pattern, rupees per unit); checked in order
+    (re.compile(r"\b(?:crore|crores|cr)\b"), 10_000_000),
+    (re.compile(r"\b(?:lakh|lakhs|lac|lacs|lpa|l)\b|\d\s*l\b|\d\s*lpa\b"), 100_000),
+    (re.compile(r"\d\s*k\b|\bk\b|thousand"), 1_000),
+]
+_MONTHLY = re.compile(r"per\s*month|/\s*(?:month|mon|m)\b|\bp\.?\s*m\.?(?=\W|$)|\bpm\b|monthly|stipend")
+_NO_SALARY = ("not disclosed", "undisclosed", "as per", "negotiable", "best in industry", "competitive")
+# A unit after the second number of a range ("3-6 months") applies to both ends,
+# one after the first ("6 months - 1 year") only to the low end
+_EXPERIENCE_RANGE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(months?|mos?\b|yrs?|years?)?\s*(?:-|–|to)\s*(\d+(?:\.\d+)?)\s*(months?|mos?\b)?"
+)
+_EXPERIENCE_MIN = re.compile(r"(\d+(?:\.\d+)?)\s*\+\s*(months?|mos?\b)?")
+_EXPERIENCE_ONE = re.compile(r"(\d+(?:\.\d+)?)\s*(yrs?|years?|months?|mos?)\b")
+# "Salary: 3.6 LPA" / "Experience: 0-2 years" / "Location: Pune" lines in free-text posts (Telegram)
+_TEXT_FIELD = re.compile(
+    r"^\W*(salary|ctc|stipend|package|experience|exp|job location|location)\s*[:\-–]\s*(.+)$", re.I | re.M
+)
+
+
+def parse_salary(text) -> tuple[float, float, str] | None:
+    """
+    Parse a salary string into (min, max, currency), amounts per year.
+    "3-6 Lacs p.a." → (300000, 600000, "INR"); "25k/month" → (300000, 300000, "INR").
+    Returns None for "Not disclosed" and anything without a number.
+    """
+    if not text or _is_junk(text):
+        return None
+    cleaned = str(text).lower()
+    if any(phrase in cleaned for phrase in _NO_SALARY):
+        return None
+    numbers = [float(n.replace(",", "")) for n in _NUMBER.findall(cleaned)][:2]
+    if not numbers:
+        return None
+
+    multiplier = next((m for pattern, m in _SALARY_UNITS if pattern.search(cleaned)), None)
+    if multiplier is None:
+        # Bare "3 - 6" on Indian job boards means lakhs per annum
+        multiplier = 100_000 if max(numbers) <= 200 else 1
+    if _MONTHLY.search(cleaned):
+        multiplier *= 12
+    low, high = min(numbers) * multiplier, max(numbers) * multiplier
+    currency = "USD" if "$" in cleaned or "usd" in cleaned else "INR"
+    return low, high, currency
+
+
+def _years(value: str, unit: str | None) -> float:
+    """An experience amount in years (months are converted)."""
+    return float(value) / 12 if unit and unit.startswith("mo") else float(value)
+
+
+def parse_experience(text) -> tuple[float, float | None] | None:
+    """
+    Parse an experience requirement into (min, max) years; max is None when open-ended.
+    "0 - 3 Yrs" → (0, 3); "2+ years" → (2, None); "6 months - 1 year" → (0.5, 1);
+    "Fresher" → (0, 0).
+    """
+    if not text or _is_junk(text):
+        return None
+    cleaned = str(text).lower()
+    match = _EXPERIENCE_RANGE.search(cleaned)
+    if match:
+        low_value, low_unit, high_value, high_unit = match.groups()
+        low, high = _years(low_value, low_unit or high_unit), _years(high_value, high_unit)
+        return min(low, high), max(low, high)
+    match = _EXPERIENCE_MIN.search(cleaned)
+    if match:
+        return _years(*match.groups()), None
+    match = _EXPERIENCE_ONE.search(cleaned)
+    if match:
+        years = _years(*match.groups())
+        return years, years
+    if "fresher" in cleaned or "entry level" in cleaned or "no experience" in cleaned:
+        return 0.0, 0.0
+    return None
+
+
+def post_text(job: dict) -> str:
+    """A Telegram post's message text, followed by the text read from its image (ocrText)."""
+    return "\n".join(part for part in (job.get("text"), job.get("ocrText")) if part)
+
+
+def _text_fields(text: str) -> dict:
+    fields = {}
+    for label, value in _TEXT_FIELD.findall(text or ""):
+        label = label.lower()
+        key = "experience" if label.startswith("exp") else "location" if "location" in label else "salary"
+        fields.setdefault(key, value.strip())
+    return fields
+
+
+def structured_fields(job: dict, now: datetime | None = None) -> dict:
+    """
+    Numeric/datetime versions of a job's free-text fields, for indexed range queries:
+    salaryMin/salaryMax/salaryCurrency (per year), experienceMin/experienceMax (years)
+    and postedAt (aware UTC). Fields that cannot be parsed are left out, except the
+    location fields of resolve_location (cities, remote, hybrid), which are always set.
+    """
+    from_text = _text_fields(post_text(job)) if "text" in job or "ocrText" in job else {}
+    fields = {}
+
+    salary = parse_salary(job.get("salary") or from_text.get("salary"))
+    if salary:
+        fields["salaryMin"], fields["salaryMax"], fields["salaryCurrency"] = salary
+    experience = parse_experience(job.get("experience") or from_text.get("experience"))
+    if experience:
+        fields["experienceMin"], fields["experienceMax"] = experience
+
+    posted = job.get("date")  # Telegram: the message timestamp
+    if not isinstance(posted, datetime):
+        # Relative dates count from when the job was scraped (MongoDB returns naive UTC)
+        seen_at = job.get("createdAt") if isinstance(job.get("createdAt"), datetime) else now
+        if seen_at is not None and seen_at.tzinfo is None:
+            seen_at = seen_at.replace(tzinfo=timezone.utc)
+        posted = parse_posted_date(job.get("postedDate") or job.get("postingTime"), now=seen_at)
+    if posted:
+        fields["postedAt"] = posted if posted.tzinfo else posted.replace(tzinfo=timezone.utc)
+
+    location = job.get("location") or from_text.get("location")
+    fields.update(resolve_location(None if _is_junk(location) else location, job.get("workMode")))
+    return fields
+
+
+def normalize_job(job: dict, now: datetime | None = None) -> dict:
+    """Add structured_fields() to the job in place; returns the job."""
+    job.update(structured_fields(job, now))
+    return job
+
 
 # ── Quality validation ─────────────────────────────────────────────────────
 _JUNK_VALUES  = {"n/a", "na", "none", "null", "undefined", "", "-", "--", "not disclosed"}
@@ -132,117 +681,312 @@ def _is_spam_text(text: str) -> bool:
     return any(p in t for p in _SPAM_PATTERNS)
 
 
-def is_valid_job(job: dict, source: str = "web") -> tuple[bool, str]:
+def _real_skills(skills_raw) -> list:
+    if isinstance(skills_raw, list):
+        return [s for s in skills_raw if s and not _is_junk(s)]
+    return [s.strip() for s in str(skills_raw).split(",") if s.strip() and not _is_junk(s.strip())]
+
+
+def _real_title_words(title: str) -> str:
+    return "".join(c for c in title if c.isalnum() or c.isspace()).strip()
+
+
+# Validation rules per source, in evaluation order: (name, fails(fields), reason).
+# The first failing rule rejects the job, so rules that are cheap and reject often
+# belong first; metrics' "validation" section has the numbers to reorder them by.
+# `reason` is the rejection message, or a function of the fields for one with details.
+# Web rules come in two phases: card rules only need the search-result card, so a
+# scraper with detail pages (HireJobs) runs them before fetching any detail page or logo.
+_WEB_CARD_RULES = [
+    # 1. Title
+    ("missing title", lambda f: _is_junk(f["title"]), "missing title"),
+    ("title length", lambda f: len(f["title"]) < 5 or len(f["title"]) > 200,
+     lambda f: f"title length out of range ({len(f['title'])})"),
+    ("title is email or URL", lambda f: "@" in f["title"] or f["title"].startswith("http"),
+     "title looks like email or URL"),
+    # 2. Company
+    ("missing company", lambda f: _is_junk(f["company"]), "missing company"),
+    ("company is email", lambda f: "@" in f["company"], "company field contains email address"),
+    ("company is URL", lambda f: f["company"].startswith("http"), "company field contains URL"),
+    # 3. Location
+    ("missing location", lambda f: _is_junk(f["location"]), "missing location"),
+]
+_WEB_DETAIL_RULES = [
+    # 4. Skills — must have at least one real skill token
+    ("no skills", lambda f: not _real_skills(f["skills"]), "no skills listed"),
+    # 5. Description (if present must be meaningful)
+    ("short description", lambda f: f["description"] and len(f["description"]) < 30,
+     lambda f: f"description too short ({len(f['description'])} chars)"),
+]
+_WEB_RULES = _WEB_CARD_RULES + _WEB_DETAIL_RULES
+_WEB_PHASES = {"card": _WEB_CARD_RULES, "detail": _WEB_DETAIL_RULES}
+# Telegram jobs: need a real title or company AND a valid apply link. The URL parse
+# is the costliest check, so the text checks (which also reject often) run before it
+_TELEGRAM_RULES = [
+    ("no title or company", lambda f: _is_junk(f["title"]) and _is_junk(f["company"]), "no title or company"),
+    ("short text", lambda f: len(f["description"]) < 30,
+     lambda f: f"text too short ({len(f['description'])} chars)"),
+    ("spam", lambda f: _is_spam_text(f["description"]), "spam content detected"),
+    ("invalid apply link", lambda f: not _has_real_url(f["apply_link"]), "missing or invalid apply link"),
+    # Title must not just be an emoji dump or very short
+    ("title has no words", lambda f: len(_real_title_words(f["title"])) < 5, "title has no real words"),
+]
+
+
+def is_valid_job(job: dict, source: str = "web", phase: str | None = None) -> tuple[bool, str]:
     """
-    Validate a job dict before inserting into MongoDB.
+    Validate a job dict (or JobRecord) before inserting into MongoDB.
     Returns (is_valid: bool, rejection_reason: str).
 
-    Rules applied per source:
+    For web sources `phase` runs only part of the rules: "card" the title/company/location
+    checks (before any detail page), "detail" the rest (on jobs that passed "card").
+
+    Rules applied per source (_WEB_RULES, _TELEGRAM_RULES):
       web (TimesJobs, HireJobs, Instahyre):
-        - title       : required, not junk, length 5–150 chars
+        - title       : required, not junk, length 5–200 chars
         - company     : required, not junk, not an email address
         - location    : required, not junk
-        - description : required if present, min 30 chars (or keySkills must exist)
         - keySkills   : required, at least 1 real skill token
+        - description : required if present, min 30 chars
 
       telegram:
         - title OR company : at least one must be real
         - apply_link       : must be a valid external URL
         - text             : min 30 chars, not spam
+
+    Every rule check is counted and timed in metrics (see RunMetrics.validation_summary).
     """
-    title       = _clean(job.get("title", ""))
-    company     = _clean(job.get("company", ""))
-    location    = _clean(job.get("location", ""))
-    description = str(job.get("description", "") or job.get("text", "") or "").strip()
-    skills_raw  = job.get("keySkills", "") or ""
-    apply_link  = job.get("apply_link", "") or ""
+    clock = time.perf_counter
+    stats = metrics.rule_stats(source)
+    started = clock()
+    fields = {
+        "title": _clean(job.get("title", "")),
+        "company": _clean(job.get("company", "")),
+        "location": _clean(job.get("location", "")),
+        "description": str(job.get("description", "") or post_text(job)).strip(),
+        "skills": job.get("keySkills", "") or "",
+        "apply_link": job.get("apply_link", "") or "",
+    }
+    prepared = stats["prepare fields"]
+    prepared[0] += 1
+    prepared[2] += clock() - started
 
     if source == "telegram":
-        # Telegram jobs: need a real title or company AND a valid apply link
-        if _is_junk(title) and _is_junk(company):
-            return False, "no title or company"
-        if not _has_real_url(apply_link):
-            return False, "missing or invalid apply link"
-        if len(description) < 30:
-            return False, f"text too short ({len(description)} chars)"
-        if _is_spam_text(description):
-            return False, "spam content detected"
-        # Title must not just be an emoji dump or very short
-        real_title = "".join(c for c in title if c.isalnum() or c.isspace()).strip()
-        if len(real_title) < 5:
-            return False, "title has no real words"
-        return True, ""
-
-    # ── Web sources (TimesJobs, HireJobs, Instahyre) ──────────────────────
-    # 1. Title
-    if _is_junk(title):
-        return False, "missing title"
-    if len(title) < 5 or len(title) > 200:
-        return False, f"title length out of range ({len(title)})"
-    if "@" in title or title.startswith("http"):
-        return False, "title looks like email or URL"
-
-    # 2. Company
-    if _is_junk(company):
-        return False, "missing company"
-    if "@" in company:
-        return False, "company field contains email address"
-    if company.startswith("http"):
-        return False, "company field contains URL"
-
-    # 3. Location
-    if _is_junk(location):
-        return False, "missing location"
-
-    # 4. Skills — must have at least one real skill token
-    if isinstance(skills_raw, list):
-        real_skills = [s for s in skills_raw if s and not _is_junk(s)]
+        rules = _TELEGRAM_RULES
     else:
-        real_skills = [s.strip() for s in str(skills_raw).split(",") if s.strip() and not _is_junk(s.strip())]
-    if not real_skills:
-        return False, "no skills listed"
+        rules = _WEB_PHASES[phase] if phase else _WEB_RULES
+    for name, fails, reason in rules:
+        started = clock()
+        failed = fails(fields)
+        rule = stats[name]
+        rule[0] += 1
+        rule[2] += clock() - started
+        if failed:
+            rule[1] += 1
+            return False, reason(fields) if callable(reason) else reason
+    return True, ""
 
-    # 5. Description (if present must be meaningful)
-    if description and len(description) < 30:
-        return False, f"description too short ({len(description)} chars)"
 
-    return True, ""
+def report_validation(source: str = "web") -> None:
+    """Print the rejections of this run by rule, flagging rules that reject most jobs they check."""
+    for name, rule in metrics.validation_summary().get(source, {}).items():
+        if not rule["rejected"]:
+            continue
+        alert = rule["checked"] >= _RULE_ALERT_MIN_CHECKS and rule["rejectRate"] >= _RULE_ALERT_RATE
+        print(f"   {'⚠' if alert else '·'} {name}: rejected {rule['rejected']}/{rule['checked']} "
+              f"({rule['rejectRate']:.0%}){' — selector broken?' if alert else ''}")
 
 
-def filter_jobs(jobs: list[dict], source: str = "web") -> tuple[list[dict], int]:
+def filter_jobs(jobs: list[dict], source: str = "web", phase: str | None = None) -> tuple[list[dict], int]:
     """
-    Filter a list of job dicts through is_valid_job().
-    Returns (valid_jobs, rejected_count).
+    Filter a list of job dicts through is_valid_job() (optionally one phase of it).
+    Returns (valid_jobs, rejected_count); the rejections by rule are printed at the end.
     """
     valid, rejected = [], 0
-    for job in jobs:
-        ok, reason = is_valid_job(job, source=source)
-        if ok:
-            valid.append(job)
-        else:
-            rejected += 1
-            title = job.get("title", "?")[:40]
-            print(f"  ✗ Rejected [{reason}]: {title}")
+    with metrics.timer("filter_jobs"):
+        for job in jobs:
+            ok, reason = is_valid_job(job, source=source, phase=phase)
+            if ok:
+                valid.append(job)
+            else:
+                rejected += 1
+                title = job.get("title", "?")[:40]
+                print(f"  ✗ Rejected [{reason}]: {title}")
+    metrics.incr("jobs_valid", len(valid))
+    metrics.incr("jobs_rejected", rejected)
+    if rejected:
+        report_validation(source)
     return valid, rejected
 
 
-def bulk_upsert_jobs(collection, jobs: list[dict]) -> tuple[int, int]:
+def bulk_upsert_jobs(collection, jobs: list[dict | JobRecord], yield_tracker=None) -> tuple[int, int, int]:
     """
-    Bulk upsert a list of job dicts (each must have 'jobHash').
-    Returns (inserted_count, duplicate_count).
+    Bulk upsert a list of job dicts or JobRecords (each must have 'jobHash').
+    Returns (inserted, updated, unchanged).
+
+    Jobs are first given their structured fields (normalize_job: salaryMin, postedAt…).
+    Each job carries a contentHash (see content_hash). One lookup fetches the stored
+    hashes of the jobs the seen-filter cannot rule out (the batch is added to the filter
+    once written); new jobs are inserted, changed ones get a $set of their content
+    fields, and unchanged ones are only stamped as seen with a single update_many.
+    Every job gets lastSeenAt = now and missedRuns = 0 (see freshness.py).
+    If yield_tracker is given (see role_scheduler.RoleScheduler), it receives the
+    number of new inserts per searchedRole.
     """
     if not jobs:
-        return 0, 0
-
-    operations = [
-        UpdateOne(
-            {"jobHash": job["jobHash"]},
-            {"$setOnInsert": job},
-            upsert=True
-        )
-        for job in jobs
-    ]
-    result = collection.bulk_write(operations, ordered=False)
-    inserted = result.upserted_count
-    duplicates = len(jobs) - inserted
-    return inserted, duplicates
+        return 0, 0, 0
+    from pymongo import UpdateOne
+
+    # Records become documents only now, at write time (see job_record.py)
+    jobs = [job.to_document() if isinstance(job, JobRecord) else job for job in jobs]
+    with metrics.timer("normalize"):
+        for job in jobs:
+            normalize_job(job)
+
+    job_hashes = list({job["jobHash"]: None for job in jobs})
+    maybe = _probably_known(collection, job_hashes)
+    with metrics.timer("mongo_known_hashes"):
+        stored = {
+            d["jobHash"]: d.get("contentHash")
+            for d in collection.find({"jobHash": {"$in": maybe}}, {"jobHash": 1, "contentHash": 1, "_id": 0})
+        } if maybe else {}
+    metrics.incr("seen_filter_false_positives", len(maybe) - len(stored))
+
+    now = datetime.now(timezone.utc)
+    seen = {"lastSeenAt": now, "missedRuns": 0}
+    operations, written_jobs, unchanged_hashes = [], [], []
+    handled: set[str] = set()
+    updated = 0
+    for job in jobs:
+        job_hash = job["jobHash"]
+        if job_hash in handled:
+            unchanged_hashes.append(job_hash)  # repeated within the batch
+            continue
+        handled.add(job_hash)
+        digest = content_hash(job)
+
+        if job_hash not in stored:
+            # Still an upsert: another run may insert the same job between lookup and write
+            operations.append(UpdateOne(
+                {"jobHash": job_hash},
+                {"$setOnInsert": {**job, "contentHash": digest, "firstSeenAt": now}, "$set": seen},
+                upsert=True
+            ))
+        elif stored[job_hash] != digest:
+            changed = {k: v for k, v in job.items() if k not in _INSERT_ONLY_FIELDS}
+            operations.append(UpdateOne(
+                {"jobHash": job_hash},
+                {"$set": {**changed, "contentHash": digest, "updatedAt": now, **seen},
+                 "$unset": {"expiredAt": ""}}
+            ))
+            updated += 1
+        else:
+            unchanged_hashes.append(job_hash)
+            continue
+        written_jobs.append(job)
+
+    inserted = 0
+    with metrics.timer("mongo_bulk_write"):
+        if operations:
+            result = collection.bulk_write(operations, ordered=False)
+            inserted = result.upserted_count
+            if yield_tracker is not None:
+                # upserted_ids is keyed by the index of the operation that inserted
+                per_role = Counter(written_jobs[i].get("searchedRole") for i in result.upserted_ids)
+                yield_tracker.record_inserts(per_role)
+        if unchanged_hashes:
+            collection.update_many({"jobHash": {"$in": unchanged_hashes}},
+                                   {"$set": seen, "$unset": {"expiredAt": ""}})
+    _remember_hashes(collection, job_hashes)
+
+    unchanged = len(unchanged_hashes)
+    metrics.incr("jobs_inserted", inserted)
+    metrics.incr("jobs_updated", updated)
+    metrics.incr("jobs_unchanged", unchanged)
+    return inserted, updated, unchanged
+
+
+def save_jobs(collection, jobs: list[dict | JobRecord], yield_tracker=None, phase: str | None = None,
+              empty_message: str = "⚠ No jobs collected.") -> dict:
+    """
+    Quality-filter a website scraper's collected jobs and bulk upsert them; returns the counts.
+    `phase` limits the filter to one phase of is_valid_job (HireJobs already applied the
+    card checks before fetching detail pages).
+    """
+    counts = {"collected": len(jobs), "valid": 0, "rejected": 0, "inserted": 0, "updated": 0, "unchanged": 0}
+    if not jobs:
+        print(empty_message)
+        return counts
+    print(f"\n🔍  Running quality filter on {len(jobs)} collected jobs…")
+    valid_jobs, rejected = filter_jobs(jobs, source="web", phase=phase)
+    counts.update(valid=len(valid_jobs), rejected=rejected)
+    print(f"   ✓ Passed: {len(valid_jobs)}  |  ✗ Rejected: {rejected}")
+    if valid_jobs:
+        inserted, updated, unchanged = bulk_upsert_jobs(collection, valid_jobs, yield_tracker=yield_tracker)
+        counts.update(inserted=inserted, updated=updated, unchanged=unchanged)
+        print(f"   ✓ Inserted: {inserted} new  |  Updated: {updated}  |  Unchanged: {unchanged}")
+    return counts
+
+
+# ── Run time budget ────────────────────────────────────────────────────────
+class TimeBudget:
+    """
+    Wall-clock budget for one scraper run.
+
+    scheduler.js kills a scraper at its timeoutMs and everything buffered in memory
+    is lost. It passes SCRAPER_TIME_BUDGET_SEC (a little less than the timeout) so the
+    scraper can stop starting new work in time and still save what it collected.
+    SIGTERM is treated the same way: the budget is marked exhausted instead of dying.
+    """
+
+    def __init__(self, seconds: float | None = None, reserve_sec: float = 60.0):
+        self.seconds = seconds
+        self.reserve_sec = reserve_sec
+        self.started = time.monotonic()
+        self.interrupted = False
+
+    @classmethod
+    def from_env(cls, reserve_sec: float = 60.0) -> "TimeBudget":
+        """Build a budget from SCRAPER_TIME_BUDGET_SEC (unset or invalid = unlimited)."""
+        raw = os.getenv("SCRAPER_TIME_BUDGET_SEC")
+        try:
+            seconds = float(raw) if raw else None
+        except ValueError:
+            print(f"  ⚠ Ignoring invalid SCRAPER_TIME_BUDGET_SEC={raw!r}")
+            seconds = None
+        budget = cls(seconds, reserve_sec=reserve_sec)
+        budget.install_signal_handler()
+        return budget
+
+    def install_signal_handler(self) -> None:
+        """Turn SIGTERM into a graceful stop so collected jobs are still flushed."""
+        def _handle(signum, frame):
+            print("\n⏱  Termination requested — finishing up and saving collected jobs…")
+            self.interrupted = True
+        try:
+            signal.signal(signal.SIGTERM, _handle)
+        except ValueError:
+            pass  # not on the main thread
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def remaining(self) -> float | None:
+        """Seconds left before the reserve is reached, or None when unlimited."""
+        if self.seconds is None:
+            return None
+        return max(0.0, self.seconds - self.reserve_sec - self.elapsed)
+
+    def can_start(self, expected_sec: float = 0.0) -> bool:
+        """True if a unit of work expected to take expected_sec still fits."""
+        if self.interrupted:
+            return False
+        remaining = self.remaining
+        return remaining is None or remaining >= expected_sec
+
+    def describe(self) -> str:
+        if self.seconds is None:
+            return f"{self.elapsed:.0f}s elapsed"
+        return f"{self.elapsed:.0f}s elapsed, {self.remaining:.0f}s left"
@@ -0,0 +1,152 @@
+"""
+Persistent Bloom filters of the jobHashes already stored, one file per collection.
+- "Probably seen" checks run in-process in O(k) bit lookups; only probable hits are
+  confirmed against MongoDB, so pages and batches of new jobs cost no round-trip
+- The bit array is memory-mapped, so opening a filter reads nothing up front and
+  updates go straight to the page cache (flush() makes them durable)
+- Sized for `capacity` hashes at FALSE_POSITIVE_RATE; once more hashes than that were
+  added the filter reports itself full and is rebuilt, twice as large, on next open
+
+A Bloom filter never forgets: jobs deleted from MongoDB (expiredAt TTL) stay "probably
+seen" and are simply confirmed as absent. It also only knows what this machine wrote —
+if another host writes the same collections, delete the .bloom files (or set
+SCRAPER_SEEN_FILTER=0) so they are rebuilt from MongoDB.
+
+Typical use (scraper_utils.seen_filter does this per collection):
+    bloom = BloomFilter.open(path)            # or BloomFilter.build(path, hashes, capacity)
+    maybe_known = [h for h in hashes if h in bloom]
+    ...
+    bloom.update(written_hashes)
+    bloom.flush()
+"""
+
+import os
+import math
+import mmap
+import struct
+import hashlib
+import threading
+
+DEFAULT_FILTER_DIR = os.getenv(
+    "SCRAPER_SEEN_FILTER_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".seen_filters")
+)
+DEFAULT_CAPACITY = int(os.getenv("SCRAPER_SEEN_FILTER_CAPACITY", "1000000"))
+FALSE_POSITIVE_RATE = float(os.getenv("SCRAPER_SEEN_FILTER_FP_RATE", "0.01"))
+
+_MAGIC = b"JHBF"
+_VERSION = 1
+# magic, version, hash count (k), bit count (m), capacity, hashes added
+_HEADER = struct.Struct("<4sHHQQQ")
+_COUNT_OFFSET = _HEADER.size - 8
+
+
+def _digest(key: str) -> bytes:
+    # jobHashes are MD5 hex digests already: reuse their bits instead of hashing again
+    if len(key) == 32:
+        try:
+            return bytes.fromhex(key)
+        except ValueError:
+            pass
+    return hashlib.md5(key.encode("utf-8")).digest()
+
+
+def _positions(key: str, hashes: int, bits: int) -> list[int]:
+    """Bit positions of a key by double hashing (Kirsch–Mitzenmacher)."""
+    digest = _digest(key)
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:16], "little") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def _dimensions(capacity: int, fp_rate: float) -> tuple[int, int]:
+    """(bits, hashes) of an optimal filter for `capacity` keys at `fp_rate`."""
+    capacity = max(1, capacity)
+    bits = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+    bits = (bits + 7) // 8 * 8
+    return bits, max(1, round(bits / capacity * math.log(2)))
+
+
+class BloomFilter:
+    """A Bloom filter over a memory-mapped file: header, then the bit array."""
+
+    def __init__(self, path: str, file, view: mmap.mmap):
+        header = _HEADER.unpack_from(view, 0) if len(view) >= _HEADER.size else (b"", 0, 0, 0, 0, 0)
+        magic, version, self.hashes, self.bits, self.capacity, _ = header
+        if magic != _MAGIC or version != _VERSION or len(view) != _HEADER.size + self.bits // 8:
+            view.close()
+            file.close()
+            raise ValueError(f"{path} is not a version {_VERSION} seen-filter")
+        self.path = path
+        self._file = file
+        self._view = view
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str) -> "BloomFilter":
+        """Memory-map an existing filter file (FileNotFoundError if there is none)."""
+        file = open(path, "r+b")
+        try:
+            view = mmap.mmap(file.fileno(), 0)
+        except (OSError, ValueError):
+            file.close()
+            raise
+        return cls(path, file, view)
+
+    @classmethod
+    def build(cls, path: str, keys, capacity: int = DEFAULT_CAPACITY,
+              fp_rate: float = FALSE_POSITIVE_RATE) -> "BloomFilter":
+        """Write a new filter holding `keys` (any iterable) and open it; replaces the file atomically."""
+        bits, hashes = _dimensions(capacity, fp_rate)
+        array = bytearray(bits // 8)
+        count = 0
+        for key in keys:
+            for position in _positions(key, hashes, bits):
+                array[position >> 3] |= 1 << (position & 7)
+            count += 1
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, hashes, bits, capacity, count))
+            f.write(array)
+        os.replace(tmp_path, path)
+        return cls.open(path)
+
+    @property
+    def count(self) -> int:
+        """Hashes added so far (repeats that set no new bit are not counted)."""
+        return struct.unpack_from("<Q", self._view, _COUNT_OFFSET)[0]
+
+    @property
+    def full(self) -> bool:
+        """True once the filter holds more hashes than it was sized for."""
+        return self.count > self.capacity
+
+    def __contains__(self, key: str) -> bool:
+        view, offset = self._view, _HEADER.size
+        return all(view[offset + (p >> 3)] & (1 << (p & 7)) for p in _positions(key, self.hashes, self.bits))
+
+    def update(self, keys) -> int:
+        """Add keys; returns how many of them were new to the filter."""
+        view, offset = self._view, _HEADER.size
+        added = 0
+        with self._lock:
+            for key in keys:
+                new = False
+                for position in _positions(key, self.hashes, self.bits):
+                    index, mask = offset + (position >> 3), 1 << (position & 7)
+                    if not view[index] & mask:
+                        view[index] |= mask
+                        new = True
+                added += new
+            if added:
+                struct.pack_into("<Q", view, _COUNT_OFFSET, self.count + added)
+        return added
+
+    def flush(self) -> None:
+        """Write dirty pages back to the file."""
+        self._view.flush()
+
+    def close(self) -> None:
+        self._view.close()
+        self._file.close()
@@ -0,0 +1,128 @@
+"""
+Selector registry for the website scrapers.
+- Remembers, per (site, field), which CSS selector matched most often in the last run
+  and puts it first next run, so cards stop probing selectors that no longer match
+- Counts lookups and hits per field during the run (a hit: some selector found a value)
+- Keeps a moving average of every field's hit rate and alerts when a run falls well
+  below it (or, with no history yet, when a field matches nothing) — usually a site redesign
+
+History lives in the `scraper_selectors` collection, one document per (site, field).
+Set SCRAPER_SELECTOR_REGISTRY=0 to keep the selectors in code order and record nothing.
+"""
+
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from scraper_utils import get_collection, metrics
+
+SELECTOR_COLLECTION = "scraper_selectors"
+
+# Weight of the latest run in the moving hit rate (0 < alpha <= 1)
+EWMA_ALPHA = 0.3
+# Alert when a run's hit rate is this far below the field's moving average…
+ALERT_DROP = float(os.getenv("SCRAPER_SELECTOR_ALERT_DROP", "0.3"))
+# …judged only once the field was looked up at least this many times in the run
+MIN_LOOKUPS = 10
+
+
+class SelectorRegistry:
+    """
+    Orders fallback selectors by past success and tracks per-field hit rates.
+
+    Typical use inside a scraper:
+        selectors = SelectorRegistry("instahyre")
+        for sel in selectors.order("card", JOB_CARD_SELECTORS):
+            ...
+        selectors.record("title", matched_selector)   # None when nothing matched
+        ...
+        selectors.save()
+    """
+
+    def __init__(self, site: str, enabled: bool | None = None):
+        self.site = site
+        if enabled is None:
+            enabled = os.getenv("SCRAPER_SELECTOR_REGISTRY", "1") != "0"
+        self.enabled = enabled
+        self._history: dict[str, dict] | None = None
+        self._lookups: Counter = Counter()
+        self._winners: dict[str, Counter] = defaultdict(Counter)
+
+    def _load(self) -> dict[str, dict]:
+        if self._history is None:
+            try:
+                docs = get_collection(SELECTOR_COLLECTION).find({"site": self.site}, {"_id": 0})
+                self._history = {d["field"]: d for d in docs}
+            except Exception as e:
+                print(f"  ⚠ Could not load selector history: {e}")
+                self._history = {}
+        return self._history
+
+    def order(self, field: str, selectors: list[str]) -> list[str]:
+        """The selectors with last run's winner first (code order otherwise)."""
+        if not self.enabled:
+            return list(selectors)
+        winner = (self._load().get(field) or {}).get("winner")
+        if winner not in selectors:
+            return list(selectors)
+        return [winner] + [s for s in selectors if s != winner]
+
+    def record(self, field: str, selector: str | None) -> None:
+        """Count one lookup of a field and the selector that matched it (None: no match)."""
+        if not self.enabled:
+            return
+        self._lookups[field] += 1
+        if selector:
+            self._winners[field][selector] += 1
+
+    def hit_rate(self, field: str) -> float | None:
+        lookups = self._lookups[field]
+        return sum(self._winners[field].values()) / lookups if lookups else None
+
+    def alerts(self) -> list[str]:
+        """Fields whose hit rate this run dropped well below their usual rate (or matched nothing)."""
+        alerts = []
+        history = self._load()
+        for field, lookups in self._lookups.items():
+            if lookups < MIN_LOOKUPS:
+                continue
+            rate = self.hit_rate(field)
+            usual = (history.get(field) or {}).get("ewmaHitRate")
+            if (rate < usual - ALERT_DROP) if usual is not None else rate == 0:
+                usual_text = f"usually {usual:.0%}" if usual is not None else "no history"
+                alerts.append(f"{self.site}.{field}: {rate:.0%} of {lookups} lookups matched ({usual_text})")
+        return alerts
+
+    def save(self) -> None:
+        """Print this run's hit rates and alerts, and persist winners and moving averages."""
+        if not self.enabled or not self._lookups:
+            return
+        rates = ", ".join(f"{field} {self.hit_rate(field):.0%}" for field in sorted(self._lookups))
+        print(f"   🎯 Selector hit rates: {rates}")
+        alerts = self.alerts()
+        for alert in alerts:
+            print(f"   ⚠ Selector alert — {alert}. Has the site changed its layout?")
+        metrics.incr("selector_alerts", len(alerts))
+
+        now = datetime.now(timezone.utc)
+        history = self._load()
+        try:
+            collection = get_collection(SELECTOR_COLLECTION)
+            for field, lookups in self._lookups.items():
+                rate = self.hit_rate(field)
+                previous = (history.get(field) or {}).get("ewmaHitRate")
+                update = {
+                    "ewmaHitRate": rate if previous is None else EWMA_ALPHA * rate + (1 - EWMA_ALPHA) * previous,
+                    "lastHitRate": rate,
+                    "lastLookups": lookups,
+                    "updatedAt": now,
+                }
+                if self._winners[field]:
+                    update["winner"] = self._winners[field].most_common(1)[0][0]
+                    # A list, not a dict: selectors contain "." which MongoDB reads as a path
+                    update["lastWinners"] = [{"selector": sel, "hits": hits}
+                                             for sel, hits in self._winners[field].most_common()]
+                collection.update_one({"site": self.site, "field": field},
+                                      {"$set": update, "$inc": {"runs": 1}}, upsert=True)
+        except Exception as e:
+            print(f"  ⚠ Could not save selector history: {e}")
@@ -6,26 +6,14 @@ import sys
 import os
 import re
 import datetime
-import configparser
-import tempfile
+import asyncio
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(script_dir, ".."))
-from scraper_utils import get_collection, generate_job_hash, bulk_upsert_jobs, upload_image_to_imagekit, filter_jobs
-
-from telethon.sync import TelegramClient
+from scraper_utils import generate_job_hash, metrics
+from async_ingest import IngestPipeline, run_telegram
 
 # ── Config ────────────────────────────────────────────────────────────────────
-config_path = os.path.join(script_dir, "telethon.config")
-if not os.path.exists(config_path):
-    print(f"❌ Config file not found: {config_path}")
-    sys.exit(1)
-
-config = configparser.ConfigParser()
-config.read(config_path)
-api_id = config["telethon_credentials"]["api_id"]
-api_hash = config["telethon_credentials"]["api_hash"]
-
 CHATS = ["vijaykushal"]
 MESSAGE_LIMIT = 200
 SESSION_PATH = os.path.join(script_dir, "kushal_session")
@@ -91,89 +79,56 @@ def parse_job_details(text: str) -> dict:
     return job
 
 
+# ── Message handling ──────────────────────────────────────────────────────────
+def parse_message(message, ocr_text: str = "") -> dict | None:
+    """
+    Parse a Telegram message; None if it does not look like a job post.
+    `ocr_text` (read from the message photo) is parsed after the message text.
+    """
+    details = parse_job_details("\n".join(part for part in (message.text, ocr_text) if part))
+    has_info = any([details["company"], details["role"], details["batch"], details["apply_link"]])
+    return details if has_info else None
+
+
+def build_job_post(message, chat: str, details: dict, image_url: str | None = None,
+                   ocr_text: str = "") -> dict:
+    """Build the MongoDB document for a parsed job message (ocrText: text read from its photo)."""
+    job_hash = generate_job_hash(
+        details["title"] or "",
+        details["company"] or "",
+        str(message.date.date())
+    )
+    post = {
+        "title": details["title"] or f"Job from {chat}",
+        "company": details["company"] or "",
+        "role": details["role"] or "",
+        "batch": details["batch"] or "",
+        "apply_link": details["apply_link"] or "",
+        "text": message.text or "",
+        "date": message.date,
+        "group": chat,
+        "sender": str(message.sender_id),
+        "image_url": image_url,  # CDN URL or None
+        "source": "Telegram",
+        "jobHash": job_hash,
+        "createdAt": datetime.datetime.now(datetime.timezone.utc),
+    }
+    if ocr_text:
+        post["ocrText"] = ocr_text
+    return post
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
-collection = get_collection("telegram")
-job_posts = []
-
-print("🔄 Connecting to Telegram (Kushal Vijay)...")
-
-try:
-    with TelegramClient(SESSION_PATH, api_id, api_hash) as client:
-        print("✅ Connected")
-
-        for chat in CHATS:
-            print(f"🔍 Scraping: {chat} (limit={MESSAGE_LIMIT})")
-            processed = 0
-            skipped = 0
-
-            try:
-                entity = client.get_entity(chat)
-                print(f"   Found: {getattr(entity, 'title', chat)}")
-
-                for message in client.iter_messages(chat, limit=MESSAGE_LIMIT):
-                    details = parse_job_details(message.text or "")
-                    has_info = any([details["company"], details["role"], details["batch"], details["apply_link"]])
-                    if not has_info:
-                        skipped += 1
-                        continue
-
-                    # Upload image to ImageKit
-                    image_url = None
-                    if message.photo:
-                        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-                            tmp_path = tmp.name
-                        try:
-                            client.download_media(message, file=tmp_path)
-                            with open(tmp_path, "rb") as f:
-                                img_bytes = f.read()
-                            image_url = upload_image_to_imagekit(
-                                img_bytes,
-                                f"telegram_{message.id}.jpg",
-                                folder="telegram-jobs"
-                            )
-                        finally:
-                            if os.path.exists(tmp_path):
-                                os.remove(tmp_path)
-
-                    processed += 1
-                    job_hash = generate_job_hash(
-                        details["title"] or "",
-                        details["company"] or "",
-                        str(message.date.date())
-                    )
-
-                    job_posts.append({
-                        "title": details["title"] or f"Job from {chat}",
-                        "company": details["company"] or "",
-                        "role": details["role"] or "",
-                        "batch": details["batch"] or "",
-                        "apply_link": details["apply_link"] or "",
-                        "text": message.text or "",
-                        "date": message.date,
-                        "group": chat,
-                        "sender": str(message.sender_id),
-                        "image_url": image_url,  # CDN URL or None
-                        "source": "Telegram",
-                        "jobHash": job_hash,
-                        "createdAt": datetime.datetime.now(datetime.timezone.utc),
-                    })
-
-                print(f"   Processed: {processed}  |  Skipped: {skipped}")
-
-            except Exception as e:
-                print(f"❌ Error scraping {chat}: {e}")
-
-except Exception as e:
-    print(f"❌ Telegram connection error: {e}")
-
-# ── Quality filter + save ─────────────────────────────────────────────────────
-print(f"\nTotal collected: {len(job_posts)}")
-if job_posts:
-    print("🔍  Running quality filter…")
-    valid_jobs, rejected = filter_jobs(job_posts, source="telegram")
-    print(f"   ✓ Passed: {len(valid_jobs)}  |  ✗ Rejected: {rejected}")
-    if valid_jobs:
-        inserted, dupes = bulk_upsert_jobs(collection, valid_jobs)
-        print(f"   ✓ Inserted: {inserted} new  |  Duplicates skipped: {dupes}")
-else:
-    print("⚠ No job posts found.")
+async def run(collection=None) -> IngestPipeline:
+    """Scrape every chat in CHATS into MongoDB; returns the finished pipeline (for its counts)."""
+    return await run_telegram("Kushal Vijay", CHATS, SESSION_PATH, parse_message, build_job_post,
+                              collection=collection, message_limit=MESSAGE_LIMIT)
+
+
+def main():
+    metrics.emit_at_exit("telegram_kushal")
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+The scraper modules import each other as top-level modules (run from backend/scripts).
+job_collection is an in-memory job collection (mongomock) for the MongoDB write paths.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeCollection:
+    """
+    A mongomock collection whose bulk_write applies pymongo UpdateOne operations one by one
+    (mongomock's own bulk_write does not accept the UpdateOne of current pymongo releases).
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.bulk_writes = 0
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes += 1
+        upserted_ids = {}
+        matched = modified = 0
+        for i, op in enumerate(operations):
+            result = self._collection.update_one(op._filter, op._doc, upsert=op._upsert)
+            if result.upserted_id is not None:
+                upserted_ids[i] = result.upserted_id
+            matched += result.matched_count
+            modified += result.modified_count
+        return SimpleNamespace(upserted_count=len(upserted_ids), upserted_ids=upserted_ids,
+                               matched_count=matched, modified_count=modified)
+
+
+@pytest.fixture
+def job_collection(monkeypatch):
+    mongomock = pytest.importorskip("mongomock")
+    import scraper_utils
+
+    # Every hash is looked up in the collection itself, without a seen-filter file on disk
+    monkeypatch.setattr(scraper_utils, "_SEEN_FILTER_ENABLED", False)
+    return FakeCollection(mongomock.MongoClient().jobs.timesjob)
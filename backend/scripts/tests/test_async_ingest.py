@@ -0,0 +1,107 @@
+"""IngestPipeline.scrape_chat: bounded photo downloads, each photo downloaded once."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import async_ingest
+from async_ingest import IngestPipeline
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeClient:
+    """The Telethon calls scrape_chat makes; downloads take a moment so they overlap."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.downloads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_entity(self, chat):
+        return SimpleNamespace(title=chat)
+
+    async def iter_messages(self, chat, limit):
+        for message in self.messages[:limit]:
+            yield message
+
+    async def download_media(self, message, file):
+        self.downloads.append(message.id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return b"image-%d" % message.id
+
+
+class PosterOcr:
+    """ImageOcr stand-in: every photo is a poster reading "hiring"."""
+
+    def wanted(self, message):
+        return bool(message.photo)
+
+    async def text(self, img_bytes):
+        return "hiring" if img_bytes else ""
+
+
+def message(i: int, text: str = "", photo: bool = True):
+    return SimpleNamespace(id=i, text=text, photo=photo, date=START - timedelta(minutes=i))
+
+
+def parse_message(message, ocr_text=""):
+    text = "\n".join(part for part in (message.text, ocr_text) if part)
+    return {"title": text} if "hiring" in text else None
+
+
+def build_job_post(message, chat, details, image_url=None, ocr_text=""):
+    return {"title": details["title"], "group": chat, "image_url": image_url, "ocrText": ocr_text}
+
+
+def scrape(monkeypatch, messages, ocr=None, concurrency=2):
+    monkeypatch.setattr(async_ingest, "DOWNLOAD_CONCURRENCY", concurrency)
+    monkeypatch.setattr(async_ingest, "_download_slots", None)
+    uploads = []
+
+    async def upload(file_bytes, filename, folder=None):
+        uploads.append(file_bytes)
+        return f"https://cdn.example/{filename}"
+
+    monkeypatch.setattr(async_ingest, "async_upload_image", upload)
+    client, posts = FakeClient(messages), []
+
+    async def main():
+        pipeline = IngestPipeline(None, source="telegram")
+
+        async def put(job):
+            posts.append(job)
+            return True
+
+        pipeline.put = put
+        return await pipeline.scrape_chat(client, "jobs", parse_message, build_job_post, ocr=ocr)
+
+    return asyncio.run(main()), client, posts, uploads
+
+
+def test_downloads_are_bounded(monkeypatch):
+    _, client, posts, _ = scrape(monkeypatch, [message(i, "hiring") for i in range(10)], concurrency=3)
+    assert len(posts) == 10
+    assert client.max_in_flight == 3
+
+
+def test_poster_photo_is_downloaded_once_for_ocr_and_upload(monkeypatch):
+    _, client, posts, uploads = scrape(monkeypatch, [message(1), message(2)], ocr=PosterOcr())
+    assert sorted(client.downloads) == [1, 2]
+    assert sorted(uploads) == [b"image-1", b"image-2"]
+    assert all(post["ocrText"] == "hiring" for post in posts)
+
+
+def test_photo_of_a_non_job_message_is_not_downloaded(monkeypatch):
+    _, client, posts, _ = scrape(monkeypatch, [message(1, "weekly update"), message(2, "hiring", photo=False)])
+    assert client.downloads == []
+    assert [post["image_url"] for post in posts] == [None]
+
+
+def test_returns_the_oldest_message_date(monkeypatch):
+    oldest, *_ = scrape(monkeypatch, [message(i, "hiring", photo=False) for i in range(5)])
+    assert oldest == START - timedelta(minutes=4)
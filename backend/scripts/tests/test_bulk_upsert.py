@@ -0,0 +1,83 @@
+"""bulk_upsert_jobs: inserts, in-place updates by contentHash, and unchanged sightings."""
+
+from datetime import datetime, timedelta, timezone
+
+from scraper_utils import bulk_upsert_jobs, content_hash, normalize_job
+
+
+def job(i: int, **fields) -> dict:
+    return {"title": f"Engineer {i}", "company": "Acme", "location": "Pune",
+            "searchedRole": "python", "jobHash": f"hash-{i}", **fields}
+
+
+class YieldTracker:
+    def __init__(self):
+        self.inserts = {}
+
+    def record_inserts(self, per_role):
+        for role, count in per_role.items():
+            self.inserts[role] = self.inserts.get(role, 0) + count
+
+
+def test_new_jobs_are_inserted_with_their_content_hash(job_collection):
+    tracker = YieldTracker()
+    assert bulk_upsert_jobs(job_collection, [job(1), job(2)], yield_tracker=tracker) == (2, 0, 0)
+    expected = normalize_job(job(1))
+    stored = job_collection.find_one({"jobHash": "hash-1"})
+    assert stored["contentHash"] == content_hash(expected)
+    assert stored["missedRuns"] == 0 and stored["firstSeenAt"] and stored["lastSeenAt"]
+    assert tracker.inserts == {"python": 2}
+
+
+def test_matching_content_hash_only_touches_the_job(job_collection):
+    bulk_upsert_jobs(job_collection, [job(1)])
+    before = job_collection.find_one({"jobHash": "hash-1"})
+    writes = job_collection.bulk_writes
+
+    assert bulk_upsert_jobs(job_collection, [job(1)]) == (0, 0, 1)
+    after = job_collection.find_one({"jobHash": "hash-1"})
+    assert job_collection.bulk_writes == writes  # no write operation, only the update_many touch
+    assert "updatedAt" not in after
+    assert after["contentHash"] == before["contentHash"]
+
+
+def test_changed_content_is_updated_in_place(job_collection):
+    bulk_upsert_jobs(job_collection, [job(1, salary="5 LPA")])
+    old_hash = job_collection.find_one({"jobHash": "hash-1"})["contentHash"]
+    job_collection.update_one({"jobHash": "hash-1"}, {"$set": {"expiredAt": datetime.now(timezone.utc)}})
+
+    assert bulk_upsert_jobs(job_collection, [job(1, salary="8 LPA", searchedRole="java")]) == (0, 1, 0)
+    stored = job_collection.find_one({"jobHash": "hash-1"})
+    assert stored["salary"] == "8 LPA"
+    assert stored["contentHash"] != old_hash
+    assert stored["updatedAt"]
+    assert "expiredAt" not in stored
+    assert stored["searchedRole"] == "python"  # insert-only field kept
+    assert job_collection.count_documents({}) == 1
+
+
+def test_legacy_document_without_a_hash_is_updated_once(job_collection):
+    job_collection.insert_one({**job(1), "lastSeenAt": datetime.now(timezone.utc) - timedelta(days=3)})
+
+    assert bulk_upsert_jobs(job_collection, [job(1)]) == (0, 1, 0)
+    assert job_collection.find_one({"jobHash": "hash-1"})["contentHash"]
+    assert bulk_upsert_jobs(job_collection, [job(1)]) == (0, 0, 1)
+
+
+def test_counts_mixed_batch(job_collection):
+    bulk_upsert_jobs(job_collection, [job(1), job(2)])
+    batch = [job(1), job(2, salary="9 LPA"), job(3), job(3)]  # unchanged, changed, new, repeated
+    assert bulk_upsert_jobs(job_collection, batch) == (1, 1, 2)
+    assert job_collection.count_documents({}) == 3
+
+
+def test_every_sighting_resets_missed_runs(job_collection):
+    bulk_upsert_jobs(job_collection, [job(1), job(2)])
+    job_collection.update_many({}, {"$set": {"missedRuns": 2}})
+
+    bulk_upsert_jobs(job_collection, [job(1), job(2, salary="9 LPA")])
+    assert [d["missedRuns"] for d in job_collection.find({}, sort=[("jobHash", 1)])] == [0, 0]
+
+
+def test_empty_batch(job_collection):
+    assert bulk_upsert_jobs(job_collection, []) == (0, 0, 0)
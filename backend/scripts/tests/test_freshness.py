@@ -0,0 +1,184 @@
+"""FreshnessTracker: which roles were read to their end, missedRuns counting and expiry."""
+
+from datetime import datetime, timedelta, timezone
+
+from freshness import FreshnessTracker
+from pagination import Pagination
+
+
+def build_card(fields: dict) -> dict | None:
+    return fields if fields.get("title") else None
+
+
+def card_hash(card: dict) -> str:
+    return card["title"]
+
+
+def listing(start: int, count: int) -> list[dict]:
+    return [{"title": f"job-{i}"} for i in range(start, start + count)]
+
+
+def walk(freshness: FreshnessTracker, role: str, pages: list[list[dict]], max_pages: int = 5) -> Pagination:
+    """Walk a role whose result pages list `pages` (page 1 first); every listed job is new unless repeated."""
+    pagination = Pagination(max_pages=max_pages)
+
+    def fetch(page: int) -> list[dict]:
+        raw_cards = pages[page - 1] if page <= len(pages) else []
+        freshness.page_read(role, raw_cards, len(raw_cards), build_card, card_hash)
+        return [{"jobHash": card_hash(card)} for card in map(build_card, raw_cards) if card]
+
+    pagination.walk(fetch)
+    freshness.searched(role)
+    return pagination
+
+
+def test_every_card_read_is_seen():
+    freshness = FreshnessTracker(None)
+    freshness.page_read("python", listing(0, 3) + [{"title": ""}], 4, build_card, card_hash)
+    assert freshness._seen == {"job-0", "job-1", "job-2"}
+
+
+def test_unreadable_card_leaves_the_role_partial():
+    freshness = FreshnessTracker(None)
+    freshness.page_read("python", listing(0, 2) + [None], 3, build_card, card_hash)
+    freshness.page_read("python", [], 0, build_card, card_hash)
+    freshness.searched("python")
+    assert freshness.complete_scopes == []
+
+
+def test_role_ending_on_an_empty_page_is_complete():
+    freshness = FreshnessTracker(None)
+    pagination = walk(freshness, "python", [listing(0, 10)])
+    assert pagination.stop_reason == "no new jobs on the page"
+    assert freshness.complete_scopes == ["python"]
+
+
+def test_known_only_short_last_page_is_complete():
+    freshness = FreshnessTracker(None)
+    # Page 3 repeats jobs of page 1: pagination stops on known jobs, but the page was short
+    pagination = walk(freshness, "python", [listing(0, 10), listing(10, 10), listing(0, 4)])
+    assert pagination.stop_reason == "only known jobs"
+    assert freshness.complete_scopes == ["python"]
+
+
+def test_known_only_full_last_page_is_partial():
+    freshness = FreshnessTracker(None)
+    pagination = walk(freshness, "python", [listing(0, 10), listing(0, 10), listing(10, 3)])
+    assert pagination.stop_reason == "only known jobs"
+    assert freshness.complete_scopes == []
+
+
+def test_stopping_at_max_pages_is_partial():
+    freshness = FreshnessTracker(None)
+    pagination = walk(freshness, "python", [listing(0, 10), listing(10, 10), listing(20, 10)], max_pages=2)
+    assert pagination.stop_reason == "max pages reached"
+    assert freshness.complete_scopes == []
+
+
+def test_short_page_at_max_pages_is_complete():
+    freshness = FreshnessTracker(None)
+    pagination = walk(freshness, "python", [listing(0, 10), listing(10, 6)], max_pages=2)
+    assert pagination.stop_reason == "max pages reached"
+    assert freshness.complete_scopes == ["python"]
+
+
+def test_page_size_is_learned_from_other_roles():
+    freshness = FreshnessTracker(None)
+    walk(freshness, "python", [listing(0, 10), listing(10, 10)])
+    # One page of "java" (max_pages=1): only the page size seen for "python" says it was short
+    walk(freshness, "java", [listing(0, 7)], max_pages=1)
+    assert freshness.full_page_size() == 10
+    assert freshness.complete_scopes == ["java", "python"]
+
+
+def test_unknown_page_size_only_trusts_an_empty_page():
+    freshness = FreshnessTracker(None)
+    walk(freshness, "python", [listing(0, 7)], max_pages=1)
+    assert freshness.full_page_size() is None
+    assert freshness.complete_scopes == []
+
+
+def test_unpaged_scope_counts_once_searched():
+    freshness = FreshnessTracker(None, scope_field="groupName")
+    freshness.searched("jobs-group")
+    assert freshness.complete_scopes == ["jobs-group"]
+
+
+def test_roles_not_searched_are_not_complete():
+    freshness = FreshnessTracker(None)
+    freshness.page_read("python", [], 0, build_card, card_hash)
+    assert freshness.complete_scopes == []
+
+
+def stored_job(collection, job_hash: str, role: str = "python", **fields) -> None:
+    collection.insert_one({"jobHash": job_hash, "searchedRole": role, "missedRuns": 0,
+                           "lastSeenAt": datetime.now(timezone.utc) - timedelta(days=1), **fields})
+
+
+def run_once(collection, seen: list[str], roles=("python",)) -> FreshnessTracker:
+    """One run that read every role to an empty page and saw the `seen` jobs on it."""
+    freshness = FreshnessTracker(collection, expire_after_runs=2)
+    for role in roles:
+        freshness.page_read(role, [{"title": h} for h in seen], len(seen), build_card, card_hash)
+        freshness.page_read(role, [], 0, build_card, card_hash)
+        freshness.searched(role)
+    freshness.save()
+    return freshness
+
+
+def test_unseen_jobs_count_a_miss_and_expire_at_the_threshold(job_collection):
+    stored_job(job_collection, "kept")
+    stored_job(job_collection, "gone")
+
+    run_once(job_collection, ["kept"])
+    gone = job_collection.find_one({"jobHash": "gone"})
+    assert gone["missedRuns"] == 1 and "expiredAt" not in gone
+
+    run_once(job_collection, ["kept"])
+    gone = job_collection.find_one({"jobHash": "gone"})
+    assert gone["missedRuns"] == 2 and gone["expiredAt"]
+    kept = job_collection.find_one({"jobHash": "kept"})
+    assert kept["missedRuns"] == 0 and "expiredAt" not in kept
+
+
+def test_expired_job_seen_again_is_revived(job_collection):
+    stored_job(job_collection, "back", missedRuns=2, expiredAt=datetime.now(timezone.utc))
+    run_once(job_collection, ["back"])
+    back = job_collection.find_one({"jobHash": "back"})
+    assert back["missedRuns"] == 0 and "expiredAt" not in back
+
+
+def test_expired_jobs_count_no_further_misses(job_collection):
+    stored_job(job_collection, "gone", missedRuns=2, expiredAt=datetime.now(timezone.utc))
+    run_once(job_collection, [])
+    assert job_collection.find_one({"jobHash": "gone"})["missedRuns"] == 2
+
+
+def test_partial_and_unsearched_roles_count_no_misses(job_collection):
+    stored_job(job_collection, "py", role="python")
+    stored_job(job_collection, "js", role="javascript")
+    freshness = FreshnessTracker(job_collection, expire_after_runs=1)
+    freshness.page_read("python", [{"title": "x"}] * 10, 10, build_card, card_hash)
+    freshness.searched("python")  # stopped on a full page of unknown size
+    freshness.save()
+    assert [d["missedRuns"] for d in job_collection.find({}, sort=[("jobHash", 1)])] == [0, 0]
+
+
+def test_zero_threshold_never_expires(job_collection):
+    stored_job(job_collection, "gone")
+    freshness = FreshnessTracker(job_collection, expire_after_runs=0)
+    freshness.searched("python")
+    freshness.save()
+    assert job_collection.find_one({"jobHash": "gone"})["missedRuns"] == 0
+
+
+def test_window_limits_misses_to_recent_jobs(job_collection):
+    now = datetime.now(timezone.utc)
+    stored_job(job_collection, "old", role=None, group="jobs", date=now - timedelta(days=30))
+    stored_job(job_collection, "new", role=None, group="jobs", date=now - timedelta(days=1))
+    freshness = FreshnessTracker(job_collection, scope_field="group", expire_after_runs=1)
+    freshness.searched("jobs", since=now - timedelta(days=7))
+    freshness.save()
+    assert job_collection.find_one({"jobHash": "old"})["missedRuns"] == 0
+    new = job_collection.find_one({"jobHash": "new"})
+    assert new["missedRuns"] == 1 and new["expiredAt"]
@@ -0,0 +1,24 @@
+"""ImageOcr: the engine check, and OCR turning itself off when the engine is missing."""
+
+import asyncio
+import importlib.util
+
+import image_ocr
+from image_ocr import ImageOcr
+
+
+def without(monkeypatch, module: str) -> None:
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name, *args: None if name == module else find_spec(name, *args))
+
+
+def test_missing_pillow_is_reported(monkeypatch):
+    without(monkeypatch, "PIL")
+    assert image_ocr._engine_missing() == "PIL is not installed (pip install pytesseract pillow)"
+
+
+def test_missing_engine_disables_ocr(monkeypatch, tmp_path):
+    without(monkeypatch, "pytesseract")
+    ocr = ImageOcr(enabled=True, cache_dir=str(tmp_path))
+    assert not ocr.enabled
+    assert asyncio.run(ocr.text(b"image")) == ""
@@ -0,0 +1,81 @@
+"""JobRecord mapping access and its round-trip to the document bulk_upsert_jobs writes."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from job_record import FIELDS, JobRecord
+from scraper_utils import content_hash, is_valid_job, normalize_job
+
+CREATED = datetime(2026, 10, 19, 6, 30, tzinfo=timezone.utc)
+CARD = {
+    "title": "Backend Engineer",
+    "company": "Acme Labs",
+    "location": "Bengaluru",
+    "experience": "2 - 5 Yrs",
+    "salary": "8-12 Lacs p.a.",
+    "jobType": "Full Time",
+    "workMode": "Hybrid",
+    "postedDate": "3 days ago",
+    "description": "Build and run the services behind our hiring platform. " * 3,
+    "keySkills": "Python, MongoDB",
+    "apply_link": "https://example.com/jobs/backend-engineer",
+}
+
+
+def make_record(**extra) -> JobRecord:
+    return JobRecord(created=CREATED.timestamp(), **CARD, source="TimesJobs",
+                     searchedRole="Backend Developer", jobHash="0" * 32, **extra)
+
+
+def as_dict() -> dict:
+    """The plain dict a scraper built before JobRecord existed."""
+    return {**CARD, "source": "TimesJobs", "searchedRole": "Backend Developer",
+            "jobHash": "0" * 32, "createdAt": CREATED}
+
+
+def test_to_document_matches_the_job_dict():
+    document = make_record().to_document()
+    assert document == as_dict()
+    assert list(document) == [key for key in FIELDS if key in document] + ["createdAt"]
+
+
+def test_document_hashes_and_normalizes_like_the_dict():
+    document, plain = make_record().to_document(), as_dict()
+    assert content_hash(document) == content_hash(plain)
+    now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    assert normalize_job(document, now) == normalize_job(plain, now)
+
+
+def test_mapping_access():
+    record = make_record()
+    assert record["title"] == "Backend Engineer"
+    assert record.get("companyLogo") is None
+    assert record.get("companyLogo", "N/A") == "N/A"
+    assert record["createdAt"] == CREATED
+    assert "keySkills" in record
+    assert "companyLogo" not in record
+    assert "unknown" not in record
+    with pytest.raises(KeyError):
+        record["companyLogo"]
+
+
+def test_validates_like_the_dict():
+    assert is_valid_job(make_record()) == is_valid_job(as_dict())
+
+
+def test_unset_fields_are_left_out_of_the_document():
+    document = JobRecord(created=CREATED.timestamp(), title="Analyst", jobHash="1" * 32).to_document()
+    assert document == {"title": "Analyst", "jobHash": "1" * 32, "createdAt": CREATED}
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(TypeError):
+        JobRecord(salaryMin=5)
+
+
+def test_shared_values_are_interned():
+    # Built at run time, as read from pages: equal strings that are distinct objects
+    first, second = ("".join(["Acme", " Labs"]) for _ in range(2))
+    assert first is not second
+    assert JobRecord(company=first)["company"] is JobRecord(company=second)["company"]
@@ -0,0 +1,84 @@
+"""PageFingerprints: unchanged pages, and fingerprints kept only for fully collected pages."""
+
+import pytest
+
+import page_fingerprints
+from page_fingerprints import PageFingerprints, fingerprint
+
+URL = "https://www.timesjobs.com/job-search?txtKeywords=python"
+CARDS = [{"title": "Engineer", "company": "Acme"}, {"title": "Analyst", "company": "Beta"}]
+
+
+@pytest.fixture
+def store(job_collection, monkeypatch):
+    monkeypatch.setattr(page_fingerprints, "get_collection", lambda name: job_collection)
+    return job_collection
+
+
+def next_run() -> PageFingerprints:
+    return PageFingerprints("timesjobs", enabled=True)
+
+
+def test_fingerprint_depends_on_card_order():
+    assert fingerprint(CARDS) == fingerprint([dict(card) for card in CARDS])
+    assert fingerprint(CARDS) != fingerprint(CARDS[::-1])
+
+
+def test_committed_page_is_unchanged_next_run(store):
+    first = PageFingerprints("timesjobs", enabled=True)
+    assert not first.unchanged(URL, CARDS)
+    first.commit(URL)
+    first.save()
+
+    second = next_run()
+    assert second.unchanged(URL, CARDS)
+    assert not second.unchanged(URL, CARDS + [{"title": "New", "company": "Gamma"}])
+
+
+def test_page_not_committed_is_read_again(store):
+    first = PageFingerprints("timesjobs", enabled=True)
+    first.unchanged(URL, CARDS)  # a card failed: no commit()
+    first.save()
+    assert store.count_documents({}) == 0
+    assert not next_run().unchanged(URL, CARDS)
+
+
+def test_forget_drops_a_fingerprint_before_commit(store):
+    first = PageFingerprints("timesjobs", enabled=True)
+    first.unchanged(URL, CARDS)
+    first.forget(URL)
+    first.commit(URL)  # no-op after forget
+    first.save()
+    assert not next_run().unchanged(URL, CARDS)
+
+
+def test_changed_page_keeps_the_old_fingerprint_until_committed(store):
+    first = PageFingerprints("timesjobs", enabled=True)
+    first.unchanged(URL, CARDS)
+    first.commit(URL)
+    first.save()
+
+    second = next_run()
+    assert not second.unchanged(URL, CARDS[:1])
+    second.forget(URL)
+    second.save()
+    assert next_run().unchanged(URL, CARDS)
+
+
+def test_unchanged_runs_are_counted(store):
+    for _ in range(3):
+        run = PageFingerprints("timesjobs", enabled=True)
+        if not run.unchanged(URL, CARDS):
+            run.commit(URL)
+        run.save()
+    doc = store.find_one({"site": "timesjobs", "url": URL})
+    assert doc["unchangedRuns"] == 2
+    assert doc["fingerprint"] == fingerprint(CARDS)
+
+
+def test_disabled_never_skips(store):
+    first = PageFingerprints("timesjobs", enabled=True)
+    first.unchanged(URL, CARDS)
+    first.commit(URL)
+    first.save()
+    assert not PageFingerprints("timesjobs", enabled=False).unchanged(URL, CARDS)
@@ -0,0 +1,82 @@
+"""Pagination: every reason a role's walk stops, and which pages it fetched."""
+
+from datetime import datetime, timedelta, timezone
+
+from pagination import Pagination
+from scraper_utils import TimeBudget
+
+NOW = datetime.now(timezone.utc)
+
+
+def jobs(start: int, count: int, posted: datetime | None = None) -> list[dict]:
+    return [{"jobHash": f"hash-{i}", "postedDate": posted.strftime("%d %b %Y") if posted else "N/A"}
+            for i in range(start, start + count)]
+
+
+def walk(pagination: Pagination, pages: list[list[dict]], budget=None) -> list[int]:
+    """Walk `pages` (page 1 first, then empty pages); returns the page numbers fetched."""
+    fetched = []
+
+    def fetch(page: int) -> list[dict]:
+        fetched.append(page)
+        return pages[page - 1] if page <= len(pages) else []
+
+    pagination.walk(fetch, budget)
+    return fetched
+
+
+def test_stops_on_a_page_without_new_jobs():
+    pagination = Pagination(max_pages=5)
+    assert walk(pagination, [jobs(0, 10)]) == [1, 2]
+    assert pagination.stop_reason == "no new jobs on the page"
+
+
+def test_stops_on_jobs_already_collected_this_run():
+    pagination = Pagination(max_pages=5)
+    assert walk(pagination, [jobs(0, 10), jobs(5, 5), jobs(10, 10)]) == [1, 2]
+    assert pagination.stop_reason == "only known jobs"
+
+
+def test_stops_on_jobs_already_stored(job_collection):
+    job_collection.insert_many([{"jobHash": f"hash-{i}"} for i in range(10, 20)])
+    pagination = Pagination(job_collection, max_pages=5)
+    assert walk(pagination, [jobs(0, 10), jobs(10, 10), jobs(20, 10)]) == [1, 2]
+    assert pagination.stop_reason == "only known jobs"
+
+
+def test_partly_new_page_continues(job_collection):
+    job_collection.insert_many([{"jobHash": f"hash-{i}"} for i in range(10, 15)])
+    pagination = Pagination(job_collection, max_pages=3)
+    assert walk(pagination, [jobs(0, 10), jobs(10, 10), jobs(20, 10)]) == [1, 2, 3]
+
+
+def test_stops_on_jobs_older_than_the_last_run():
+    pagination = Pagination(since=NOW - timedelta(days=3), date_field="postedDate", max_pages=5)
+    pages = [jobs(0, 10, NOW), jobs(10, 10, NOW - timedelta(days=10)), jobs(20, 10, NOW)]
+    assert walk(pagination, pages) == [1, 2]
+    assert pagination.stop_reason == "only jobs older than the last run"
+
+
+def test_recent_jobs_within_the_slack_are_not_old():
+    pagination = Pagination(since=NOW - timedelta(days=3), date_field="postedDate", max_pages=2)
+    walk(pagination, [jobs(0, 10, NOW), jobs(10, 10, NOW - timedelta(days=3))])
+    assert pagination.stop_reason == "max pages reached"
+
+
+def test_stops_when_the_time_budget_is_spent():
+    budget = TimeBudget(seconds=100, reserve_sec=0)
+    pagination = Pagination(max_pages=5, page_seconds=500)
+    assert walk(pagination, [jobs(0, 10), jobs(10, 10)], budget) == [1]
+    assert pagination.stop_reason == "time budget spent"
+
+
+def test_stops_at_max_pages():
+    pagination = Pagination(max_pages=2)
+    assert walk(pagination, [jobs(0, 10), jobs(10, 10), jobs(20, 10)]) == [1, 2]
+    assert pagination.stop_reason == "max pages reached"
+
+
+def test_returns_every_job_walked():
+    pagination = Pagination(max_pages=3)
+    walked = pagination.walk(lambda page: jobs(page * 10, 2), None)
+    assert [job["jobHash"] for job in walked] == ["hash-10", "hash-11", "hash-20", "hash-21", "hash-30", "hash-31"]
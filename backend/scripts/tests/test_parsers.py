@@ -0,0 +1,85 @@
+"""Salary, experience and posted-date parsing of scraped listing text."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scraper_utils import parse_experience, parse_posted_date, parse_salary
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("3-6 Lacs p.a.", (300_000, 600_000, "INR")),
+    ("₹ 4.5 LPA", (450_000, 450_000, "INR")),
+    ("3 - 6", (300_000, 600_000, "INR")),
+    ("25k/month", (300_000, 300_000, "INR")),
+    ("10,000 per month", (120_000, 120_000, "INR")),
+    ("1.2 Cr", (12_000_000, 12_000_000, "INR")),
+    ("$90,000 - $120,000", (90_000, 120_000, "USD")),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+
+@pytest.mark.parametrize("text", ["Not disclosed", "As per industry standards", "N/A", "", None])
+def test_parse_salary_without_amount(text):
+    assert parse_salary(text) is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("0 - 3 Yrs", (0, 3)),
+    ("2+ years", (2, None)),
+    ("5 to 10 years", (5, 10)),
+    ("1 yr", (1, 1)),
+    ("Fresher", (0, 0)),
+    ("6 months - 1 year", (0.5, 1)),
+    ("3 to 6 months", (0.25, 0.5)),
+    ("6+ months", (0.5, None)),
+    ("6 months", (0.5, 0.5)),
+])
+def test_parse_experience(text, expected):
+    assert parse_experience(text) == expected
+
+
+@pytest.mark.parametrize("text", ["Any", "N/A", "", None])
+def test_parse_experience_unrecognised(text):
+    assert parse_experience(text) is None
+
+
+@pytest.mark.parametrize("text, age", [
+    ("Posted on: 5 days ago", timedelta(days=5)),
+    ("Posted 2d ago", timedelta(days=2)),
+    ("3 hours ago", timedelta(hours=3)),
+    ("1w ago", timedelta(weeks=1)),
+    ("2 months ago", timedelta(days=60)),
+    ("Today", timedelta(0)),
+    ("Just now", timedelta(0)),
+    ("Yesterday", timedelta(days=1)),
+])
+def test_parse_posted_date_relative(text, age):
+    assert parse_posted_date(text, NOW) == NOW - age
+
+
+@pytest.mark.parametrize("text", [
+    "12 Oct 2026",
+    "12 Oct, 2026",
+    "Oct 12, 2026",
+    "12/10/2026",
+    "2026-10-12",
+    "Posted on: 12 Oct 2026",
+    "Posted on : 12 Oct 2026",
+    "Posted on 12 Oct 2026",
+])
+def test_parse_posted_date_absolute(text):
+    assert parse_posted_date(text, NOW) == datetime(2026, 10, 12, tzinfo=timezone.utc)
+
+
+def test_parse_posted_date_without_year_is_never_in_the_future():
+    assert parse_posted_date("12 Oct", NOW) == datetime(2026, 10, 12, tzinfo=timezone.utc)
+    assert parse_posted_date("25 Dec", NOW) == datetime(2025, 12, 25, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("text", ["N/A", "recently", "", None])
+def test_parse_posted_date_unrecognised(text):
+    assert parse_posted_date(text, NOW) is None
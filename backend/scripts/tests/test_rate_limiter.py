@@ -0,0 +1,111 @@
+"""HostRateLimiter token refill and backoff, on a fake clock."""
+
+from types import SimpleNamespace
+
+import pytest
+
+import rate_limiter as rl
+from rate_limiter import HostRateLimiter, parse_rate_limits, retry_after
+
+
+class FakeClock:
+    """time.monotonic / time.sleep stand-in: sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def limiter(clock, limits=None, **kwargs):
+    return HostRateLimiter(limits or {"example.com": 2.0}, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def response(status: int, retry: str | None = None):
+    return SimpleNamespace(status_code=status, headers={"Retry-After": retry} if retry else {})
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("a.com=0.5, B.com = 2,bad,=1") == {"a.com": 0.5, "b.com": 2.0}
+
+
+def test_burst_then_spaced_by_rate(clock):
+    limit = limiter(clock, burst=2)
+    assert limit.acquire("https://example.com/1") == 0
+    assert limit.acquire("https://example.com/2") == 0
+    assert limit.acquire("https://example.com/3") == pytest.approx(0.5)
+    assert limit.acquire("https://example.com/4") == pytest.approx(0.5)
+    assert clock.slept == [pytest.approx(0.5), pytest.approx(0.5)]
+
+
+def test_tokens_refill_while_idle(clock):
+    limit = limiter(clock, burst=2)
+    for _ in range(2):
+        limit.acquire("https://example.com/")
+    clock.now += 1.0  # two tokens at 2 requests/second
+    assert limit.acquire("https://example.com/") == 0
+    assert limit.acquire("https://example.com/") == 0
+    assert limit.acquire("https://example.com/") == pytest.approx(0.5)
+
+
+def test_subdomains_share_the_domain_bucket(clock):
+    limit = limiter(clock, burst=1)
+    limit.acquire("https://www.example.com/")
+    assert limit.acquire("https://jobs.example.com/") == pytest.approx(0.5)
+
+
+def test_unlisted_hosts_are_unlimited(clock):
+    limit = limiter(clock, burst=1)
+    assert all(limit.acquire("https://other.org/") == 0 for _ in range(5))
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_throttled_response_pauses_the_host_and_halves_its_rate(clock, status):
+    limit = limiter(clock, burst=1)
+    pause = limit.record_response("https://example.com/", response(status))
+    assert pause == rl._BACKOFF_BASE_SEC
+    assert limit.acquire("https://example.com/") == pytest.approx(rl._BACKOFF_BASE_SEC + 1.0)
+    assert limit.acquire("https://example.com/") == pytest.approx(1.0)  # 1 request/second now
+
+
+def test_retry_after_overrides_the_backoff(clock):
+    limit = limiter(clock)
+    assert retry_after(response(429, "42")) == 42
+    assert retry_after(response(429, "Wed, 21 Oct 2026 07:28:00 GMT")) is None
+    assert limit.record_response("https://example.com/", response(429, "42")) == 42
+
+
+def test_backoff_doubles_per_strike_up_to_the_cap(clock):
+    limit = limiter(clock)
+    pauses = [limit.penalize("https://example.com/") for _ in range(10)]
+    assert pauses[:3] == [rl._BACKOFF_BASE_SEC * 2 ** i for i in range(3)]
+    assert max(pauses) == rl._BACKOFF_MAX_SEC
+
+
+def test_successes_restore_the_rate(clock):
+    limit = limiter(clock)
+    limit.penalize("https://example.com/")
+    bucket = limit._buckets["example.com"]
+    assert bucket.rate == 1.0
+    for _ in range(5):
+        limit.record_response("https://example.com/", response(200))
+    assert bucket.rate == pytest.approx(2.0)
+    assert bucket.strikes == 0
+
+
+def test_unlimited_host_is_still_backed_off(clock):
+    limit = limiter(clock)
+    limit.record_response("https://other.org/", response(503))
+    assert limit.acquire("https://other.org/") == rl._BACKOFF_BASE_SEC
+    assert limit.acquire("https://other.org/") == 0
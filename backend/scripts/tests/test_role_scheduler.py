@@ -0,0 +1,85 @@
+"""RoleScheduler: EWMA-ordered plans, low-yield exploration, and the one-write save."""
+
+import pytest
+
+import role_scheduler
+from role_scheduler import EXPLORE_EVERY_N_RUNS, RoleScheduler, _ewma
+
+ROLES = ["python", "java", "golang", "rust"]
+
+
+@pytest.fixture
+def history(job_collection, monkeypatch):
+    monkeypatch.setattr(role_scheduler, "get_collection", lambda name: job_collection)
+    return job_collection
+
+
+def stats(history, role: str, **fields) -> None:
+    history.insert_one({"site": "timesjobs", "role": role, **fields})
+
+
+def run(roles=ROLES, inserts=None) -> list[str]:
+    """One run that searches every planned role and inserts `inserts` jobs per role; returns the plan."""
+    scheduler = RoleScheduler("timesjobs", roles, enabled=True)
+    planned = scheduler.plan()
+    for role in planned:
+        scheduler.start_role(role)
+    scheduler.finish()
+    scheduler.record_inserts(inserts or {})
+    scheduler.save()
+    return planned
+
+
+def test_ewma_seeds_with_the_first_sample():
+    assert _ewma(None, 4) == 4.0
+    assert _ewma(10.0, 0, alpha=0.3) == pytest.approx(7.0)
+
+
+def test_plan_orders_roles_by_expected_yield(history):
+    stats(history, "python", ewmaInserted=2.0)
+    stats(history, "java", ewmaInserted=9.0)
+    stats(history, "golang", ewmaInserted=5.0)
+    # "rust" has no history: tried first
+    assert RoleScheduler("timesjobs", ROLES, enabled=True).plan() == ["rust", "java", "golang", "python"]
+
+
+def test_yield_moves_a_role_up_the_plan(history):
+    stats(history, "python", ewmaInserted=1.0)
+    stats(history, "java", ewmaInserted=3.0)
+    run(["python", "java"], inserts={"python": 20})
+    assert history.find_one({"role": "python"})["ewmaInserted"] == pytest.approx(0.3 * 20 + 0.7 * 1.0)
+    assert RoleScheduler("timesjobs", ["python", "java"], enabled=True).plan() == ["python", "java"]
+
+
+def test_low_yield_role_is_explored_every_n_runs(history):
+    stats(history, "python", ewmaInserted=0.0)
+    stats(history, "java", ewmaInserted=3.0)
+    planned = [run(["python", "java"]) for _ in range(EXPLORE_EVERY_N_RUNS + 1)]
+    # Skipped N - 1 times, searched on the N-th run, then skipped again
+    assert [("python" in roles) for roles in planned] == [False] * (EXPLORE_EVERY_N_RUNS - 1) + [True, False]
+    assert history.find_one({"role": "python"})["skippedRuns"] == 1
+
+
+def test_plan_fits_the_time_budget(history):
+    for role in ROLES:
+        stats(history, role, ewmaInserted=1.0, ewmaSeconds=100.0)
+    scheduler = RoleScheduler("timesjobs", ROLES, enabled=True)
+    assert len(scheduler.plan(time_budget_sec=250)) == 2
+    assert len(scheduler.skipped) == 2
+
+
+def test_save_is_one_bulk_write(history):
+    stats(history, "python", ewmaInserted=0.0)
+    writes = history.bulk_writes
+    run(inserts={"java": 3})
+    assert history.bulk_writes == writes + 1
+    assert history.find_one({"role": "java"})["lastInserted"] == 3
+    assert history.find_one({"role": "java"})["runs"] == 1
+    assert history.find_one({"role": "python"})["skippedRuns"] == 1
+
+
+def test_disabled_plans_every_role_in_order(history):
+    scheduler = RoleScheduler("timesjobs", ROLES, enabled=False)
+    assert scheduler.plan() == ROLES
+    scheduler.save()
+    assert history.count_documents({}) == 0
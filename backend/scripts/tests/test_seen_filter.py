@@ -0,0 +1,74 @@
+"""BloomFilter membership, persistence and file validation."""
+
+import hashlib
+
+import pytest
+
+from seen_filter import BloomFilter
+
+
+def job_hashes(start: int, stop: int) -> list[str]:
+    return [hashlib.md5(f"job-{i}".encode()).hexdigest() for i in range(start, stop)]
+
+
+def test_no_false_negatives(tmp_path):
+    built, added = job_hashes(0, 2000), job_hashes(2000, 3000)
+    bloom = BloomFilter.build(str(tmp_path / "jobs.bloom"), built, capacity=5000)
+    assert bloom.update(added) == len(added)
+    assert all(h in bloom for h in built + added)
+    bloom.close()
+
+
+def test_false_positive_rate_is_near_the_target(tmp_path):
+    bloom = BloomFilter.build(str(tmp_path / "jobs.bloom"), job_hashes(0, 5000), capacity=5000, fp_rate=0.01)
+    false_positives = sum(h in bloom for h in job_hashes(5000, 15000))
+    assert false_positives < 300  # 1% of 10,000 expected
+    bloom.close()
+
+
+def test_persists_across_reopen(tmp_path):
+    path = str(tmp_path / "jobs.bloom")
+    bloom = BloomFilter.build(path, job_hashes(0, 100), capacity=1000)
+    bloom.update(job_hashes(100, 150))
+    bloom.flush()
+    bloom.close()
+
+    reopened = BloomFilter.open(path)
+    assert reopened.count == 150
+    assert all(h in reopened for h in job_hashes(0, 150))
+    reopened.close()
+
+
+def test_non_hex_keys_are_hashed(tmp_path):
+    bloom = BloomFilter.build(str(tmp_path / "jobs.bloom"), ["not-a-digest"], capacity=100)
+    assert "not-a-digest" in bloom
+    bloom.close()
+
+
+def test_repeated_keys_are_not_counted_again(tmp_path):
+    bloom = BloomFilter.build(str(tmp_path / "jobs.bloom"), [], capacity=100)
+    assert bloom.update(job_hashes(0, 10)) == 10
+    assert bloom.update(job_hashes(0, 10)) == 0
+    assert bloom.count == 10
+    bloom.close()
+
+
+def test_full_once_past_capacity(tmp_path):
+    bloom = BloomFilter.build(str(tmp_path / "jobs.bloom"), job_hashes(0, 10), capacity=10)
+    assert not bloom.full
+    bloom.update(job_hashes(10, 11))
+    assert bloom.full
+    bloom.close()
+
+
+def test_open_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        BloomFilter.open(str(tmp_path / "missing.bloom"))
+
+
+@pytest.mark.parametrize("content", [b"JHBF", b"x" * 64])
+def test_open_rejects_other_files(tmp_path, content):
+    path = tmp_path / "jobs.bloom"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        BloomFilter.open(str(path))
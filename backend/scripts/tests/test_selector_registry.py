@@ -0,0 +1,102 @@
+"""SelectorRegistry: fallback order, promotion of last run's winner, and hit-rate alerts."""
+
+import pytest
+
+import selector_registry
+from selector_registry import MIN_LOOKUPS, SelectorRegistry
+
+TITLE_SELECTORS = ["h2.title", ".job-title", "h3"]
+
+
+@pytest.fixture
+def history(job_collection, monkeypatch):
+    monkeypatch.setattr(selector_registry, "get_collection", lambda name: job_collection)
+    return job_collection
+
+
+def first_match(card: dict, selectors: list[str]) -> str | None:
+    """The scrapers' fallback loop: the first selector the card has a value for."""
+    return next((sel for sel in selectors if card.get(sel)), None)
+
+
+def scrape(registry: SelectorRegistry, cards: list[dict], field: str = "title") -> list[str | None]:
+    order = registry.order(field, TITLE_SELECTORS)
+    matched = [first_match(card, order) for card in cards]
+    for selector in matched:
+        registry.record(field, selector)
+    return matched
+
+
+def test_code_order_without_history(history):
+    assert SelectorRegistry("instahyre", enabled=True).order("title", TITLE_SELECTORS) == TITLE_SELECTORS
+
+
+def test_fallback_selector_matches_when_the_first_fails(history):
+    registry = SelectorRegistry("instahyre", enabled=True)
+    assert scrape(registry, [{".job-title": "Engineer"}, {"h3": "Analyst"}, {}]) == [".job-title", "h3", None]
+    assert registry.hit_rate("title") == pytest.approx(2 / 3)
+
+
+def test_last_runs_winner_is_tried_first(history):
+    first = SelectorRegistry("instahyre", enabled=True)
+    scrape(first, [{"h3": "Engineer"}] * 3 + [{".job-title": "Analyst"}])
+    first.save()
+
+    doc = history.find_one({"site": "instahyre", "field": "title"})
+    assert doc["winner"] == "h3"
+    assert doc["lastWinners"] == [{"selector": "h3", "hits": 3}, {"selector": ".job-title", "hits": 1}]
+    assert SelectorRegistry("instahyre", enabled=True).order("title", TITLE_SELECTORS) == ["h3", "h2.title", ".job-title"]
+
+
+def test_promotion_follows_a_layout_change(history):
+    for card in ({"h2.title": "Engineer"}, {".job-title": "Engineer"}):
+        registry = SelectorRegistry("instahyre", enabled=True)
+        scrape(registry, [card] * 5)
+        registry.save()
+    assert SelectorRegistry("instahyre", enabled=True).order("title", TITLE_SELECTORS)[0] == ".job-title"
+
+
+def test_winner_no_longer_in_code_is_ignored(history):
+    history.insert_one({"site": "instahyre", "field": "title", "winner": "div.removed"})
+    assert SelectorRegistry("instahyre", enabled=True).order("title", TITLE_SELECTORS) == TITLE_SELECTORS
+
+
+def test_run_without_hits_keeps_the_previous_winner(history):
+    history.insert_one({"site": "instahyre", "field": "title", "winner": "h3", "ewmaHitRate": 1.0})
+    registry = SelectorRegistry("instahyre", enabled=True)
+    scrape(registry, [{}] * MIN_LOOKUPS)
+    registry.save()
+    doc = history.find_one({"site": "instahyre", "field": "title"})
+    assert doc["winner"] == "h3"
+    assert doc["ewmaHitRate"] == pytest.approx(0.7)
+
+
+def test_alert_when_hit_rate_drops_below_the_usual_rate(history):
+    history.insert_one({"site": "instahyre", "field": "title", "ewmaHitRate": 0.9})
+    registry = SelectorRegistry("instahyre", enabled=True)
+    scrape(registry, [{"h3": "Engineer"}] * 4 + [{}] * 6)
+    assert len(registry.alerts()) == 1
+
+
+def test_no_alert_for_a_small_drop_or_few_lookups(history):
+    history.insert_one({"site": "instahyre", "field": "title", "ewmaHitRate": 0.9})
+    registry = SelectorRegistry("instahyre", enabled=True)
+    scrape(registry, [{"h3": "Engineer"}] * 8 + [{}] * 2)
+    scrape(registry, [{}] * (MIN_LOOKUPS - 1), field="company")
+    assert registry.alerts() == []
+
+
+def test_alert_without_history_only_when_nothing_matched(history):
+    registry = SelectorRegistry("instahyre", enabled=True)
+    scrape(registry, [{}] * MIN_LOOKUPS)
+    scrape(registry, [{"h3": "Engineer"}] + [{}] * MIN_LOOKUPS, field="company")
+    assert [alert.split(":")[0] for alert in registry.alerts()] == ["instahyre.title"]
+
+
+def test_disabled_keeps_code_order_and_records_nothing(history):
+    history.insert_one({"site": "instahyre", "field": "title", "winner": "h3"})
+    registry = SelectorRegistry("instahyre", enabled=False)
+    assert registry.order("title", TITLE_SELECTORS) == TITLE_SELECTORS
+    scrape(registry, [{"h3": "Engineer"}])
+    registry.save()
+    assert history.count_documents({}) == 1
@@ -0,0 +1,105 @@
+"""is_valid_job: web card/detail phases, Telegram rules, and the per-rule counters."""
+
+import pytest
+
+from scraper_utils import filter_jobs, is_valid_job, scoped_metrics
+
+
+def web_job(**fields) -> dict:
+    return {"title": "Senior Python Developer", "company": "Acme Corp", "location": "Pune",
+            "keySkills": "python, django", "description": "Build and run the data pipelines of the platform.",
+            **fields}
+
+
+def telegram_post(**fields) -> dict:
+    return {"title": "Acme is hiring backend engineers", "company": "Acme",
+            "text": "Acme is hiring backend engineers for the 2025 batch. Apply before Friday.",
+            "apply_link": "https://careers.acme.example/jobs/42", **fields}
+
+
+@pytest.fixture
+def run_metrics():
+    with scoped_metrics("test") as scoped:
+        yield scoped
+
+
+def test_complete_web_job_passes_every_phase(run_metrics):
+    assert is_valid_job(web_job()) == (True, "")
+    assert is_valid_job(web_job(), phase="card") == (True, "")
+    assert is_valid_job(web_job(), phase="detail") == (True, "")
+
+
+@pytest.mark.parametrize("fields, reason", [
+    ({"keySkills": "N/A"}, "no skills listed"),
+    ({"description": "Too short"}, "description too short (9 chars)"),
+])
+def test_card_phase_accepts_what_the_detail_phase_rejects(run_metrics, fields, reason):
+    job = web_job(**fields)
+    assert is_valid_job(job, phase="card") == (True, "")
+    assert is_valid_job(job, phase="detail") == (False, reason)
+    assert is_valid_job(job) == (False, reason)
+
+
+@pytest.mark.parametrize("fields, reason", [
+    ({"title": "N/A"}, "missing title"),
+    ({"title": "Dev"}, "title length out of range (3)"),
+    ({"title": "x" * 201}, "title length out of range (201)"),
+    ({"title": "https://example.com/job"}, "title looks like email or URL"),
+    ({"company": "hr@acme.example"}, "company field contains email address"),
+    ({"company": "Not disclosed"}, "missing company"),
+    ({"location": ""}, "missing location"),
+])
+def test_card_rules_reject_before_any_detail_page(run_metrics, fields, reason):
+    assert is_valid_job(web_job(keySkills="N/A", **fields), phase="card") == (False, reason)
+
+
+def test_detail_phase_skips_the_card_rules(run_metrics):
+    assert is_valid_job(web_job(title="N/A"), phase="detail") == (True, "")
+
+
+@pytest.mark.parametrize("fields, reason", [
+    ({"title": "", "company": ""}, "no title or company"),
+    ({"text": "Apply now"}, "text too short (9 chars)"),
+    ({"text": "Acme is hiring! Join our group for more updates every single day."}, "spam content detected"),
+    ({"apply_link": "https://www.naukri.com/job/42"}, "missing or invalid apply link"),
+])
+def test_telegram_rules(run_metrics, fields, reason):
+    assert is_valid_job(telegram_post(), source="telegram") == (True, "")
+    assert is_valid_job(telegram_post(**fields), source="telegram") == (False, reason)
+
+
+def test_rule_counters_stop_at_the_first_rejection(run_metrics):
+    is_valid_job(web_job())
+    is_valid_job(web_job(company="N/A"))
+    rules = run_metrics.validation_summary()["web"]
+
+    assert rules["prepare fields"]["checked"] == 2
+    assert rules["missing title"] == {**rules["missing title"], "checked": 2, "rejected": 0}
+    assert rules["missing company"]["checked"] == 2
+    assert rules["missing company"]["rejected"] == 1
+    assert rules["missing company"]["rejectRate"] == 0.5
+    # The rejected job never reached the later rules
+    assert rules["missing location"]["checked"] == 1
+    assert rules["short description"]["checked"] == 1
+
+
+def test_rule_counters_are_kept_per_source(run_metrics):
+    is_valid_job(web_job())
+    is_valid_job(telegram_post(apply_link=""), source="telegram")
+    summary = run_metrics.validation_summary()
+    assert "invalid apply link" not in summary["web"]
+    assert summary["telegram"]["invalid apply link"]["rejected"] == 1
+
+
+def test_phase_counters_only_cover_the_rules_run(run_metrics):
+    is_valid_job(web_job(), phase="card")
+    rules = run_metrics.validation_summary()["web"]
+    assert "missing location" in rules
+    assert "no skills" not in rules
+
+
+def test_filter_jobs_counts_valid_and_rejected(run_metrics):
+    valid, rejected = filter_jobs([web_job(), web_job(keySkills=""), web_job(location="-")])
+    assert (len(valid), rejected) == (1, 2)
+    assert run_metrics.counters["jobs_valid"] == 1
+    assert run_metrics.counters["jobs_rejected"] == 2
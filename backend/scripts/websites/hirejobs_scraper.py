@@ -1,37 +1,71 @@
 import sys
 import os
-import time
 import urllib.parse
-from datetime import datetime, timezone
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
 sys.stdout.reconfigure(encoding="utf-8")
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
-from scraper_utils import get_collection, generate_job_hash, bulk_upsert_jobs, upload_image_from_url, filter_jobs
+from scraper_utils import get_collection, generate_job_hash, upload_image_from_url, save_jobs, is_valid_job, TimeBudget, metrics, EXTRACTION_MODE
 from job_roles import JOB_ROLES
+from job_record import JobRecord
+from role_scheduler import RoleScheduler
+from pagination import Pagination
+from page_fingerprints import PageFingerprints
+from freshness import FreshnessTracker
+from browser import new_driver
+from browser_pool import BrowserPool, load_page, wait_for_css
+from page_cache import PageCacheMiss, remember_page
+
+BASE_URL = os.getenv("HIREJOBS_BASE_URL", "https://www.hirejobs.in")
+# Cards collected per result page (all of them are still read, so the rest count as seen)
+MAX_CARDS_PER_PAGE = 20
+# Card field with the posted date, used to stop paginating at listings older than the last run
+DATE_FIELD = "postedDate"
+
+# Rough cost of one detail page (load + sleeps + logo upload), used by the time budget
+DETAIL_PAGE_SECONDS = 10
+
+# Reads the raw fields of every search-result card in one round-trip; mirrors read_card_fields()
+CARDS_JS = """
+const text = (el) => (el ? (el.innerText || "").trim() : "");
+const byClass = (card, substring) => {
+    for (const div of card.querySelectorAll("div")) {
+        if ((div.getAttribute("class") || "").includes(substring)) {
+            const value = text(div);
+            if (value) return value;
+        }
+    }
+    return "N/A";
+};
+const cards = document.querySelectorAll("div.bg-card");
+return {
+    total: cards.length,
+    cards: Array.from(cards).map((card) => {
+        const inline = card.querySelectorAll("div.inline-flex.items-center");
+        const link = card.querySelector("a");
+        return {
+            title: text(card.querySelector("h3")) || "N/A",
+            company: byClass(card, "text-sm font-medium"),
+            location: byClass(card, "text-sm text-gray-600"),
+            salary: byClass(card, "font-bold sm:text-base"),
+            postedDate: byClass(card, "bg-white/80"),
+            jobType: inline.length >= 1 ? text(inline[0]) : "N/A",
+            workMode: inline.length >= 2 ? text(inline[1]) : "N/A",
+            experience: inline.length >= 3 ? text(inline[2]) : "N/A",
+            href: link ? (link.getAttribute("href") ? link.href : "N/A") : "N/A",
+        };
+    }),
+};
+"""
+
 
 # ── Chrome setup ──────────────────────────────────────────────────────────────
-options = webdriver.ChromeOptions()
-options.add_argument("--headless")
-options.add_argument("--disable-gpu")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-options.add_argument("--window-size=1920,1080")
-options.add_argument(
-    "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-)
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-collection = get_collection("hirejobs")
-all_jobs_data = []
+def create_driver():
+    # Images stay enabled: scrape_logo_url() relies on the rendered logo size
+    return new_driver(block_images=False)
+
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
@@ -86,10 +120,12 @@ def scrape_logo_url(detail_driver) -> str | None:
     return None
 
 
-def extract_job_details(detail_url: str) -> dict:
+def extract_job_details(driver, detail_url: str) -> dict:
     try:
-        driver.get(detail_url)
-        time.sleep(3)
+        from_cache = load_page(driver, detail_url)
+        if not from_cache:
+            metrics.sleep(3)
+        remember_page(driver, detail_url, from_cache)
         details = {}
 
         # Full job description
@@ -153,6 +189,7 @@ def extract_job_details(detail_url: str) -> dict:
     except Exception as e:
         print(f"    Error on detail page: {e}")
         return {
+            "error": str(e),
             "fullDescription": "N/A",
             "keySkills": "N/A",
             "domain": "N/A",
@@ -161,128 +198,282 @@ def extract_job_details(detail_url: str) -> dict:
         }
 
 
-# ── Main scrape loop ──────────────────────────────────────────────────────────
-print("\n" + "=" * 80)
-print(f"Starting HireJobs Scraper for {len(JOB_ROLES)} job roles")
-print("=" * 80 + "\n")
-
-for role_index, job_role in enumerate(JOB_ROLES, 1):
-    print(f"\n[{role_index}/{len(JOB_ROLES)}] Searching for: {job_role}")
-    print("-" * 80)
-
-    keyword_encoded = urllib.parse.quote(job_role)
-    url = f"https://www.hirejobs.in/jobs?q={keyword_encoded}"
-    driver.get(url)
-    time.sleep(5)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(2)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    time.sleep(1)
+def search_url(job_role: str, page: int = 1) -> str:
+    url = f"{BASE_URL}/jobs?q={urllib.parse.quote(job_role)}"
+    return f"{url}&page={page}" if page > 1 else url
+
+
+def read_card_fields(job) -> dict:
+    """Read the raw listing fields of one card element (one WebDriver round-trip per lookup)."""
+    job_title = safe_extract(job, By.TAG_NAME, "h3")
+    company_name = safe_extract_by_class(job, "text-sm font-medium")
+    job_location = safe_extract_by_class(job, "text-sm text-gray-600")
+    salary = safe_extract_by_class(job, "font-bold sm:text-base") or safe_extract_by_class(job, "font-bold")
+    posted_date = safe_extract_by_class(job, "bg-white/80")
+
+    experience = "N/A"
+    job_type = "N/A"
+    work_mode = "N/A"
+    try:
+        inline_divs = job.find_elements(By.CSS_SELECTOR, "div.inline-flex.items-center")
+        if inline_divs:
+            job_type = inline_divs[0].text.strip() if len(inline_divs) >= 1 else "N/A"
+            work_mode = inline_divs[1].text.strip() if len(inline_divs) >= 2 else "N/A"
+            experience = inline_divs[2].text.strip() if len(inline_divs) >= 3 else "N/A"
+    except Exception:
+        pass
+
+    return {
+        "title": job_title,
+        "company": company_name,
+        "location": job_location,
+        "salary": salary,
+        "postedDate": posted_date,
+        "jobType": job_type,
+        "workMode": work_mode,
+        "experience": experience,
+        "href": safe_extract(job, By.TAG_NAME, "a", "href"),
+    }
+
+
+def read_cards(driver, extraction_mode: str = EXTRACTION_MODE) -> tuple[int, list[dict | None]]:
+    """
+    Return (cards on the page, raw fields of every card).
+    "js" mode reads everything with one execute_script call; "webdriver" mode walks
+    each card element. A None entry marks a card that could not be read.
+    """
+    if extraction_mode == "js":
+        result = driver.execute_script(CARDS_JS)
+        return result["total"], result["cards"]
+
+    jobs_container = driver.find_elements(By.CSS_SELECTOR, "div.bg-card")
+    fields = []
+    for i, job in enumerate(jobs_container, 1):
+        try:
+            fields.append(read_card_fields(job))
+        except Exception as e:
+            print(f"  {i}. Error: {e}")
+            fields.append(None)
+    return len(jobs_container), fields
+
+
+def build_card(fields: dict) -> dict | None:
+    """Turn raw card fields into listing data; None if the card has no title or link."""
+    apply_link = fields.get("href") or "N/A"
+    if apply_link != "N/A" and not apply_link.startswith("http"):
+        detail_url = BASE_URL + apply_link
+    else:
+        detail_url = apply_link
+
+    job_title = fields.get("title")
+    if not job_title or job_title == "N/A" or detail_url == "N/A":
+        return None
+
+    return {
+        "title": job_title,
+        "company": fields.get("company", "N/A"),
+        "location": fields.get("location", "N/A"),
+        "experience": fields.get("experience", "N/A"),
+        "salary": fields.get("salary", "N/A"),
+        "jobType": fields.get("jobType", "N/A"),
+        "workMode": fields.get("workMode", "N/A"),
+        "postedDate": fields.get("postedDate", "N/A"),
+        "apply_link": detail_url,
+    }
+
+
+def card_hash(card: dict) -> str:
+    return generate_job_hash(card["title"], card["company"], card["location"])
+
+
+def scrape_role(driver, job_role: str, budget: TimeBudget | None = None,
+                extraction_mode: str = EXTRACTION_MODE, pagination: Pagination | None = None,
+                fingerprints: PageFingerprints | None = None,
+                freshness: FreshnessTracker | None = None) -> list[JobRecord]:
+    """Search one role across result pages and return the job dicts collected for it."""
+    pagination = pagination or Pagination(date_field=DATE_FIELD)
+
+    def fetch(page: int) -> list[JobRecord]:
+        return scrape_page(driver, job_role, page, budget, extraction_mode, fingerprints, freshness)
+
+    return pagination.walk(fetch, budget)
+
+
+def scrape_page(driver, job_role: str, page: int = 1, budget: TimeBudget | None = None,
+                extraction_mode: str = EXTRACTION_MODE,
+                fingerprints: PageFingerprints | None = None,
+                freshness: FreshnessTracker | None = None) -> list[JobRecord]:
+    """Load one result page of a role and return the job dicts collected from it."""
+    budget = budget or TimeBudget()
+    role_jobs = []
+
+    url = search_url(job_role, page)
+    from_cache = load_page(driver, url)
+    if not from_cache:
+        metrics.sleep(5)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        metrics.sleep(2)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
+        metrics.sleep(1)
 
     try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.bg-card"))
-        )
+        with metrics.timer("wait"):
+            wait_for_css(driver, "div.bg-card", 15)
         print(f"  Job listings loaded for '{job_role}'")
     except TimeoutException:
         print(f"  Timeout for '{job_role}' — skipping.")
-        continue
-
-    jobs_container = driver.find_elements(By.CSS_SELECTOR, "div.bg-card")
-    if not jobs_container:
+        if freshness is not None:
+            freshness.partial(job_role)
+        return role_jobs
+    remember_page(driver, url, from_cache)
+
+    # Read every card before navigating away: detail pages make the card elements stale
+    with metrics.timer("extract_cards"):
+        total, raw_cards = read_cards(driver, extraction_mode)
+    if freshness is not None:
+        # Every listing on a walked page is still live, collected below or not
+        freshness.page_read(job_role, raw_cards, total, build_card, card_hash)
+    if not total:
         print(f"  No jobs found for '{job_role}'")
-        continue
-
-    print(f"  Found {len(jobs_container)} cards\n")
+        return role_jobs
+
+    print(f"  Found {total} cards\n")
+    metrics.incr("cards_seen", total)
+    if fingerprints is not None and fingerprints.unchanged(url, raw_cards):
+        print(f"  ≡ Page {page} unchanged since the last run — skipping")
+        return role_jobs
+
+    cards = []
+    for i, fields in enumerate(raw_cards[:MAX_CARDS_PER_PAGE], 1):
+        if fields is None:
+            if fingerprints is not None:
+                fingerprints.forget(url)  # unreadable card: read the page again next run
+            continue
+        card = build_card(fields)
+        if card is None:
+            print(f"  {i}. [SKIPPED] Missing title or link")
+            continue
+        # Card-level checks first: a rejected card costs no detail page or logo upload
+        ok, reason = is_valid_job(card, source="web", phase="card")
+        if not ok:
+            print(f"  {i}. ✗ Rejected [{reason}]: {card['title'][:40]}")
+            metrics.incr("cards_rejected")
+            continue
+        cards.append((i, card))
 
-    for i, job in enumerate(jobs_container[:20], 1):
+    for i, card in cards:
         try:
-            job_title = safe_extract(job, By.TAG_NAME, "h3")
-            company_name = safe_extract_by_class(job, "text-sm font-medium")
-            job_location = safe_extract_by_class(job, "text-sm text-gray-600")
-            salary = safe_extract_by_class(job, "font-bold sm:text-base") or safe_extract_by_class(job, "font-bold")
-            posted_date = safe_extract_by_class(job, "bg-white/80")
-
-            experience = "N/A"
-            job_type = "N/A"
-            work_mode = "N/A"
-            try:
-                inline_divs = job.find_elements(By.CSS_SELECTOR, "div.inline-flex.items-center")
-                if inline_divs:
-                    job_type = inline_divs[0].text.strip() if len(inline_divs) >= 1 else "N/A"
-                    work_mode = inline_divs[1].text.strip() if len(inline_divs) >= 2 else "N/A"
-                    experience = inline_divs[2].text.strip() if len(inline_divs) >= 3 else "N/A"
-            except Exception:
-                pass
-
-            apply_link = safe_extract(job, By.TAG_NAME, "a", "href")
-            if apply_link != "N/A" and not apply_link.startswith("http"):
-                detail_url = "https://www.hirejobs.in" + apply_link
-            else:
-                detail_url = apply_link
-
-            if not job_title or job_title == "N/A" or detail_url == "N/A":
-                print(f"  {i}. [SKIPPED] Missing title or link")
-                continue
-
-            job_hash = generate_job_hash(job_title, company_name, job_location)
-
-            print(f"  {i}. {job_title} @ {company_name}")
-            job_details = extract_job_details(detail_url)
-
-            driver.back()
-            time.sleep(2)
-
-            job_data = {
-                "title": job_title,
-                "company": company_name,
-                "companyLogo": job_details.get("companyLogo"),
-                "location": job_location,
-                "experience": experience,
-                "salary": salary,
-                "jobType": job_type,
-                "workMode": work_mode,
-                "postedDate": posted_date,
-                "description": job_details.get("fullDescription", "N/A"),
-                "keySkills": job_details.get("keySkills", "N/A"),
-                "domain": job_details.get("domain", "N/A"),
-                "apply_link": detail_url,
-                "actualApplyLink": job_details.get("actualApplyLink", "N/A"),
-                "source": "HireJobs",
-                "searchedRole": job_role,
-                "jobHash": job_hash,
-                "createdAt": datetime.now(timezone.utc),
-            }
-            all_jobs_data.append(job_data)
-            print(f"     ✓ Logo: {'✅ CDN' if job_data['companyLogo'] else '❌ None'} | {job_location} | {experience}")
+            if not budget.can_start(DETAIL_PAGE_SECONDS):
+                print(f"  ⏱  Time budget nearly spent — no more detail pages for '{job_role}'.")
+                if fingerprints is not None:
+                    fingerprints.forget(url)
+                break
+
+            print(f"  {i}. {card['title']} @ {card['company']}")
+            with metrics.timer("detail_page"):
+                job_details = extract_job_details(driver, card["apply_link"])
+            if "error" in job_details and fingerprints is not None:
+                fingerprints.forget(url)  # fetch the failed detail page again next run
+
+            job_data = JobRecord(
+                title=card["title"],
+                company=card["company"],
+                companyLogo=job_details.get("companyLogo"),
+                location=card["location"],
+                experience=card["experience"],
+                salary=card["salary"],
+                jobType=card["jobType"],
+                workMode=card["workMode"],
+                postedDate=card["postedDate"],
+                description=job_details.get("fullDescription", "N/A"),
+                keySkills=job_details.get("keySkills", "N/A"),
+                domain=job_details.get("domain", "N/A"),
+                apply_link=card["apply_link"],
+                actualApplyLink=job_details.get("actualApplyLink", "N/A"),
+                source="HireJobs",
+                searchedRole=job_role,
+                jobHash=card_hash(card),
+            )
+            role_jobs.append(job_data)
+            metrics.incr("jobs_collected")
+            print(f"     ✓ Logo: {'✅ CDN' if job_data['companyLogo'] else '❌ None'} | {card['location']} | {card['experience']}")
 
         except Exception as e:
             print(f"  {i}. Error: {e}")
-            try:
-                driver.get(url)
-                time.sleep(2)
-            except Exception:
-                pass
-
-    role_count = sum(1 for j in all_jobs_data if j.get("searchedRole") == job_role)
-    print(f"\n  Collected {role_count} jobs for '{job_role}'")
-
-driver.quit()
-
-# ── Save to MongoDB ───────────────────────────────────────────────────────────
-print("\n" + "=" * 80)
-print("SCRAPING COMPLETE")
-print("=" * 80)
-print(f"Total collected: {len(all_jobs_data)}")
-
-if all_jobs_data:
-    print(f"\n🔍  Running quality filter on {len(all_jobs_data)} collected jobs…")
-    valid_jobs, rejected = filter_jobs(all_jobs_data, source="web")
-    print(f"   ✓ Passed: {len(valid_jobs)}  |  ✗ Rejected: {rejected}")
-    if valid_jobs:
-        inserted, dupes = bulk_upsert_jobs(collection, valid_jobs)
-        print(f"   ✓ Inserted: {inserted} new  |  Duplicates skipped: {dupes}")
-else:
-    print("⚠ No jobs collected.")
-
-print("=" * 80 + "\n")
+            if fingerprints is not None:
+                fingerprints.forget(url)
+
+    if fingerprints is not None:
+        fingerprints.commit(url)
+    return role_jobs
+
+
+# ── Main scrape loop ──────────────────────────────────────────────────────────
+def run(collection=None, budget: TimeBudget | None = None) -> dict:
+    """Scrape the planned roles into MongoDB; returns the save counts (see save_jobs)."""
+    collection = collection if collection is not None else get_collection("hirejobs")
+    all_jobs_data = []
+
+    print("\n" + "=" * 80)
+    print(f"Starting HireJobs Scraper for {len(JOB_ROLES)} job roles")
+    print("=" * 80 + "\n")
+
+    scheduler = RoleScheduler("hirejobs", JOB_ROLES)
+    budget = budget or TimeBudget.from_env()
+    fingerprints = PageFingerprints("hirejobs")
+    freshness = FreshnessTracker(collection)
+    pool = BrowserPool(create_driver)
+    pool.warm()  # Chrome starts while the role plan is loaded
+    planned_roles = scheduler.plan(time_budget_sec=budget.remaining)
+
+    for role_index, job_role in enumerate(planned_roles, 1):
+        if not budget.can_start(scheduler.expected_seconds(job_role)):
+            print(f"\n⏱  Time budget nearly spent ({budget.describe()}) — not starting '{job_role}'.")
+            break
+        scheduler.start_role(job_role)
+        print(f"\n[{role_index}/{len(planned_roles)}] Searching for: {job_role}")
+        print("-" * 80)
+
+        try:
+            with pool.lease() as driver:
+                pagination = Pagination(collection, since=scheduler.last_searched_at(job_role),
+                                        date_field=DATE_FIELD)
+                role_jobs = scrape_role(driver, job_role, budget, pagination=pagination,
+                                        fingerprints=fingerprints, freshness=freshness)
+        except WebDriverException as e:
+            print(f"  Browser error for '{job_role}': {e.msg}")
+            continue
+        except PageCacheMiss as e:
+            print(f"  Not in the page cache: {e}")
+            continue
+        freshness.searched(job_role)
+        all_jobs_data.extend(role_jobs)
+        print(f"\n  Collected {len(role_jobs)} jobs for '{job_role}' ({budget.describe()})")
+
+    scheduler.finish()
+    pool.close()
+
+    # ── Save to MongoDB ───────────────────────────────────────────────────────
+    print("\n" + "=" * 80)
+    print("SCRAPING COMPLETE")
+    print("=" * 80)
+    print(f"Total collected: {len(all_jobs_data)}")
+    if not budget.can_start():
+        print(f"⏱  Partial run — time budget reached ({budget.describe()}); saving what was collected.")
+
+    counts = save_jobs(collection, all_jobs_data, scheduler, phase="detail")  # card checks ran in scrape_page
+
+    freshness.save()
+    scheduler.save()
+    fingerprints.save()
+    print("=" * 80 + "\n")
+    return counts
+
+
+def main():
+    metrics.emit_at_exit("hirejobs")
+    run()
+
+
+if __name__ == "__main__":
+    main()
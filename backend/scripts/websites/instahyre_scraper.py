@@ -1,48 +1,41 @@
 import sys
 import os
-import time
 import urllib.parse
-from datetime import datetime, timezone
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 
 sys.stdout.reconfigure(encoding="utf-8")
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
-from scraper_utils import get_collection, generate_job_hash, bulk_upsert_jobs, filter_jobs
+from scraper_utils import get_collection, generate_job_hash, save_jobs, TimeBudget, metrics, EXTRACTION_MODE
 from job_roles import JOB_ROLES
+from job_record import JobRecord
+from role_scheduler import RoleScheduler
+from pagination import Pagination
+from page_fingerprints import PageFingerprints
+from freshness import FreshnessTracker
+from selector_registry import SelectorRegistry
+from browser import new_driver
+from browser_pool import BrowserPool, load_page, wait_for_css
+from page_cache import remember_page
 
 # DEBUG_MODE: set True only for local development to see the browser window
 DEBUG_MODE = False
 
+BASE_URL = os.getenv("INSTAHYRE_BASE_URL", "https://www.instahyre.com")
+# Cards collected per result page (all of them are still read, so the rest count as seen)
+MAX_CARDS_PER_PAGE = 20
+# Instahyre cards carry no posted date, so pagination stops on known jobs only
+DATE_FIELD = None
+
+
 # ── Chrome setup ──────────────────────────────────────────────────────────────
-options = webdriver.ChromeOptions()
-if not DEBUG_MODE:
-    options.add_argument("--headless")
-options.add_argument("--disable-gpu")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-options.add_argument("--disable-blink-features=AutomationControlled")
-options.add_experimental_option("excludeSwitches", ["enable-automation"])
-options.add_experimental_option("useAutomationExtension", False)
-options.add_argument("--window-size=1920,1080")
-options.add_argument(
-    "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-)
-
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-
-collection = get_collection("instahyre")
-all_jobs_data = []
-
-# Ordered from most to least specific — Instahyre's selectors change; update here if needed
+def create_driver():
+    return new_driver(headless=not DEBUG_MODE, stealth=True)
+
+
+# Ordered from most to least specific — Instahyre's selectors change; update here if needed.
+# A SelectorRegistry moves last run's winning selector of each list to the front.
 JOB_CARD_SELECTORS = [
     "div[class*='opportunity-card']",
     "div[class*='job-card']",
@@ -52,6 +45,57 @@ JOB_CARD_SELECTORS = [
     "article",
 ]
 
+# Card field -> (selectors tried in order, minimum accepted length, join every match)
+CARD_FIELDS = {
+    "title": (["h2", "h3", "[class*='title']", "a[class*='title']"], 0, False),
+    "company": (["[class*='company-name']", "[class*='company']", "span.company"], 0, False),
+    "location": (["[class*='location']", "span[class*='location']", "div[class*='location']"], 2, False),
+    "description": (["[class*='description']", "div[class*='description']", "p[class*='desc']"], 20, False),
+    "keySkills": (["span[class*='skill']", "div[class*='skill']", "[class*='tag']"], 0, True),
+}
+
+# Finds the cards and reads CARD_FIELDS of each in one round-trip; mirrors read_card_fields().
+# `matched` holds, per card, the selector that produced each field (null: none did).
+CARDS_JS = """
+const [cardSelectors, fieldSpecs] = arguments;
+const text = (el) => (el ? (el.innerText || "").trim() : "");
+const firstMatch = (card, spec) => {
+    let value = "N/A";
+    for (const sel of spec.selectors) {
+        if (spec.multiple) {
+            const values = Array.from(card.querySelectorAll(sel)).map(text).filter(Boolean);
+            value = values.length ? values.join(", ") : "N/A";
+        } else {
+            value = text(card.querySelector(sel)) || "N/A";
+        }
+        if (value !== "N/A" && value.length > spec.minLength) return [value, sel];
+    }
+    return [value, null];
+};
+for (const selector of cardSelectors) {
+    const cards = document.querySelectorAll(selector);
+    if (!cards.length) continue;
+    const matched = [];
+    return {
+        selector: selector,
+        total: cards.length,
+        cards: Array.from(cards).map((card) => {
+            const fields = {};
+            const winners = {};
+            for (const [name, spec] of Object.entries(fieldSpecs)) {
+                [fields[name], winners[name]] = firstMatch(card, spec);
+            }
+            const link = card.querySelector("a");
+            fields.href = link && link.getAttribute("href") ? link.href : "N/A";
+            matched.push(winners);
+            return fields;
+        }),
+        matched: matched,
+    };
+}
+return {selector: null, total: 0, cards: [], matched: []};
+"""
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 def safe_extract(element, by, selector, attribute=None):
@@ -71,143 +115,269 @@ def safe_extract_multiple(element, by, selector):
         return "N/A"
 
 
-def find_job_cards():
-    """Try each known selector and return the first non-empty result."""
-    for sel in JOB_CARD_SELECTORS:
+def find_job_cards(driver, card_selectors: list[str] = JOB_CARD_SELECTORS) -> tuple[list, str | None]:
+    """Try each card selector in order; return the first non-empty result and its selector."""
+    for sel in card_selectors:
         cards = driver.find_elements(By.CSS_SELECTOR, sel)
         if cards:
             print(f"  Found {len(cards)} cards using selector: {sel}")
-            return cards
-    return []
-
-
-# ── Main scrape loop ──────────────────────────────────────────────────────────
-print("\n" + "=" * 80)
-print(f"Starting Instahyre Scraper for {len(JOB_ROLES)} job roles")
-print("=" * 80 + "\n")
-
-for role_index, job_role in enumerate(JOB_ROLES, 1):
-    print(f"\n[{role_index}/{len(JOB_ROLES)}] Searching for: {job_role}")
-    print("-" * 80)
-
-    keyword_encoded = urllib.parse.quote(job_role)
-    url = f"https://www.instahyre.com/search-jobs/?q={keyword_encoded}"
-
-    try:
-        driver.get(url)
-        time.sleep(5)
+            return cards, sel
+    return [], None
+
+
+def search_url(job_role: str, page: int = 1) -> str:
+    url = f"{BASE_URL}/search-jobs/?q={urllib.parse.quote(job_role)}"
+    return f"{url}&page={page}" if page > 1 else url
+
+
+def first_match(job, selectors: list[str], min_length: int = 0, multiple: bool = False) -> tuple[str, str | None]:
+    """Try selectors in order; return the first value longer than min_length and its selector."""
+    value = "N/A"
+    for sel in selectors:
+        if multiple:
+            value = safe_extract_multiple(job, By.CSS_SELECTOR, sel)
+        else:
+            value = safe_extract(job, By.CSS_SELECTOR, sel)
+        if value != "N/A" and len(value) > min_length:
+            return value, sel
+    return value, None
+
+
+def card_field_specs(registry: SelectorRegistry | None = None) -> dict:
+    """CARD_FIELDS with each selector list in the registry's order (code order without one)."""
+    return {
+        name: (registry.order(name, selectors) if registry else selectors, min_length, multiple)
+        for name, (selectors, min_length, multiple) in CARD_FIELDS.items()
+    }
+
+
+def read_card_fields(job, field_specs: dict = CARD_FIELDS) -> tuple[dict, dict]:
+    """
+    Read the raw fields of one card element (one WebDriver round-trip per lookup).
+    Returns (fields, the selector that matched each field or None).
+    """
+    fields, matched = {}, {}
+    for name, (selectors, min_length, multiple) in field_specs.items():
+        fields[name], matched[name] = first_match(job, selectors, min_length, multiple)
+    fields["href"] = safe_extract(job, By.CSS_SELECTOR, "a", "href")
+    return fields, matched
+
+
+def read_cards(driver, extraction_mode: str = EXTRACTION_MODE,
+               registry: SelectorRegistry | None = None) -> tuple[int, list[dict | None]]:
+    """
+    Return (cards on the page, raw fields of every card).
+    "js" mode reads everything with one execute_script call; "webdriver" mode walks
+    each card element. A None entry marks a card that could not be read.
+    Selectors are tried in the registry's order, and the ones that matched are recorded in it.
+    """
+    card_selectors = registry.order("card", JOB_CARD_SELECTORS) if registry else JOB_CARD_SELECTORS
+    field_specs = card_field_specs(registry)
+
+    if extraction_mode == "js":
+        specs = {
+            name: {"selectors": selectors, "minLength": min_length, "multiple": multiple}
+            for name, (selectors, min_length, multiple) in field_specs.items()
+        }
+        result = driver.execute_script(CARDS_JS, card_selectors, specs)
+        if result["total"]:
+            print(f"  Found {result['total']} cards using selector: {result['selector']}")
+        total, cards, card_selector, matched = result["total"], result["cards"], result["selector"], result["matched"]
+    else:
+        jobs_container, card_selector = find_job_cards(driver, card_selectors)
+        total, cards, matched = len(jobs_container), [], []
+        for i, job in enumerate(jobs_container, 1):
+            try:
+                fields, winners = read_card_fields(job, field_specs)
+                cards.append(fields)
+                matched.append(winners)
+            except Exception as e:
+                print(f"  {i}. Error: {e}")
+                cards.append(None)
+
+    if registry is not None:
+        registry.record("card", card_selector)
+        for winners in matched:
+            for name, selector in winners.items():
+                registry.record(name, selector)
+    return total, cards
+
+
+def build_card(fields: dict) -> dict | None:
+    """Turn raw card fields into listing data; None if the card has no usable title."""
+    apply_link = fields.get("href") or "N/A"
+    if apply_link != "N/A" and not apply_link.startswith("http"):
+        apply_link = BASE_URL + apply_link
+
+    job_title = fields.get("title")
+    if not job_title or job_title == "N/A" or len(job_title) <= 3:
+        return None
+
+    description = fields.get("description", "N/A")
+    return {
+        "title": job_title,
+        "company": fields.get("company", "N/A"),
+        "location": fields.get("location", "N/A"),
+        "description": description[:500] if description != "N/A" else "N/A",
+        "keySkills": fields.get("keySkills", "N/A"),
+        "apply_link": apply_link,
+    }
+
+
+def card_hash(card: dict) -> str:
+    return generate_job_hash(card["title"], card["company"], card["location"])
+
+
+def scrape_role(driver, job_role: str, budget: TimeBudget | None = None,
+                extraction_mode: str = EXTRACTION_MODE, pagination: Pagination | None = None,
+                fingerprints: PageFingerprints | None = None,
+                freshness: FreshnessTracker | None = None,
+                selectors: SelectorRegistry | None = None) -> list[JobRecord]:
+    """Search one role across result pages and return the job dicts collected for it."""
+    pagination = pagination or Pagination(date_field=DATE_FIELD)
+
+    def fetch(page: int) -> list[JobRecord]:
+        return scrape_page(driver, job_role, page, budget, extraction_mode, fingerprints, freshness, selectors)
+
+    return pagination.walk(fetch, budget)
+
+
+def scrape_page(driver, job_role: str, page: int = 1, budget: TimeBudget | None = None,
+                extraction_mode: str = EXTRACTION_MODE,
+                fingerprints: PageFingerprints | None = None,
+                freshness: FreshnessTracker | None = None,
+                selectors: SelectorRegistry | None = None) -> list[JobRecord]:
+    """Load one result page of a role and return the job dicts collected from it."""
+    budget = budget or TimeBudget()
+    role_jobs = []
+
+    url = search_url(job_role, page)
+    from_cache = load_page(driver, url)
+    if not from_cache:
+        metrics.sleep(5)
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
+        metrics.sleep(2)
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        time.sleep(2)
+        metrics.sleep(2)
 
-        # Wait for any known card selector
-        loaded = False
-        for sel in JOB_CARD_SELECTORS:
-            try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, sel))
-                )
-                loaded = True
-                break
-            except TimeoutException:
-                continue
-
-        if not loaded:
-            print(f"  No job listings detected for '{job_role}' (Instahyre may require login or block bots).")
-            print(f"  Page title: {driver.title}  |  URL: {driver.current_url}")
+    # Wait for any known card selector (one selector group instead of a 10s wait per selector)
+    try:
+        with metrics.timer("wait"):
+            wait_for_css(driver, ", ".join(JOB_CARD_SELECTORS), 10)
+    except TimeoutException:
+        print(f"  No job listings detected for '{job_role}' (Instahyre may require login or block bots).")
+        print(f"  Page title: {driver.title}  |  URL: {driver.current_url}")
+        if freshness is not None:
+            freshness.partial(job_role)
+        return role_jobs
+    remember_page(driver, url, from_cache)
+
+    with metrics.timer("extract_cards"):
+        total, raw_cards = read_cards(driver, extraction_mode, selectors)
+    if freshness is not None:
+        # Every listing on a walked page is still live, collected below or not
+        freshness.page_read(job_role, raw_cards, total, build_card, card_hash)
+    if not total:
+        print(f"  No cards found for '{job_role}' — skipping.")
+        return role_jobs
+    metrics.incr("cards_seen", total)
+    if fingerprints is not None and fingerprints.unchanged(url, raw_cards):
+        print(f"  ≡ Page {page} unchanged since the last run — skipping")
+        return role_jobs
+
+    for i, fields in enumerate(raw_cards[:MAX_CARDS_PER_PAGE], 1):
+        if budget.interrupted:
+            if fingerprints is not None:
+                fingerprints.forget(url)
+            break
+        if fields is None:
+            if fingerprints is not None:
+                fingerprints.forget(url)  # unreadable card: read the page again next run
+            continue
+        card = build_card(fields)
+        if card is None:
+            print(f"  {i}. [SKIPPED] No valid title")
             continue
 
-        jobs_container = find_job_cards()
-        if not jobs_container:
-            print(f"  No cards found for '{job_role}' — skipping.")
+        job_data = JobRecord(**card, source="Instahyre", searchedRole=job_role, jobHash=card_hash(card))
+        role_jobs.append(job_data)
+        metrics.incr("jobs_collected")
+        print(f"  {i}. {card['title']} @ {card['company']} | {card['location']}")
+
+    if fingerprints is not None:
+        fingerprints.commit(url)
+    return role_jobs
+
+
+# ── Main scrape loop ──────────────────────────────────────────────────────────
+def run(collection=None, budget: TimeBudget | None = None) -> dict:
+    """Scrape the planned roles into MongoDB; returns the save counts (see save_jobs)."""
+    collection = collection if collection is not None else get_collection("instahyre")
+    all_jobs_data = []
+
+    print("\n" + "=" * 80)
+    print(f"Starting Instahyre Scraper for {len(JOB_ROLES)} job roles")
+    print("=" * 80 + "\n")
+
+    scheduler = RoleScheduler("instahyre", JOB_ROLES)
+    budget = budget or TimeBudget.from_env()
+    fingerprints = PageFingerprints("instahyre")
+    freshness = FreshnessTracker(collection)
+    selectors = SelectorRegistry("instahyre")
+    pool = BrowserPool(create_driver)
+    pool.warm()  # Chrome starts while the role plan is loaded
+    planned_roles = scheduler.plan(time_budget_sec=budget.remaining)
+
+    for role_index, job_role in enumerate(planned_roles, 1):
+        if not budget.can_start(scheduler.expected_seconds(job_role)):
+            print(f"\n⏱  Time budget nearly spent ({budget.describe()}) — not starting '{job_role}'.")
+            break
+        scheduler.start_role(job_role)
+        print(f"\n[{role_index}/{len(planned_roles)}] Searching for: {job_role}")
+        print("-" * 80)
+
+        try:
+            with pool.lease() as driver:
+                pagination = Pagination(collection, since=scheduler.last_searched_at(job_role),
+                                        date_field=DATE_FIELD)
+                role_jobs = scrape_role(driver, job_role, budget, pagination=pagination,
+                                        fingerprints=fingerprints, freshness=freshness,
+                                        selectors=selectors)
+        except Exception as e:
+            print(f"  Fatal error for '{job_role}': {e}")
             continue
+        freshness.searched(job_role)
+        all_jobs_data.extend(role_jobs)
+        print(f"\n  Collected {len(role_jobs)} jobs for '{job_role}' ({budget.describe()})")
 
-        for i, job in enumerate(jobs_container[:20], 1):
-            try:
-                job_title = "N/A"
-                for sel in ["h2", "h3", "[class*='title']", "a[class*='title']"]:
-                    job_title = safe_extract(job, By.CSS_SELECTOR, sel)
-                    if job_title != "N/A":
-                        break
-
-                company_name = "N/A"
-                for sel in ["[class*='company-name']", "[class*='company']", "span.company"]:
-                    company_name = safe_extract(job, By.CSS_SELECTOR, sel)
-                    if company_name != "N/A":
-                        break
-
-                job_location = "N/A"
-                for sel in ["[class*='location']", "span[class*='location']", "div[class*='location']"]:
-                    job_location = safe_extract(job, By.CSS_SELECTOR, sel)
-                    if job_location != "N/A" and len(job_location) > 2:
-                        break
-
-                description = "N/A"
-                for sel in ["[class*='description']", "div[class*='description']", "p[class*='desc']"]:
-                    description = safe_extract(job, By.CSS_SELECTOR, sel)
-                    if description != "N/A" and len(description) > 20:
-                        break
-
-                skills = "N/A"
-                for sel in ["span[class*='skill']", "div[class*='skill']", "[class*='tag']"]:
-                    skills = safe_extract_multiple(job, By.CSS_SELECTOR, sel)
-                    if skills != "N/A":
-                        break
-
-                apply_link = safe_extract(job, By.CSS_SELECTOR, "a", "href")
-                if apply_link != "N/A" and not apply_link.startswith("http"):
-                    apply_link = "https://www.instahyre.com" + apply_link
-
-                if not job_title or job_title == "N/A" or len(job_title) <= 3:
-                    print(f"  {i}. [SKIPPED] No valid title")
-                    continue
-
-                job_hash = generate_job_hash(job_title, company_name, job_location)
-
-                job_data = {
-                    "title": job_title,
-                    "company": company_name,
-                    "location": job_location,
-                    "description": description[:500] if description != "N/A" else "N/A",
-                    "keySkills": skills,
-                    "apply_link": apply_link,
-                    "source": "Instahyre",
-                    "searchedRole": job_role,
-                    "jobHash": job_hash,
-                    "createdAt": datetime.now(timezone.utc),
-                }
-                all_jobs_data.append(job_data)
-                print(f"  {i}. {job_title} @ {company_name} | {job_location}")
+        metrics.sleep(3)
 
-            except Exception as e:
-                print(f"  {i}. Error: {e}")
+    scheduler.finish()
+    pool.close()
 
-        role_count = sum(1 for j in all_jobs_data if j.get("searchedRole") == job_role)
-        print(f"\n  Collected {role_count} jobs for '{job_role}'")
+    # ── Save to MongoDB ───────────────────────────────────────────────────────
+    print("\n" + "=" * 80)
+    print("SCRAPING COMPLETE")
+    print("=" * 80)
+    print(f"Total collected: {len(all_jobs_data)}")
+    if not budget.can_start():
+        print(f"⏱  Partial run — time budget reached ({budget.describe()}); saving what was collected.")
 
-    except Exception as e:
-        print(f"  Fatal error for '{job_role}': {e}")
-        continue
+    counts = save_jobs(collection, all_jobs_data, scheduler,
+                        empty_message="⚠ No jobs collected — Instahyre may be blocking automated access.")
 
-    time.sleep(3)
+    freshness.save()
+    scheduler.save()
+    fingerprints.save()
+    selectors.save()
+    print("=" * 80 + "\n")
+    return counts
 
-driver.quit()
 
-# ── Save to MongoDB ───────────────────────────────────────────────────────────
-print("\n" + "=" * 80)
-print("SCRAPING COMPLETE")
-print("=" * 80)
-print(f"Total collected: {len(all_jobs_data)}")
+def main():
+    metrics.emit_at_exit("instahyre")
+    run()
 
-if all_jobs_data:
-    print(f"\n🔍  Running quality filter on {len(all_jobs_data)} collected jobs…")
-    valid_jobs, rejected = filter_jobs(all_jobs_data, source="web")
-    print(f"   ✓ Passed: {len(valid_jobs)}  |  ✗ Rejected: {rejected}")
-    if valid_jobs:
-        inserted, dupes = bulk_upsert_jobs(collection, valid_jobs)
-        print(f"   ✓ Inserted: {inserted} new  |  Duplicates skipped: {dupes}")
-else:
-    print("⚠ No jobs collected — Instahyre may be blocking automated access.")
 
-print("=" * 80 + "\n")
+if __name__ == "__main__":
+    main()
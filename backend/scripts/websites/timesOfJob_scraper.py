@@ -1,39 +1,85 @@
 import sys
 import os
-import time
 import urllib.parse
-from datetime import datetime, timezone
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
 sys.stdout.reconfigure(encoding="utf-8")
 
 # Add scripts/ to path so scraper_utils is importable from any working directory
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
-from scraper_utils import get_collection, generate_job_hash, bulk_upsert_jobs, filter_jobs
+from scraper_utils import get_collection, generate_job_hash, save_jobs, TimeBudget, metrics, EXTRACTION_MODE
 from job_roles import JOB_ROLES
+from job_record import JobRecord
+from role_scheduler import RoleScheduler
+from pagination import Pagination
+from page_fingerprints import PageFingerprints
+from freshness import FreshnessTracker
+from selector_registry import SelectorRegistry
+from browser import new_driver
+from browser_pool import BrowserPool, load_page, wait_for_css
+from page_cache import PageCacheMiss, remember_page
+
+BASE_URL = os.getenv("TIMESJOBS_BASE_URL", "https://www.timesjobs.com")
+# Card field with the posted date, used to stop paginating at listings older than the last run
+DATE_FIELD = "postingTime"
+
+# Class markers every results page carries; a missing one signals a site redesign
+PAGE_MARKERS = {"srp-card": "[class*='srp-card']", "skill-tag": "[class*='skill-tag']"}
+# Returns the marker selectors that match nothing on the page
+MARKERS_JS = "return arguments[0].filter((selector) => !document.querySelector(selector));"
+
+# Where CARDS_JS / read_card_fields() read each field from; reported to the SelectorRegistry
+# as that field's selector whenever the card had a value for it
+CARD_FIELD_SELECTORS = {
+    "title": "h2",
+    "company": ".text-gray-400 span",
+    "location": ".locations-icon",
+    "experience": ".years-icon",
+    "keySkills": ".skill-tag",
+}
+
+# Reads the raw fields of every srp-card in one round-trip; mirrors read_card_fields()
+CARDS_JS = """
+const text = (el) => (el ? (el.innerText || "").trim() : "");
+const iconParent = (card, selector, levels) => {
+    let el = card.querySelector(selector);
+    if (!el) return null;
+    for (let i = 0; i < levels && el; i++) el = el.parentElement;
+    return el;
+};
+const cards = document.querySelectorAll("div.srp-card");
+return {
+    total: cards.length,
+    cards: Array.from(cards).map((card) => {
+        const dateSection = card.querySelector(".text-gray-400");
+        const dateText = dateSection ? dateSection.innerText : "";
+        const location = iconParent(card, ".locations-icon", 1);
+        const years = iconParent(card, ".years-icon", 1);
+        const salary = iconParent(card, ".salary-icon", 2);
+        const skills = Array.from(card.querySelectorAll(".skill-tag"))
+            .map(text)
+            .filter((s) => s && !s.startsWith("+"));
+        const link = card.querySelector("a[target='_blank']");
+        return {
+            title: text(card.querySelector("h2")) || "N/A",
+            company: text(card.querySelector(".text-gray-400 span")) || "N/A",
+            postingTime: dateText.includes("Posted on:") ? dateText.split("Posted on:").pop().trim() : "N/A",
+            location: location ? text(location) : "N/A",
+            experience: years ? text(years) : "N/A",
+            salary: salary ? text(salary) : "Not disclosed",
+            keySkills: skills.length ? skills.join(", ") : "N/A",
+            href: link && link.getAttribute("href") ? link.href : "N/A",
+        };
+    }),
+};
+"""
+
 
 # ── Chrome setup ──────────────────────────────────────────────────────────────
-options = webdriver.ChromeOptions()
-options.add_argument("--headless")
-options.add_argument("--disable-gpu")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-options.add_argument("--ignore-certificate-errors")
-options.add_argument("--window-size=1920,1080")
-options.add_argument(
-    "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-)
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-collection = get_collection("timesjob")
-all_jobs_data = []
+def create_driver():
+    return new_driver(extra_args=["--ignore-certificate-errors"])
+
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
@@ -54,10 +100,16 @@ def safe_extract_multiple(element, by, selector):
         return "N/A"
 
 
-def validate_selectors(page_source: str) -> bool:
-    """Warn if expected TimesJobs markers are absent — signals a site redesign."""
-    markers = ["srp-card", "skill-tag"]
-    missing = [m for m in markers if m not in page_source]
+def validate_selectors(driver, registry: SelectorRegistry | None = None) -> bool:
+    """
+    Warn if expected TimesJobs markers are absent — signals a site redesign.
+    Checked inside the page, instead of transferring the whole page_source for a substring search.
+    """
+    missing_selectors = driver.execute_script(MARKERS_JS, list(PAGE_MARKERS.values()))
+    missing = [name for name, selector in PAGE_MARKERS.items() if selector in missing_selectors]
+    if registry is not None:
+        for name, selector in PAGE_MARKERS.items():
+            registry.record(f"marker:{name}", None if name in missing else selector)
     if missing:
         print(f"  ⚠ WARNING: Expected CSS markers not found in page: {missing}")
         print("    TimesJobs may have updated their layout. Selectors need review.")
@@ -65,130 +117,271 @@ def validate_selectors(page_source: str) -> bool:
     return True
 
 
-# ── Main scrape loop ──────────────────────────────────────────────────────────
-print("\n" + "=" * 80)
-print(f"Starting TimesJobs Scraper for {len(JOB_ROLES)} job roles")
-print("=" * 80 + "\n")
-
-for role_index, job_role in enumerate(JOB_ROLES, 1):
-    print(f"\n[{role_index}/{len(JOB_ROLES)}] Searching for: {job_role}")
-    print("-" * 80)
-
-    keyword_encoded = urllib.parse.quote(job_role)
+def search_url(job_role: str, page: int = 1) -> str:
     url = (
-        f"https://www.timesjobs.com/job-search?searchType=Home_Search&from=submit"
-        f"&asKey=OFF&txtKeywords={keyword_encoded}&cboPresFuncArea="
+        f"{BASE_URL}/job-search?searchType=Home_Search&from=submit"
+        f"&asKey=OFF&txtKeywords={urllib.parse.quote(job_role)}&cboPresFuncArea="
         f"&cboWorkExp1=0&clusterName=CLUSTER_EXP&refreshed=true"
     )
+    return f"{url}&sequence={page}&startPage=1" if page > 1 else url
+
+
+def read_card_fields(job) -> dict:
+    """Read the raw fields of one srp-card element (one WebDriver round-trip per lookup)."""
+    job_title = safe_extract(job, By.TAG_NAME, "h2")
+    company_name = safe_extract(job, By.CSS_SELECTOR, ".text-gray-400 span")
+
+    try:
+        date_section = job.find_element(By.CSS_SELECTOR, ".text-gray-400")
+        full_text = date_section.text
+        post_time = full_text.split("Posted on:")[-1].strip() if "Posted on:" in full_text else "N/A"
+    except Exception:
+        post_time = "N/A"
+
+    try:
+        loc_icons = job.find_elements(By.CSS_SELECTOR, ".locations-icon")
+        job_location = loc_icons[0].find_element(By.XPATH, "./..").text.strip() if loc_icons else "N/A"
+    except Exception:
+        job_location = "N/A"
+
+    try:
+        yr_icons = job.find_elements(By.CSS_SELECTOR, ".years-icon")
+        experience = yr_icons[0].find_element(By.XPATH, "./..").text.strip() if yr_icons else "N/A"
+    except Exception:
+        experience = "N/A"
 
-    driver.get(url)
-    time.sleep(5)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(2)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    time.sleep(1)
+    try:
+        sal_icons = job.find_elements(By.CSS_SELECTOR, ".salary-icon")
+        salary = sal_icons[0].find_element(By.XPATH, "./../..").text.strip() if sal_icons else "Not disclosed"
+    except Exception:
+        salary = "Not disclosed"
+
+    return {
+        "title": job_title,
+        "company": company_name,
+        "postingTime": post_time,
+        "location": job_location,
+        "experience": experience,
+        "salary": salary,
+        "keySkills": safe_extract_multiple(job, By.CSS_SELECTOR, ".skill-tag"),
+        "href": safe_extract(job, By.CSS_SELECTOR, "a[target='_blank']", "href"),
+    }
+
+
+def read_cards(driver, extraction_mode: str = EXTRACTION_MODE,
+               registry: SelectorRegistry | None = None) -> tuple[int, list[dict | None]]:
+    """
+    Return (cards on the page, raw fields of every card).
+    "js" mode reads everything with one execute_script call; "webdriver" mode walks
+    each card element. A None entry marks a card that could not be read.
+    With a registry, every field's hit (a value other than "N/A") is recorded in it.
+    """
+    if extraction_mode == "js":
+        result = driver.execute_script(CARDS_JS)
+        total, fields = result["total"], result["cards"]
+    else:
+        jobs_container = driver.find_elements(By.CSS_SELECTOR, "div.srp-card")
+        fields = []
+        for i, job in enumerate(jobs_container, 1):
+            try:
+                fields.append(read_card_fields(job))
+            except Exception as e:
+                print(f"  {i}. Error: {e}")
+                fields.append(None)
+        total = len(jobs_container)
+
+    if registry is not None:
+        for card in fields:
+            for name, selector in CARD_FIELD_SELECTORS.items():
+                registry.record(name, selector if card and card.get(name, "N/A") != "N/A" else None)
+    return total, fields
+
+
+def build_card(fields: dict) -> dict | None:
+    """Turn raw card fields into listing data; None if the card has no title."""
+    apply_link = fields.get("href") or "N/A"
+    if apply_link != "N/A" and not apply_link.startswith("http"):
+        apply_link = BASE_URL + apply_link
+
+    job_title = fields.get("title")
+    if not job_title or job_title == "N/A":
+        return None
+
+    return {
+        "title": job_title,
+        "company": fields.get("company", "N/A"),
+        "postingTime": fields.get("postingTime", "N/A"),
+        "location": fields.get("location", "N/A"),
+        "experience": fields.get("experience", "N/A"),
+        "salary": fields.get("salary", "Not disclosed"),
+        "keySkills": fields.get("keySkills", "N/A"),
+        "apply_link": apply_link,
+    }
+
+
+def card_hash(card: dict) -> str:
+    return generate_job_hash(card["title"], card["company"], card["location"])
+
+
+def scrape_role(driver, job_role: str, budget: TimeBudget | None = None,
+                extraction_mode: str = EXTRACTION_MODE, pagination: Pagination | None = None,
+                fingerprints: PageFingerprints | None = None,
+                freshness: FreshnessTracker | None = None,
+                selectors: SelectorRegistry | None = None) -> list[JobRecord]:
+    """Search one role across result pages and return the job dicts collected for it."""
+    pagination = pagination or Pagination(date_field=DATE_FIELD)
+
+    def fetch(page: int) -> list[JobRecord]:
+        return scrape_page(driver, job_role, page, budget, extraction_mode, fingerprints, freshness, selectors)
+
+    return pagination.walk(fetch, budget)
+
+
+def scrape_page(driver, job_role: str, page: int = 1, budget: TimeBudget | None = None,
+                extraction_mode: str = EXTRACTION_MODE,
+                fingerprints: PageFingerprints | None = None,
+                freshness: FreshnessTracker | None = None,
+                selectors: SelectorRegistry | None = None) -> list[JobRecord]:
+    """Load one result page of a role and return the job dicts collected from it."""
+    budget = budget or TimeBudget()
+    role_jobs = []
+
+    url = search_url(job_role, page)
+    from_cache = load_page(driver, url)
+    if not from_cache:
+        metrics.sleep(5)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        metrics.sleep(2)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
+        metrics.sleep(1)
 
     # Validate selectors before proceeding
-    if not validate_selectors(driver.page_source):
+    if not validate_selectors(driver, selectors):
         print(f"  Skipping '{job_role}' — page structure unrecognised.")
-        continue
+        if freshness is not None:
+            freshness.partial(job_role)
+        return role_jobs
 
     try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.srp-card"))
-        )
+        with metrics.timer("wait"):
+            wait_for_css(driver, "div.srp-card", 15)
         print(f"  Job listings loaded for '{job_role}'")
     except TimeoutException:
         print(f"  Timeout waiting for job listings for '{job_role}' — skipping.")
-        continue
-
-    jobs_container = driver.find_elements(By.CSS_SELECTOR, "div.srp-card")
-    if not jobs_container:
+        if freshness is not None:
+            freshness.partial(job_role)
+        return role_jobs
+    remember_page(driver, url, from_cache)
+
+    with metrics.timer("extract_cards"):
+        total, raw_cards = read_cards(driver, extraction_mode, selectors)
+    if freshness is not None:
+        # Every listing on a walked page is still live, collected below or not
+        freshness.page_read(job_role, raw_cards, total, build_card, card_hash)
+    if not total:
         print(f"  No jobs found for '{job_role}' — skipping.")
-        continue
-
-    print(f"  Found {len(jobs_container)} job cards\n")
+        return role_jobs
+
+    print(f"  Found {total} job cards\n")
+    metrics.incr("cards_seen", total)
+    if fingerprints is not None and fingerprints.unchanged(url, raw_cards):
+        print(f"  ≡ Page {page} unchanged since the last run — skipping")
+        return role_jobs
+
+    for i, fields in enumerate(raw_cards, 1):
+        if budget.interrupted:
+            if fingerprints is not None:
+                fingerprints.forget(url)
+            break
+        if fields is None:
+            if fingerprints is not None:
+                fingerprints.forget(url)  # unreadable card: read the page again next run
+            continue
+        card = build_card(fields)
+        if card is None:
+            print(f"  {i}. [SKIPPED] No title found")
+            continue
+
+        job_data = JobRecord(**card, source="TimesJobs", searchedRole=job_role, jobHash=card_hash(card))
+        role_jobs.append(job_data)
+        metrics.incr("jobs_collected")
+
+        print(f"  {i}. {card['title']} @ {card['company']} | {card['location']} | {card['experience']}")
+
+    if fingerprints is not None:
+        fingerprints.commit(url)
+    return role_jobs
 
-    for i, job in enumerate(jobs_container, 1):
-        try:
-            job_title = safe_extract(job, By.TAG_NAME, "h2")
-            company_name = safe_extract(job, By.CSS_SELECTOR, ".text-gray-400 span")
 
-            try:
-                date_section = job.find_element(By.CSS_SELECTOR, ".text-gray-400")
-                full_text = date_section.text
-                post_time = full_text.split("Posted on:")[-1].strip() if "Posted on:" in full_text else "N/A"
-            except Exception:
-                post_time = "N/A"
-
-            try:
-                loc_icons = job.find_elements(By.CSS_SELECTOR, ".locations-icon")
-                job_location = loc_icons[0].find_element(By.XPATH, "./..").text.strip() if loc_icons else "N/A"
-            except Exception:
-                job_location = "N/A"
-
-            try:
-                yr_icons = job.find_elements(By.CSS_SELECTOR, ".years-icon")
-                experience = yr_icons[0].find_element(By.XPATH, "./..").text.strip() if yr_icons else "N/A"
-            except Exception:
-                experience = "N/A"
+# ── Main scrape loop ──────────────────────────────────────────────────────────
+def run(collection=None, budget: TimeBudget | None = None) -> dict:
+    """Scrape the planned roles into MongoDB; returns the save counts (see save_jobs)."""
+    collection = collection if collection is not None else get_collection("timesjob")
+    all_jobs_data = []
+
+    print("\n" + "=" * 80)
+    print(f"Starting TimesJobs Scraper for {len(JOB_ROLES)} job roles")
+    print("=" * 80 + "\n")
+
+    scheduler = RoleScheduler("timesjobs", JOB_ROLES)
+    budget = budget or TimeBudget.from_env()
+    fingerprints = PageFingerprints("timesjobs")
+    freshness = FreshnessTracker(collection)
+    selectors = SelectorRegistry("timesjobs")
+    pool = BrowserPool(create_driver)
+    pool.warm()  # Chrome starts while the role plan is loaded
+    planned_roles = scheduler.plan(time_budget_sec=budget.remaining)
+
+    for role_index, job_role in enumerate(planned_roles, 1):
+        if not budget.can_start(scheduler.expected_seconds(job_role)):
+            print(f"\n⏱  Time budget nearly spent ({budget.describe()}) — not starting '{job_role}'.")
+            break
+        scheduler.start_role(job_role)
+        print(f"\n[{role_index}/{len(planned_roles)}] Searching for: {job_role}")
+        print("-" * 80)
 
-            try:
-                sal_icons = job.find_elements(By.CSS_SELECTOR, ".salary-icon")
-                salary = sal_icons[0].find_element(By.XPATH, "./../..").text.strip() if sal_icons else "Not disclosed"
-            except Exception:
-                salary = "Not disclosed"
-
-            skills = safe_extract_multiple(job, By.CSS_SELECTOR, ".skill-tag")
-            apply_link = safe_extract(job, By.CSS_SELECTOR, "a[target='_blank']", "href")
-            if apply_link != "N/A" and not apply_link.startswith("http"):
-                apply_link = "https://www.timesjobs.com" + apply_link
-
-            if not job_title or job_title == "N/A":
-                print(f"  {i}. [SKIPPED] No title found")
-                continue
-
-            job_hash = generate_job_hash(job_title, company_name, job_location)
-
-            job_data = {
-                "title": job_title,
-                "company": company_name,
-                "postingTime": post_time,
-                "location": job_location,
-                "experience": experience,
-                "salary": salary,
-                "keySkills": skills,
-                "apply_link": apply_link,
-                "source": "TimesJobs",
-                "searchedRole": job_role,
-                "jobHash": job_hash,
-                "createdAt": datetime.now(timezone.utc),
-            }
-            all_jobs_data.append(job_data)
-
-            print(f"  {i}. {job_title} @ {company_name} | {job_location} | {experience}")
-
-        except Exception as e:
-            print(f"  {i}. Error: {e}")
-
-    print(f"\n  Collected {sum(1 for j in all_jobs_data if j.get('searchedRole') == job_role)} jobs for '{job_role}'")
-
-driver.quit()
-
-# ── Save to MongoDB ───────────────────────────────────────────────────────────
-print("\n" + "=" * 80)
-print("SCRAPING COMPLETE")
-print("=" * 80)
-print(f"Total collected: {len(all_jobs_data)}")
-
-if all_jobs_data:
-    print(f"\n🔍  Running quality filter on {len(all_jobs_data)} collected jobs…")
-    valid_jobs, rejected = filter_jobs(all_jobs_data, source="web")
-    print(f"   ✓ Passed: {len(valid_jobs)}  |  ✗ Rejected: {rejected}")
-    if valid_jobs:
-        inserted, dupes = bulk_upsert_jobs(collection, valid_jobs)
-        print(f"   ✓ Inserted: {inserted} new  |  Duplicates skipped: {dupes}")
-else:
-    print("⚠ No jobs collected.")
-
-print("=" * 80 + "\n")
+        try:
+            with pool.lease() as driver:
+                pagination = Pagination(collection, since=scheduler.last_searched_at(job_role),
+                                        date_field=DATE_FIELD)
+                role_jobs = scrape_role(driver, job_role, budget, pagination=pagination,
+                                        fingerprints=fingerprints, freshness=freshness,
+                                        selectors=selectors)
+        except WebDriverException as e:
+            print(f"  Browser error for '{job_role}': {e.msg}")
+            continue
+        except PageCacheMiss as e:
+            print(f"  Not in the page cache: {e}")
+            continue
+        freshness.searched(job_role)
+        all_jobs_data.extend(role_jobs)
+        print(f"\n  Collected {len(role_jobs)} jobs for '{job_role}' ({budget.describe()})")
+
+    scheduler.finish()
+    pool.close()
+
+    # ── Save to MongoDB ───────────────────────────────────────────────────────
+    print("\n" + "=" * 80)
+    print("SCRAPING COMPLETE")
+    print("=" * 80)
+    print(f"Total collected: {len(all_jobs_data)}")
+    if not budget.can_start():
+        print(f"⏱  Partial run — time budget reached ({budget.describe()}); saving what was collected.")
+
+    counts = save_jobs(collection, all_jobs_data, scheduler)
+
+    freshness.save()
+    scheduler.save()
+    fingerprints.save()
+    selectors.save()
+    print("=" * 80 + "\n")
+    return counts
+
+
+def main():
+    metrics.emit_at_exit("timesjobs")
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+// backend/utils/jobLocation.js
+
+/**
+ * Location filters for the scraped job collections. The scrapers resolve every
+ * listing's location against backend/scripts/locations.json and store `cities`
+ * (canonical names), `remote`/`hybrid` flags and a GeoJSON `geo` MultiPoint, all indexed.
+ */
+const gazetteer = require("../scripts/locations.json");
+
+const EARTH_RADIUS_KM = 6378.1;
+const CIRCLE_VERTICES = 32;
+
+const key = (text) => String(text).toLowerCase().replace(/[^a-z0-9]+/g, " ").trim();
+
+const CITY_ALIASES = new Map();
+for (const city of gazetteer.cities) {
+    for (const alias of [city.name, ...(city.aliases || [])]) {
+        CITY_ALIASES.set(key(alias), city.name);
+    }
+}
+const REMOTE_PHRASES = new Set(gazetteer.remote.map(key));
+const HYBRID_PHRASES = new Set(gazetteer.hybrid.map(key));
+
+const escapeRegex = (text) => text.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
+
+const structuredLocationMatch = (normalized) => {
+    if (CITY_ALIASES.has(normalized)) return { cities: CITY_ALIASES.get(normalized) };
+    if (REMOTE_PHRASES.has(normalized)) return { remote: true };
+    if (HYBRID_PHRASES.has(normalized)) return { hybrid: true };
+    return null;
+};
+
+/**
+ * Filter for a `location` query parameter: an exact (indexed) match on the canonical
+ * city for any known name or alias ("Bangalore" → "Bengaluru"), the remote/hybrid
+ * flag for "Remote"/"WFH"/"Hybrid", and a substring match on the raw text otherwise.
+ * Jobs stored before the structured fields existed (no `cities` yet, see
+ * scripts/backfill_fields.py) are still matched on the raw text.
+ */
+const scrapedLocationFilter = (location) => {
+    const text = { location: { $regex: escapeRegex(String(location)), $options: 'i' } };
+    const structured = structuredLocationMatch(key(location));
+    if (!structured) return text;
+    return { $or: [structured, { cities: { $exists: false }, ...text }] };
+};
+
+/**
+ * Filter for jobs with at least one city within `radiusKm` of "lat,lng". The circle is
+ * approximated by a polygon, as $geoIntersects (unlike $geoWithin) matches a
+ * multi-city listing when any of its cities is inside. Returns null for bad input.
+ */
+const nearFilter = (near, radiusKm = 50) => {
+    const [lat, lng] = String(near).split(",").map(Number);
+    const radius = Number(radiusKm);
+    if (!Number.isFinite(lat) || !Number.isFinite(lng) || !(radius > 0) || Math.abs(lat) > 90 || Math.abs(lng) > 180) {
+        return null;
+    }
+
+    const toRad = (deg) => deg * Math.PI / 180;
+    const toDeg = (rad) => rad * 180 / Math.PI;
+    const angular = Math.min(radius, EARTH_RADIUS_KM) / EARTH_RADIUS_KM;
+    const ring = [];
+    for (let i = 0; i < CIRCLE_VERTICES; i++) {
+        const bearing = 2 * Math.PI * i / CIRCLE_VERTICES;
+        const pointLat = Math.asin(Math.sin(toRad(lat)) * Math.cos(angular) +
+            Math.cos(toRad(lat)) * Math.sin(angular) * Math.cos(bearing));
+        const pointLng = toRad(lng) + Math.atan2(Math.sin(bearing) * Math.sin(angular) * Math.cos(toRad(lat)),
+            Math.cos(angular) - Math.sin(toRad(lat)) * Math.sin(pointLat));
+        ring.push([((toDeg(pointLng) + 540) % 360) - 180, toDeg(pointLat)]);
+    }
+    ring.push(ring[0]);
+
+    return { geo: { $geoIntersects: { $geometry: { type: "Polygon", coordinates: [ring] } } } };
+};
+
+module.exports = { scrapedLocationFilter, nearFilter };